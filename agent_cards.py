@@ -93,6 +93,71 @@ AGENT_CARDS = {
 }
 
 
+# 워크플로우 카드 - 오케스트레이터 프롬프트의 워크플로우 정의와 판단 규칙
+# triggers: 해당 워크플로우를 강하게 시사하는 표현
+# overrides: 트리거가 있으면 무시되는 워크플로우 (예: '배달'이 있으면 전체 추천 대신 외식/배달)
+WORKFLOW_CARDS = {
+    "FULL_RECOMMENDATION": {
+        "required_agents": ["taste_agent", "nutrition_agent", "budget_agent", "scheduler_agent", "chef_agent"],
+        "primary_agent": "taste_agent",
+        "user_intent": "메뉴 추천",
+        "triggers": ["추천", "뭐 먹", "뭘 먹", "메뉴", "집밥", "만들어먹", "만들어 먹"],
+        "overrides": []
+    },
+    "RESTAURANT_DELIVERY": {
+        "required_agents": ["budget_agent", "scheduler_agent", "nutrition_agent", "taste_agent"],
+        "primary_agent": "taste_agent",
+        "user_intent": "외식/배달 레스토랑 추천",
+        "triggers": ["외식", "배달", "시켜먹", "시켜 먹", "레스토랑", "식당", "맛집", "포장"],
+        "overrides": ["FULL_RECOMMENDATION"]
+    },
+    "RECIPE_ONLY": {
+        "required_agents": ["chef_agent"],
+        "primary_agent": "chef_agent",
+        "user_intent": "레시피/조리법 안내",
+        "triggers": ["레시피", "만드는 법", "만드는법", "조리법", "요리 방법", "어떻게 만들", "조리 순서"],
+        "overrides": []
+    },
+    "BUDGET_CHECK": {
+        "required_agents": ["budget_agent"],
+        "primary_agent": "budget_agent",
+        "user_intent": "예산 현황 확인",
+        "triggers": ["식비", "얼마 썼", "예산 남", "남은 예산", "예산 현황", "지출"],
+        "overrides": []
+    },
+    "NUTRITION_INFO": {
+        "required_agents": ["nutrition_agent"],
+        "primary_agent": "nutrition_agent",
+        "user_intent": "영양/칼로리 정보",
+        "triggers": ["칼로리 얼마", "영양 분석", "영양 정보", "영양소", "몇 칼로리"],
+        "overrides": []
+    },
+    "SCHEDULE_CHECK": {
+        "required_agents": ["scheduler_agent"],
+        "primary_agent": "scheduler_agent",
+        "user_intent": "일정 확인",
+        "triggers": ["일정 어때", "오늘 일정", "언제 식사", "언제 먹", "스케줄"],
+        "overrides": []
+    },
+    "QUICK_MEAL": {
+        "required_agents": ["scheduler_agent", "taste_agent"],
+        "primary_agent": "scheduler_agent",
+        "user_intent": "빠른 식사 추천",
+        "triggers": ["빨리", "빠르게", "급해", "분 안에", "분 내", "후딱"],
+        "overrides": ["FULL_RECOMMENDATION"]
+    },
+}
+
+# 에이전트 카드 키워드가 약하게 시사하는 워크플로우 (해당 에이전트 단독 워크플로우)
+AGENT_HOME_WORKFLOWS = {
+    "taste_agent": "FULL_RECOMMENDATION",
+    "nutrition_agent": "NUTRITION_INFO",
+    "budget_agent": "BUDGET_CHECK",
+    "scheduler_agent": "SCHEDULE_CHECK",
+    "chef_agent": "RECIPE_ONLY",
+}
+
+
 def get_agent_card(agent_type: str) -> dict:
     """특정 에이전트의 카드 정보를 반환"""
     return AGENT_CARDS.get(agent_type, {})
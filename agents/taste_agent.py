@@ -7,7 +7,8 @@ from tools import (
     get_meal_history,
     search_restaurants,
     get_restaurant_details,
-    judge_menu_personalization
+    judge_menu_personalization,
+    judge_menus_batch
 )
 
 
@@ -37,7 +38,7 @@ def create_taste_agent(llm) -> Agent:
             "   - menu를 보고 가격 대비 품질 평가\n\n"
             "3. **LLM as Judge로 개인화 최종 확인**\n"
             "   - 영양사가 이미 개인화 체크를 했지만, 맛 중심으로 추가한 메뉴 재확인\n"
-            "   - '메뉴 개인화 적합성 판단' 도구 사용\n"
+            "   - 후보 메뉴를 모아 '메뉴 일괄 적합성 판단' 도구를 1회 사용 (메뉴마다 따로 호출하지 않음)\n"
             "   - ❌ 부적합 판단 시 제외하고 다른 옵션 탐색\n\n"
             "4. **최종 추천**\n"
             "   - desc의 매력적인 부분을 인용하여 설득력 있게 설명\n"
@@ -51,7 +52,8 @@ def create_taste_agent(llm) -> Agent:
             get_meal_history,
             search_restaurants,
             get_restaurant_details,
-            judge_menu_personalization
+            judge_menu_personalization,
+            judge_menus_batch
         ],
         llm=llm
     )
@@ -0,0 +1,110 @@
+"""
+MCP 세션 풀 벤치마크
+호출마다 서버 프로세스를 띄우는 방식(connect) vs 공유 세션 풀(get_mcp_pool)의
+도구 호출당 지연 시간 비교
+
+실행:
+    python bench/bench_mcp_pool.py --calls 8
+
+측정 결과 (--calls 8, Mock 서버 notion_server.py, 2026-10-18):
+    spawn-per-call (before)  total= 10118.6ms mean= 1264.8ms p50= 1259.6ms
+    pooled (after)           total=  1108.4ms mean=  138.5ms p50=    4.6ms (첫 호출만 세션 생성 1076ms)
+    pool stats: spawns=1, reuses=7 -> 총 지연 시간 약 9배 단축
+    (notion_server_real.py에서도 spawn 1 / reuse 7, 8.6~11.7배)
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from mcp_client.notion_mcp_client import NotionMCPClient, NotionMCPSessionPool
+
+# RESTAURANT_DELIVERY 1회 실행에서 발생하는 도구 호출 패턴
+CALL_PATTERN = [
+    ("get_budget_status", {}),
+    ("get_available_time", {}),
+    ("get_user_preferences", {}),
+    ("get_meal_history", {"days": 7}),
+    ("get_user_preferences", {}),
+    ("get_meal_history", {"days": 7}),
+    ("get_user_preferences", {}),
+    ("get_budget_status", {}),
+]
+
+
+def _summary(label: str, samples: list) -> dict:
+    """지연 시간 통계 (ms)"""
+    samples_ms = [s * 1000 for s in samples]
+    result = {
+        "label": label,
+        "calls": len(samples_ms),
+        "total_ms": sum(samples_ms),
+        "mean_ms": statistics.mean(samples_ms),
+        "p50_ms": statistics.median(samples_ms),
+        "max_ms": max(samples_ms),
+    }
+    print(
+        f"{label:<24} calls={result['calls']:<3} total={result['total_ms']:8.1f}ms "
+        f"mean={result['mean_ms']:7.1f}ms p50={result['p50_ms']:7.1f}ms max={result['max_ms']:7.1f}ms"
+    )
+    return result
+
+
+async def _call_with_fresh_process(client: NotionMCPClient, tool_name: str, arguments: dict) -> str:
+    async with client.connect():
+        return await client.call_tool(tool_name, arguments)
+
+
+def bench_spawn_per_call(calls: list) -> dict:
+    """기존 방식: 호출마다 서버 프로세스 생성 + initialize"""
+    client = NotionMCPClient()
+    samples = []
+    for tool_name, arguments in calls:
+        start = time.perf_counter()
+        asyncio.run(_call_with_fresh_process(client, tool_name, arguments))
+        samples.append(time.perf_counter() - start)
+    return _summary("spawn-per-call (before)", samples)
+
+
+def bench_pooled(calls: list) -> dict:
+    """개선 방식: 공유 세션 풀 (첫 호출만 프로세스 생성)"""
+    pool = NotionMCPSessionPool()
+    samples = []
+    try:
+        for tool_name, arguments in calls:
+            start = time.perf_counter()
+            pool.call_tool(tool_name, arguments)
+            samples.append(time.perf_counter() - start)
+        result = _summary("pooled (after)", samples)
+        result["pool_stats"] = pool.get_stats()
+        print(f"{'':<24} pool stats: {result['pool_stats']}")
+        return result
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 세션 풀 벤치마크")
+    parser.add_argument("--calls", type=int, default=len(CALL_PATTERN), help="도구 호출 횟수")
+    args = parser.parse_args()
+
+    calls = [CALL_PATTERN[i % len(CALL_PATTERN)] for i in range(args.calls)]
+
+    print("=" * 80)
+    print(f"MCP 도구 호출 지연 시간 비교 ({len(calls)}회)")
+    print("=" * 80)
+
+    before = bench_spawn_per_call(calls)
+    after = bench_pooled(calls)
+
+    if after["total_ms"] > 0:
+        print(f"\n⚡ 총 지연 시간 {before['total_ms'] / after['total_ms']:.1f}배 단축")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+OpenAI 공유 클라이언트 벤치마크
+호출마다 OpenAI()를 새로 만드는 방식 vs 공유 연결 풀(llm_client.chat_completion)의
+호출당 오버헤드 비교 (로컬 OpenAI 호환 스텁 서버 사용, 실제 API 호출 없음)
+
+실행:
+    python bench/bench_openai_client.py --calls 50 --threads 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from bench.openai_stub import OpenAIStubServer
+
+MESSAGES = [
+    {"role": "system", "content": "당신은 사용자 의도를 정확히 파악하는 AI 오케스트레이터입니다."},
+    {"role": "user", "content": "오늘 저녁 메뉴 추천해줘"}
+]
+
+
+def _summary(label: str, samples: list) -> dict:
+    """지연 시간 통계 (ms)"""
+    samples_ms = [s * 1000 for s in samples]
+    result = {
+        "label": label,
+        "calls": len(samples_ms),
+        "total_ms": sum(samples_ms),
+        "mean_ms": statistics.mean(samples_ms),
+        "p50_ms": statistics.median(samples_ms),
+        "max_ms": max(samples_ms),
+    }
+    print(
+        f"{label:<24} calls={result['calls']:<3} total={result['total_ms']:8.1f}ms "
+        f"mean={result['mean_ms']:7.1f}ms p50={result['p50_ms']:7.1f}ms max={result['max_ms']:7.1f}ms"
+    )
+    return result
+
+
+def _run(call, calls: int, threads: int) -> list:
+    """call()을 calls회 실행하고 호출별 지연 시간 반환"""
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        return time.perf_counter() - start
+
+    if threads <= 1:
+        return [timed(i) for i in range(calls)]
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(timed, range(calls)))
+
+
+def bench_client_per_call(server: OpenAIStubServer, calls: int, threads: int) -> dict:
+    """기존 방식: 호출마다 OpenAI() 생성 (연결도 매번 새로)"""
+    from openai import OpenAI
+
+    def call():
+        client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        client.chat.completions.create(model="gpt-4o-mini", messages=MESSAGES, temperature=0.3)
+
+    connections = server.connections
+    result = _summary("client-per-call (before)", _run(call, calls, threads))
+    result["connections"] = server.connections - connections
+    print(f"{'':<24} TCP 연결 {result['connections']}개")
+    return result
+
+
+def bench_shared(server: OpenAIStubServer, calls: int, threads: int) -> dict:
+    """개선 방식: 공유 클라이언트 + keep-alive 연결 풀"""
+    from llm_client import chat_completion, close_openai_clients, get_client_stats
+
+    def call():
+        chat_completion(model="gpt-4o-mini", messages=MESSAGES, temperature=0.3)
+
+    connections = server.connections
+    try:
+        result = _summary("shared pool (after)", _run(call, calls, threads))
+    finally:
+        close_openai_clients()
+    result["connections"] = server.connections - connections
+    result["client_stats"] = get_client_stats()
+    print(f"{'':<24} TCP 연결 {result['connections']}개, client stats: {result['client_stats']}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI 공유 클라이언트 벤치마크")
+    parser.add_argument("--calls", type=int, default=50, help="LLM 호출 횟수")
+    parser.add_argument("--threads", type=int, default=1, help="동시 호출 스레드 수")
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 응답 지연 (초)")
+    args = parser.parse_args()
+
+    server = OpenAIStubServer(latency=args.latency).start()
+    os.environ["OPENAI_API_KEY"] = "sk-bench"
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    print("=" * 80)
+    print(f"OpenAI 호출 오버헤드 비교 ({args.calls}회, 스레드 {args.threads}개, 스텁 {server.base_url})")
+    print("=" * 80)
+
+    try:
+        before = bench_client_per_call(server, args.calls, args.threads)
+        after = bench_shared(server, args.calls, args.threads)
+    finally:
+        server.stop()
+
+    print(f"\n📊 호출당 오버헤드: {before['mean_ms']:.2f}ms → {after['mean_ms']:.2f}ms")
+    if after["total_ms"] > 0:
+        print(f"⚡ 총 지연 시간 {before['total_ms'] / after['total_ms']:.1f}배 단축")
+
+
+if __name__ == "__main__":
+    main()
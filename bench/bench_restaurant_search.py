@@ -0,0 +1,80 @@
+"""
+레스토랑 키워드 검색 벤치마크
+식당_DB.json을 N개로 복제한 DB에서 n-gram 역색인 vs 선형 검사 비교
+(두 방식의 결과가 같은지도 함께 확인)
+
+실행:
+    python bench/bench_restaurant_search.py --size 100000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.restaurant_tools import DB_PATH, RestaurantIndex, _keyword_match
+
+KEYWORDS = ["파스타", "국밥", "칼국수", "커피", "치킨", "한식", "떡볶이", "비빔밥", "cafe", "없는메뉴"]
+
+
+def _synthetic_db(size: int) -> list:
+    """원본 DB를 size개로 복제 (식당 이름에 번호를 붙여 구분)"""
+    with open(DB_PATH, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    restaurants = []
+    for i in range(size):
+        restaurant = dict(base[i % len(base)])
+        restaurant["name"] = f"{restaurant.get('name') or ''} {i // len(base)}호점"
+        restaurants.append(restaurant)
+    return restaurants
+
+
+def _time_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레스토랑 키워드 검색 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="식당 수")
+    parser.add_argument("--repeat", type=int, default=5, help="키워드별 반복 횟수")
+    args = parser.parse_args()
+
+    restaurants = _synthetic_db(args.size)
+
+    start = time.perf_counter()
+    index = RestaurantIndex(restaurants)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print(f"키워드 검색 ({len(restaurants):,}개 식당, 인덱스 구축 {build_ms:,.0f}ms, bigram {len(index.keyword_postings):,}개)")
+    print("=" * 80)
+
+    for keyword in KEYWORDS:
+        keyword_lower = keyword.lower()
+        expected = [i for i, r in enumerate(restaurants) if _keyword_match(r, keyword_lower)]
+        assert index.keyword_matches(keyword_lower) == expected, f"결과 불일치: {keyword}"
+
+        indexed_ms = _time_ms(lambda: index.keyword_matches(keyword_lower), args.repeat)
+        linear_ms = _time_ms(
+            lambda: [i for i, r in enumerate(restaurants) if _keyword_match(r, keyword_lower)],
+            1
+        )
+        print(
+            f"{keyword:<10} matches={len(expected):<7,} "
+            f"index={indexed_ms:9.3f}ms linear={linear_ms:9.1f}ms"
+        )
+
+    print("\n✅ 역색인 결과가 선형 검사와 모두 일치")
+
+
+if __name__ == "__main__":
+    main()
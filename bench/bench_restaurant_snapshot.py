@@ -0,0 +1,112 @@
+"""
+레스토랑 DB 로드 벤치마크 - JSON vs 바이너리 스냅샷 vs SQLite
+식당_DB.json을 N개로 복제한 DB로 각 방식의 시작 시간(첫 검색까지), 검색 시간, RSS 증가량 비교
+(방식마다 새 프로세스에서 측정)
+
+실행:
+    python bench/bench_restaurant_snapshot.py --size 100000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# 프로젝트 루트를 Python path에 추가
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent))
+
+from bench_restaurant_search import _synthetic_db
+
+# 자식 프로세스: 모듈 import 후 RSS 기준점 -> 첫 검색까지 시간/RSS 측정
+CHILD_SCRIPT = """
+import json, sys, time
+from pathlib import Path
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+import tools.restaurant_tools as rt
+rt.DB_PATH = Path(sys.argv[1])
+rt.SNAPSHOT_PATH = Path(sys.argv[2])
+rt.SQLITE_PATH = Path(sys.argv[3])
+rt.RESTAURANT_BACKEND = sys.argv[4]
+
+base_rss = rss_kb()
+start = time.perf_counter()
+rt.search_restaurants.run(max_budget=15000, max_time_minutes=40, meal_type="배달", keyword="국밥")
+load_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+for _ in range(20):
+    rt.search_restaurants.run(max_budget=20000, max_time_minutes=60, meal_type="매장", keyword="")
+    rt._clear_search_cache()
+query_ms = (time.perf_counter() - start) * 1000 / 20
+
+print(json.dumps({
+    "index": type(rt._get_restaurant_index()).__name__,
+    "load_ms": load_ms,
+    "query_ms": query_ms,
+    "rss_mb": (rss_kb() - base_rss) / 1024,
+}))
+"""
+
+
+def _measure(json_path: Path, snapshot_path: Path, sqlite_path: Path, backend: str = "memory") -> dict:
+    env = dict(os.environ, RESTAURANT_DB_WATCH_INTERVAL="0")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, str(json_path), str(snapshot_path), str(sqlite_path), backend],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레스토랑 DB 로드 벤치마크 (JSON vs 스냅샷 vs SQLite)")
+    parser.add_argument("--size", type=int, default=100000, help="식당 수")
+    args = parser.parse_args()
+
+    from tools.restaurant_snapshot import build_snapshot
+    from tools.restaurant_sqlite import build_sqlite_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "식당_DB.json"
+        snapshot_path = Path(tmp) / "식당_DB.snapshot"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(_synthetic_db(args.size), f, ensure_ascii=False)
+        sqlite_path = Path(tmp) / "식당_DB.sqlite"
+        build_snapshot(json_path, snapshot_path)
+        build_sqlite_store(json_path, sqlite_path)
+
+        print("=" * 80)
+        print(
+            f"레스토랑 DB 로드 ({args.size:,}개 식당, JSON {json_path.stat().st_size / 1e6:.1f}MB, "
+            f"스냅샷 {snapshot_path.stat().st_size / 1e6:.1f}MB, SQLite {sqlite_path.stat().st_size / 1e6:.1f}MB)"
+        )
+        print("=" * 80)
+
+        missing_snapshot = Path(tmp) / "없음.snapshot"
+        results = {
+            "json": _measure(json_path, missing_snapshot, sqlite_path),
+            "snapshot": _measure(json_path, snapshot_path, sqlite_path),
+            "sqlite": _measure(json_path, missing_snapshot, sqlite_path, backend="sqlite"),
+        }
+        for label, result in results.items():
+            print(
+                f"{label:<10} {result['index']:<26} 첫 검색까지 {result['load_ms']:9.1f}ms  "
+                f"검색 {result['query_ms']:7.2f}ms  RSS +{result['rss_mb']:7.1f}MB"
+            )
+
+        if results["snapshot"]["load_ms"] > 0:
+            print(f"\n⚡ 시작 시간 {results['json']['load_ms'] / results['snapshot']['load_ms']:.1f}배 단축")
+
+
+if __name__ == "__main__":
+    main()
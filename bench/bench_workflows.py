@@ -0,0 +1,512 @@
+"""
+워크플로우 엔드투엔드 벤치마크
+FoodRecommendationCrew.run을 워크플로우 타입(agent_cards.WORKFLOW_CARDS) × 페르소나(user_manager.USERS)마다
+실행하고 단계별 실행 시간, LLM 호출 수, 도구 호출 수, MCP 서버 프로세스 생성 수, 프롬프트 토큰을 기록
+
+- LLM: 로컬 OpenAI 호환 스텁 서버(bench/openai_stub.py)가 스크립트된 응답 반환 (API 키 / 네트워크 불필요)
+  에이전트는 첫 응답에서 스크립트된 도구를 1번 호출하고, 도구 결과를 받으면 최종 답변
+- Notion: Mock MCP 서버(mcp_servers/notion_server.py)를 공유 세션 풀로 호출
+- 단계: intent(의도 분석), prefetch(사용자 컨텍스트 사전 조회), 에이전트 역할별 태스크
+- 결과는 JSON으로 저장. --baseline을 주면 같은 (워크플로우, 페르소나) 실행과 비교해
+  호출 수·토큰이 늘었거나 실행 시간이 허용치 이상 늘었거나 새로 실패하면 종료 코드 1
+
+실행:
+    python bench/bench_workflows.py
+    python bench/bench_workflows.py --workflows BUDGET_CHECK,RECIPE_ONLY --users 소윤,태식
+    python bench/bench_workflows.py --output bench/results/after.json --baseline bench/results/before.json
+"""
+import argparse
+import contextlib
+import contextvars
+import io
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+# 스텁 / Mock 환경 (config, tools import 전에 설정)
+os.environ["USE_NOTION_MCP"] = "true"                  # Notion 도구가 MCP 세션 풀 사용
+os.environ["NOTION_MCP_SERVER"] = "notion_server.py"   # 실제 Notion 대신 Mock MCP 서버
+os.environ["OPENAI_API_KEY"] = "sk-bench"
+os.environ["JUDGE_CACHE_PATH"] = ""                    # 실행마다 같은 조건이 되도록 캐시 사용 안 함
+os.environ["RECIPE_CACHE_PATH"] = ""
+os.environ["LLM_CACHE_ENABLED"] = "false"
+os.environ["LLM_CASSETTE_MODE"] = ""
+os.environ["RESTAURANT_DB_WATCH_INTERVAL"] = "0"
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from agent_cards import WORKFLOW_CARDS
+from bench.openai_stub import OpenAIStubServer
+from user_manager import USERS
+
+# 워크플로우별 대표 요청 (규칙 기반 의도 분류에서 해당 워크플로우로 분류됨)
+WORKFLOW_REQUESTS = {
+    "FULL_RECOMMENDATION": "오늘 저녁 메뉴 추천해줘",
+    "RESTAURANT_DELIVERY": "근처 식당에서 배달 시켜 먹을 곳 알려줘",
+    "RECIPE_ONLY": "된장찌개 만드는 법 알려줘",
+    "BUDGET_CHECK": "이번 주 남은 예산 알려줘",
+    "NUTRITION_INFO": "어제 먹은 식단 영양 분석 해줘",
+    "SCHEDULE_CHECK": "오늘 일정 어때? 언제 식사할 수 있어?",
+    "QUICK_MEAL": "15분 안에 빨리 먹을 수 있는 거 없을까?",
+}
+
+# 에이전트 역할별 스크립트: 첫 응답에서 호출할 도구 (도구 이름, 인자)
+AGENT_TOOL_SCRIPT = {
+    "AI 오케스트레이터 & 워크플로우 디자이너": ("사용자 의도 분석", None),   # 인자는 요청에서 채움
+    "AI 레시피 생성 전문가": ("AI 레시피 생성", {"dish_name": "된장찌개"}),
+    "예산 관리자 (총무)": ("예산 현황 조회", {}),
+    "시간 관리 전문가 (스케줄러)": ("사용자 일정 조회", {}),
+    "영양사": ("식단 기록 조회", {"days": 7}),
+    "맛 평가 전문가 (맛슐랭)": ("메뉴 검색", {"max_time_minutes": 30, "limit": 5}),
+    "종합 판단 코디네이터": ("사용자 선호도 조회", {}),
+}
+
+STUB_RECIPE = (
+    "## 된장찌개\n\n### 재료\n- 된장 1큰술, 두부 1/2모, 애호박 1/3개\n\n"
+    "### 조리 순서\n1. 멸치 육수를 끓인다\n2. 된장을 풀고 채소와 두부를 넣는다\n\n"
+    "### 영양 정보\n- 약 250kcal"
+)
+
+STAGE_FIELDS = ("wall_s", "llm_calls", "prompt_tokens", "tool_calls", "mcp_calls", "mcp_spawns")
+# 기준 결과와 비교할 항목 (스텁 응답이 고정이라 실행마다 같아야 함)
+GATED_COUNTS = ("llm_calls", "prompt_tokens", "tool_calls", "mcp_calls", "mcp_spawns")
+
+_AGENT_ROLE = re.compile(r"You are (.+?)\. ")
+
+
+def agent_role(body: dict) -> str:
+    """CrewAI 에이전트 프롬프트("You are {role}. ...")의 역할 (도구 내부 LLM 호출이면 빈 문자열)"""
+    messages = body.get("messages") or [{}]
+    match = _AGENT_ROLE.match(str(messages[0].get("content") or ""))
+    return match.group(1) if match else ""
+
+
+def _request_in(text: str) -> str:
+    """프롬프트에 들어 있는 벤치마크 요청의 워크플로우"""
+    for workflow, request in WORKFLOW_REQUESTS.items():
+        if request in text:
+            return workflow
+    return "FULL_RECOMMENDATION"
+
+
+def _intent_json(workflow: str) -> str:
+    card = WORKFLOW_CARDS[workflow]
+    return json.dumps({
+        "workflow_type": workflow,
+        "required_agents": list(card["required_agents"]),
+        "primary_agent": card["primary_agent"],
+        "reasoning": "벤치마크 스크립트 응답",
+        "user_intent": card["user_intent"],
+    }, ensure_ascii=False)
+
+
+def _function_names(tool_name: str) -> set:
+    """도구 이름이 function calling 요청에 들어가는 형태 (CrewAI 버전에 따라 정리된 이름 사용)"""
+    names = {tool_name}
+    try:
+        from crewai.utilities.string_utils import sanitize_tool_name
+    except ImportError:
+        return names
+    sanitized = sanitize_tool_name(tool_name)
+    if sanitized:
+        names.add(sanitized)
+    return names
+
+
+def _find_tool(body: dict, tool_name: str) -> str:
+    """요청의 도구 목록에서 스크립트된 도구의 함수 이름 찾기 (없으면 빈 문자열)"""
+    names = _function_names(tool_name)
+    for spec in body.get("tools") or []:
+        function = spec.get("function", {})
+        if function.get("name") in names or tool_name in (function.get("description") or ""):
+            return function.get("name", "")
+    return ""
+
+
+def scripted_responder(body: dict):
+    """
+    스텁 LLM 응답 스크립트
+    - 도구 내부 호출: 의도 분석 JSON / 레시피
+    - 에이전트: 도구 결과가 없으면 스크립트된 도구 호출, 있으면 최종 답변
+      (네이티브 function calling과 ReAct 텍스트 형식 모두 지원)
+    """
+    messages = body.get("messages") or []
+    text = "\n".join(str(m.get("content") or "") for m in messages)
+    last = str(messages[-1].get("content") or "") if messages else ""
+    role = agent_role(body)
+
+    if not role:
+        if "워크플로우 타입" in last:
+            return _intent_json(_request_in(last))
+        if "레시피" in last:
+            return STUB_RECIPE
+        return "[]"   # 메뉴 일괄 판정 등 (판정 결과 없음)
+
+    has_tool_result = any(m.get("role") == "tool" for m in messages) or "Observation:" in text
+    script = AGENT_TOOL_SCRIPT.get(role)
+    if script and not has_tool_result:
+        tool_name, arguments = script
+        if arguments is None:
+            arguments = {"user_message": WORKFLOW_REQUESTS[_request_in(text)]}
+        function_name = _find_tool(body, tool_name)
+        if function_name:
+            return {"tool_calls": [{"name": function_name, "arguments": arguments}]}
+        if "Action Input" in text:
+            return (
+                f"Thought: '{tool_name}' 도구로 확인합니다.\n"
+                f"Action: {tool_name}\nAction Input: {json.dumps(arguments, ensure_ascii=False)}"
+            )
+
+    if role == "AI 오케스트레이터 & 워크플로우 디자이너":
+        answer = _intent_json(_request_in(text))
+    else:
+        answer = f"{role} 벤치마크 응답입니다."
+    return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+
+# 현재 단계 - CrewAI는 도구 / LLM 호출을 다른 스레드에서 실행할 때 컨텍스트를 복사해 넘기므로
+# 스레드가 아니라 ContextVar로 추적
+_current_stage = contextvars.ContextVar("bench_stage", default=None)
+
+
+class StageMeter:
+    """
+    실행 1회의 단계별 계측값
+    - intent / prefetch: 크루의 의도 분석 / 사용자 컨텍스트 사전 조회 메서드 실행 구간
+    - 에이전트 역할: 해당 에이전트의 execute_task 실행 구간 (도구 호출, 도구 안의 LLM 호출 포함)
+    """
+
+    def __init__(self):
+        self.stages = defaultdict(lambda: dict.fromkeys(STAGE_FIELDS, 0))
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        token = _current_stage.set(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, "wall_s", time.perf_counter() - start)
+            _current_stage.reset(token)
+
+    def current(self) -> str:
+        return _current_stage.get() or "other"
+
+    def add(self, stage: str, field: str, value=1):
+        with self._lock:
+            self.stages[stage][field] += value
+
+    def report(self) -> dict:
+        """{단계: 계측값} (실행 시간은 초, 소수점 4자리)"""
+        with self._lock:
+            return {
+                stage: {**values, "wall_s": round(values["wall_s"], 4)}
+                for stage, values in self.stages.items()
+            }
+
+
+_active_meter = None
+
+
+class MeteringTransport(httpx.BaseTransport):
+    """공유 OpenAI 클라이언트 전송 계층 - LLM 요청마다 현재 단계에 호출 수 / 프롬프트 토큰 기록"""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(request)
+        content = response.read()
+        try:
+            prompt_tokens = json.loads(content).get("usage", {}).get("prompt_tokens", 0)
+        except (ValueError, AttributeError):
+            prompt_tokens = 0
+        if _active_meter is not None:
+            stage = _active_meter.current()
+            _active_meter.add(stage, "llm_calls")
+            _active_meter.add(stage, "prompt_tokens", prompt_tokens)
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length")]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def close(self):
+        self.inner.close()
+
+
+def _metered_tool(tool):
+    """CrewAI 도구 호출 수를 현재 단계에 기록 (도구 객체는 크루끼리 공유되므로 한 번만 감쌈)"""
+    func = tool.func
+    if getattr(func, "metered", False):
+        return
+
+    def wrapper(*args, **kwargs):
+        if _active_meter is not None:
+            _active_meter.add(_active_meter.current(), "tool_calls")
+        return func(*args, **kwargs)
+
+    wrapper.metered = True
+    tool.func = wrapper
+
+
+def _metered_pool(pool):
+    """MCP 도구 호출 수와 그 호출에서 생긴 서버 프로세스 수를 현재 단계에 기록"""
+    call_tool = pool.call_tool
+
+    def wrapper(tool_name, arguments=None):
+        spawns = pool.stats["spawns"]
+        try:
+            return call_tool(tool_name, arguments)
+        finally:
+            if _active_meter is not None:
+                stage = _active_meter.current()
+                _active_meter.add(stage, "mcp_calls")
+                # 병렬 단계에서는 동시에 생긴 프로세스가 함께 집계될 수 있음 (실행 전체 합계는 정확)
+                _active_meter.add(stage, "mcp_spawns", pool.stats["spawns"] - spawns)
+
+    pool.call_tool = wrapper
+
+
+def _staged(meter: StageMeter, name: str, method):
+    def wrapper(*args, **kwargs):
+        with meter.stage(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def _totals(stages: dict) -> dict:
+    return {field: sum(stage[field] for stage in stages.values()) for field in STAGE_FIELDS if field != "wall_s"}
+
+
+def warm_up(pool, user: str, sessions: int):
+    """
+    페르소나의 MCP 세션을 미리 띄워 실행 순서와 무관하게 같은 조건으로 측정
+    (병렬 태스크가 동시에 쓰는 세션까지 풀 크기만큼 동시에 생성)
+    """
+    os.environ["CURRENT_NOTION_USER"] = user
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(lambda _: pool.call_tool("get_user_preferences", {}), range(sessions)))
+
+
+def run_case(crew_class, pool, workflow: str, user: str, verbose: bool, cold_mcp: bool) -> dict:
+    """워크플로우 1개 × 페르소나 1명 실행"""
+    global _active_meter
+
+    os.environ["CURRENT_NOTION_USER"] = user
+    if cold_mcp:
+        pool.close()
+
+    init_start = time.perf_counter()
+    crew = crew_class()
+    init_s = time.perf_counter() - init_start
+    for agent in [crew.orchestrator_agent, crew.coordinator_agent, *crew.agent_map.values()]:
+        for tool in agent.tools or []:
+            if hasattr(tool, "func"):
+                _metered_tool(tool)
+
+    meter = StageMeter()
+    crew.analyze_intent = _staged(meter, "intent", crew.analyze_intent)
+    crew.prefetch_user_context = _staged(meter, "prefetch", crew.prefetch_user_context)
+    # 오케스트레이터는 intent 단계 안에서 실행되므로 감싸지 않음
+    for agent in [crew.coordinator_agent, *crew.agent_map.values()]:
+        object.__setattr__(agent, "execute_task", _staged(meter, agent.role, agent.execute_task))
+    spawns = pool.stats["spawns"]
+
+    _active_meter = meter
+    error = None
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.nullcontext() if verbose else contextlib.redirect_stdout(output):
+            crew.run(WORKFLOW_REQUESTS[workflow])
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall_s = time.perf_counter() - start
+    _active_meter = None
+
+    stages = meter.report()
+    return {
+        "workflow": workflow,
+        "user": user,
+        "request": WORKFLOW_REQUESTS[workflow],
+        "routed_workflow": crew.last_timing.get("workflow_type"),
+        "ok": error is None,
+        "error": error,
+        "init_s": round(init_s, 4),
+        "wall_s": round(wall_s, 4),
+        "totals": {**_totals(stages), "mcp_spawns": pool.stats["spawns"] - spawns},
+        "stages": stages,
+        "crew_timing": {k: round(v, 4) if isinstance(v, float) else v for k, v in crew.last_timing.items()
+                        if k != "tasks"},
+    }
+
+
+def summarize(runs: list) -> dict:
+    """워크플로우별 평균"""
+    summary = {}
+    for workflow in dict.fromkeys(run["workflow"] for run in runs):
+        group = [run for run in runs if run["workflow"] == workflow]
+        summary[workflow] = {
+            "runs": len(group),
+            "failures": sum(not run["ok"] for run in group),
+            "mean_wall_s": round(sum(run["wall_s"] for run in group) / len(group), 4),
+            **{
+                f"mean_{field}": round(sum(run["totals"][field] for run in group) / len(group), 2)
+                for field in GATED_COUNTS
+            },
+        }
+    return summary
+
+
+# 기준 결과와 같아야 비교할 수 있는 실행 설정
+COMPARABLE_SETTINGS = ("llm_latency_s", "llm_intent", "cold_mcp")
+
+
+def compare(baseline: dict, current: dict, max_wall_regression: float, wall_slack_s: float) -> list:
+    """기준 결과 대비 회귀 목록 (같은 워크플로우 × 페르소나끼리 비교)"""
+    mismatched = [
+        f"{key}={baseline['meta'].get(key)!r} -> {current['meta'].get(key)!r}"
+        for key in COMPARABLE_SETTINGS if baseline.get("meta", {}).get(key) != current["meta"].get(key)
+    ]
+    if mismatched:
+        raise SystemExit(f"❌ 기준 결과와 실행 설정이 달라 비교할 수 없습니다: {', '.join(mismatched)}")
+    previous = {(run["workflow"], run["user"]): run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in current["runs"]:
+        before = previous.get((run["workflow"], run["user"]))
+        if before is None:
+            continue
+        label = f"{run['workflow']} / {run['user']}"
+        if before["ok"] and not run["ok"]:
+            regressions.append(f"{label}: 새로 실패 - {run['error']}")
+            continue
+        for field in GATED_COUNTS:
+            if run["totals"][field] > before["totals"][field]:
+                regressions.append(f"{label}: {field} {before['totals'][field]} -> {run['totals'][field]}")
+        if run["wall_s"] > before["wall_s"] * (1 + max_wall_regression) + wall_slack_s:
+            regressions.append(f"{label}: wall_s {before['wall_s']:.3f} -> {run['wall_s']:.3f}")
+    return regressions
+
+
+def _print_run(run: dict):
+    totals = run["totals"]
+    status = "✅" if run["ok"] else "❌"
+    print(
+        f"{status} {run['workflow']:<20} {run['user']:<4} wall={run['wall_s']:7.3f}s "
+        f"llm={totals['llm_calls']:<3} tools={totals['tool_calls']:<3} mcp={totals['mcp_calls']:<3} "
+        f"spawns={totals['mcp_spawns']:<2} prompt_tokens={totals['prompt_tokens']}"
+    )
+    if run["error"]:
+        print(f"   ⚠️ {run['error'][:160]}")
+
+
+def _parse_list(value: str, choices) -> list:
+    if not value:
+        return list(choices)
+    selected = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in selected if item not in choices]
+    if unknown:
+        raise SystemExit(f"알 수 없는 값: {', '.join(unknown)} (가능: {', '.join(choices)})")
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워크플로우 엔드투엔드 벤치마크 (스텁 LLM + Mock MCP)")
+    parser.add_argument("--workflows", default="", help="쉼표 구분 워크플로우 (기본: 전체)")
+    parser.add_argument("--users", default="", help="쉼표 구분 페르소나 (기본: user_manager.USERS 전체)")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "results" / "workflows.json"))
+    parser.add_argument("--baseline", default="", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-wall-regression", type=float, default=0.5, help="허용 실행 시간 증가율")
+    parser.add_argument("--wall-slack", type=float, default=0.05, help="실행 시간 비교 시 허용 오차 (초)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="스텁 LLM 응답 지연 (초)")
+    parser.add_argument("--llm-intent", action="store_true", help="규칙 기반 fast path 대신 LLM 의도 분석 사용")
+    parser.add_argument("--cold-mcp", action="store_true",
+                        help="실행마다 MCP 세션 풀을 비워 프로세스 생성부터 측정 (기본: 페르소나별로 미리 띄움)")
+    parser.add_argument("--verbose", action="store_true", help="크루 실행 로그 출력")
+    args = parser.parse_args()
+
+    workflows = _parse_list(args.workflows, [w for w in WORKFLOW_CARDS if w in WORKFLOW_REQUESTS])
+    users = _parse_list(args.users, list(USERS))
+    if args.llm_intent:
+        os.environ["INTENT_FAST_PATH_THRESHOLD"] = "1.1"
+
+    server = OpenAIStubServer(scripted_responder, latency=args.llm_latency).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    from crew import FoodRecommendationCrew
+    from llm_client import close_openai_clients, http_limits, set_http_transport
+    from mcp_client.notion_mcp_client import MCP_POOL_SIZE, get_mcp_pool
+
+    set_http_transport(MeteringTransport(httpx.HTTPTransport(limits=http_limits())))
+    pool = get_mcp_pool()
+    _metered_pool(pool)
+
+    print("=" * 80)
+    print(f"워크플로우 벤치마크: {len(workflows)}개 워크플로우 × {len(users)}명")
+    print("=" * 80)
+
+    runs = []
+    try:
+        # CrewAI 첫 실행의 초기화 비용은 측정에서 제외
+        print("🔥 워밍업 실행 (결과 제외)")
+        run_case(FoodRecommendationCrew, pool, workflows[0], users[0], args.verbose, args.cold_mcp)
+
+        # 페르소나별로 묶어 실행 (MCP 세션은 사용자별로 재사용됨)
+        for user in users:
+            if not args.cold_mcp:
+                warm_up(pool, user, MCP_POOL_SIZE)
+            for workflow in workflows:
+                run = run_case(FoodRecommendationCrew, pool, workflow, user, args.verbose, args.cold_mcp)
+                _print_run(run)
+                runs.append(run)
+    finally:
+        set_http_transport(None)
+        close_openai_clients()
+        pool.close()
+        server.stop()
+
+    import crewai
+    result = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "crewai": getattr(crewai, "__version__", ""),
+            "llm_latency_s": args.llm_latency,
+            "llm_intent": args.llm_intent,
+            "cold_mcp": args.cold_mcp,
+            "stub_requests": server.requests,
+        },
+        "summary": summarize(runs),
+        "runs": runs,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    failures = sum(not run["ok"] for run in runs)
+    print(f"\n📝 결과 저장: {output} (실행 {len(runs)}회, 실패 {failures}회)")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(baseline, result, args.max_wall_regression, args.wall_slack)
+        if regressions:
+            print(f"\n❌ 기준 결과 대비 회귀 {len(regressions)}건:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            sys.exit(1)
+        print("\n✅ 기준 결과 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
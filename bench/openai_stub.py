@@ -0,0 +1,115 @@
+"""
+로컬 OpenAI 호환 스텁 서버 (벤치마크용)
+/v1/chat/completions 요청에 고정 응답을 돌려주고, 요청 수와 TCP 연결 수를 기록
+
+사용:
+    server = OpenAIStubServer(responder=lambda body: "응답")
+    server.start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+
+def _completion(body: dict, content: Union[str, dict]) -> dict:
+    """chat.completions 응답 형식 (content가 {"tool_calls": [{"name", "arguments"}]}이면 도구 호출 응답)"""
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in body.get("messages", []))
+    message = {"role": "assistant", "content": content}
+    finish_reason = "stop"
+    if isinstance(content, dict):
+        message = {"role": "assistant", "content": None, "tool_calls": [
+            {
+                "id": f"call_stub_{i}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}), ensure_ascii=False)}
+            }
+            for i, call in enumerate(content["tool_calls"])
+        ]}
+        finish_reason = "tool_calls"
+        content = json.dumps(content, ensure_ascii=False)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": finish_reason
+        }],
+        "usage": {
+            "prompt_tokens": prompt_chars // 2,
+            "completion_tokens": len(content) // 2,
+            "total_tokens": (prompt_chars + len(content)) // 2
+        }
+    }
+
+
+class OpenAIStubServer:
+    """
+    OpenAI 호환 스텁 서버 (HTTP/1.1 keep-alive)
+
+    Args:
+        responder: 요청 body(dict) -> 응답 content(str) 또는 도구 호출 {"tool_calls": [...]}. 없으면 "OK"
+        latency: 응답마다 추가할 지연 시간 (초)
+    """
+
+    def __init__(self, responder: Optional[Callable[[dict], Union[str, dict]]] = None, latency: float = 0.0):
+        self.responder = responder or (lambda body: "OK")
+        self.latency = latency
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                payload = json.dumps(_completion(body, stub.responder(body)), ensure_ascii=False).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "OpenAIStubServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
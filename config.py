@@ -3,7 +3,6 @@
 """
 import os
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 # 환경 변수 로드
 load_dotenv()
@@ -12,14 +11,41 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
+# OpenAI 공유 클라이언트 설정 (llm_client.py)
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# LLM 응답 캐시 (llm_cache.py) - 기본 비활성화, 켜면 지정한 워크플로우만 캐시
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.path.dirname(__file__), "data", "llm_cache.sqlite"))
+LLM_CACHE_WORKFLOWS = {
+    name.strip().upper() for name in os.getenv("LLM_CACHE_WORKFLOWS", "INTENT,BUDGET_CHECK").split(",") if name.strip()
+}
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "50"))
+
+# LLM 요청 녹화 / 재생 (llm_cassette.py) - record / replay, 비어 있으면 사용 안 함
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "").lower()
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", os.path.join(os.path.dirname(__file__), "bench", "cassettes", "session.json"))
+LLM_CASSETTE_LATENCY = os.getenv("LLM_CASSETTE_LATENCY", "")
+
 # LLM 인스턴스 생성
 def get_llm(temperature=0.7):
-    """LLM 인스턴스 반환"""
-    return ChatOpenAI(
+    """LLM 인스턴스 반환 (도구와 같은 OpenAI 연결 풀 사용, 응답 캐시는 cache_workflow로 지정)"""
+    from llm_cache import CachingOpenAICompletion
+    from llm_client import attach_shared_client
+
+    llm = CachingOpenAICompletion(
         model=OPENAI_MODEL,
         temperature=temperature,
-        api_key=OPENAI_API_KEY
+        api_key=OPENAI_API_KEY,
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES
     )
+    return attach_shared_client(llm)
 
 # 에이전트 가중치
 AGENT_WEIGHTS = {
@@ -42,9 +68,17 @@ USE_NOTION_MCP = os.getenv("USE_NOTION_MCP", "false").lower() == "true"
 NOTION_API_KEY = os.getenv("NOTION_API_KEY")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 
+# 규칙 기반 의도 분류 신뢰도가 이 값 이상이면 LLM 오케스트레이터를 건너뜀
+INTENT_FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", "0.8"))
+
 # CrewAI 설정
 CREW_CONFIG = {
     "verbose": True,
     "memory": False,  # 메모리 기능 비활성화 (간단한 구현)
+    # 실행 시작 시 사용자 Notion 컨텍스트를 1회 조회해 태스크 설명에 삽입
+    "prefetch_user_context": os.getenv("PREFETCH_USER_CONTEXT", "true").lower() == "true",
+    # 서로 의존하지 않는 전문가 태스크를 동시에 실행 (coordinator 전에 합류)
+    "parallel_tasks": os.getenv("PARALLEL_TASKS", "true").lower() == "true",
+    "max_parallel_tasks": int(os.getenv("MAX_PARALLEL_TASKS", "3")),
 }
 
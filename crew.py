@@ -12,8 +12,22 @@ from agents import (
     create_coordinator_agent,
 )
 from agents.orchestrator_agent import create_orchestrator_agent
-from config import get_llm, CREW_CONFIG
+from config import get_llm, CREW_CONFIG, INTENT_FAST_PATH_THRESHOLD
+from llm_cache import INTENT_WORKFLOW, set_cache_workflow
+from tools.notion_tools import fetch_user_context, format_user_context
+from tools.llm_judge_tools import track_user_preferences
+from tools.orchestrator_tools import FOLLOW_UP_MARKERS, classify_intent_fast, record_intent_route
+from tools.recipe_tools import (
+    cached_recipe,
+    format_recipe,
+    get_recipe_cache,
+    parse_recipe_request,
+    recipe_health_info
+)
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import json
+import time
 
 
 class FoodRecommendationCrew:
@@ -52,8 +66,70 @@ class FoodRecommendationCrew:
         # 대화 히스토리
         self.conversation_history = []
         
-        # 레시피 캐시 (메뉴명 -> 레시피 매핑)
-        self.recipe_cache = {}
+        # 레시피 캐시 ((요리명, 건강 정보) -> 레시피, 세션·프로세스 간 공유되는 SQLite 파일)
+        self.recipe_cache = get_recipe_cache()
+        
+        # 이번 실행에서 사전 조회한 사용자 컨텍스트 (태스크 설명에 삽입)
+        self.user_context = ""
+        # 사전 조회한 선호도 기준 레시피 건강 정보 (레시피 캐시 키)
+        self.recipe_health_info = ""
+        
+        # 동시에 실행할 수 있는 독립 태스크 (create_*_tasks에서 지정)
+        self.parallel_tasks = []
+        
+        # 마지막 실행의 단계별 소요 시간
+        self.last_timing = {}
+    
+    def prefetch_user_context(self) -> str:
+        """
+        사용자 Notion 컨텍스트(선호도·일정·예산·식단 기록)를 한 번에 조회
+        실패하면 빈 문자열을 반환하고, 에이전트는 기존 조회 도구를 사용합니다.
+        """
+        try:
+            context = fetch_user_context()
+        except Exception as e:
+            print(f"⚠️ 사용자 컨텍스트 사전 조회 실패 (도구 조회로 대체): {e}")
+            return ""
+        
+        # 선호도가 바뀌었으면 이전 메뉴 판정 캐시 무효화
+        try:
+            track_user_preferences(context.get("user"), context.get("preferences"))
+        except Exception as e:
+            print(f"⚠️ 메뉴 판정 캐시 갱신 실패: {e}")
+        self.recipe_health_info = recipe_health_info(context.get("preferences"))
+        return format_user_context(context)
+    
+    def _with_user_context(self, user_request: str) -> str:
+        """태스크 설명 머리말: 사용자 요청 + 사전 조회된 사용자 컨텍스트"""
+        header = f"사용자 요청: {user_request}\n\n"
+        if self.user_context:
+            header += (
+                "📋 **사용자 컨텍스트 (Notion에서 사전 조회됨)**\n"
+                f"{self.user_context}\n\n"
+            )
+        return header
+    
+    def cached_recipe_response(self, user_request: str):
+        """
+        단순 레시피 요청("된장찌개 만드는 법 알려줘")이고 같은 요리·건강 정보의 레시피가 캐시에 있으면
+        에이전트 실행 없이 바로 응답 (없으면 None)
+        """
+        if any(marker in user_request for marker in FOLLOW_UP_MARKERS):
+            return None
+        if not self.user_context:
+            return None  # 건강 정보를 모르면 개인화 레시피를 재사용할 수 없음
+        dish_name = parse_recipe_request(user_request)
+        recipe = cached_recipe(dish_name, self.recipe_health_info) if dish_name else None
+        if recipe is None:
+            return None
+        print(f"⚡ '{dish_name}' 레시피 캐시 사용 - 에이전트 실행 생략 (건강 정보: {self.recipe_health_info or '없음'})\n")
+        return format_recipe(recipe, self.recipe_health_info)
+    
+    def _lookup_step(self, tool_name: str, what: str, fallback: str) -> str:
+        """조회 단계 안내 - 사전 조회된 컨텍스트가 있으면 도구 호출 대신 컨텍스트 참조"""
+        if self.user_context:
+            return f"위 '사용자 컨텍스트'에서 {what} 확인하세요. (정보가 없을 때만 '{tool_name}' 도구 사용)"
+        return fallback
     
     def analyze_intent(self, user_request: str) -> dict:
         """
@@ -63,6 +139,17 @@ class FoodRecommendationCrew:
         # 대화 맥락 준비
         history_str = "\n".join(self.conversation_history[-3:]) if self.conversation_history else ""
         
+        # 규칙 기반 분류가 확실하면 LLM 호출 생략
+        fast_intent = classify_intent_fast(user_request, history_str)
+        if fast_intent["confidence"] >= INTENT_FAST_PATH_THRESHOLD:
+            record_intent_route("fast_path")
+            print(f"\n⚡ 규칙 기반 의도 분석 (신뢰도 {fast_intent['confidence']:.2f}): "
+                  f"{fast_intent['workflow_type']} - {fast_intent['user_intent']}")
+            print(f"   필요 에이전트: {', '.join(fast_intent['required_agents'])}\n")
+            return fast_intent
+        record_intent_route("llm")
+        set_cache_workflow(INTENT_WORKFLOW)
+        
         # 오케스트레이터로 의도 분석
         intent_task = Task(
             description=(
@@ -125,6 +212,7 @@ class FoodRecommendationCrew:
         
         tasks = []
         agent_tasks = {}
+        self.parallel_tasks = []
         
         print(f"📋 워크플로우 타입: {workflow_type}")
         print(f"👥 활성화된 에이전트: {', '.join(required_agents)}\n")
@@ -137,6 +225,14 @@ class FoodRecommendationCrew:
                 recent_history = self.conversation_history[-4:]  # 최근 4개
                 history_context = "\n\n📜 **대화 맥락 (이전 대화 참고):**\n" + "\n".join(recent_history)
             
+            # 사전 조회한 건강 정보를 그대로 넘겨야 레시피 캐시 키가 일정함
+            health_step = ""
+            if self.recipe_health_info:
+                health_step = (
+                    f"- 사용자 건강 정보 (Notion에서 사전 조회됨): user_health_info='{self.recipe_health_info}' "
+                    "를 그대로 전달하세요 ('사용자 선호도 조회' 불필요)\n"
+                )
+            
             recipe_task = Task(
                 description=(
                     f"사용자 요청: {user_request}"
@@ -154,7 +250,8 @@ class FoodRecommendationCrew:
                     "📝 **도구 사용법:**\n"
                     "- 도구명: 'AI 레시피 생성'\n"
                     "- 파라미터: dish_name='요리이름'\n"
-                    "- 예시: AI 레시피 생성(dish_name='된장찌개')\n\n"
+                    "- 예시: AI 레시피 생성(dish_name='된장찌개')\n"
+                    f"{health_step}\n"
                     
                     "💡 **팁:**\n"
                     "- 사용자가 '~말고', '다른 거'라고 하면 이전 대화를 참고하세요\n"
@@ -171,11 +268,14 @@ class FoodRecommendationCrew:
         
         # BUDGET_CHECK: 예산 확인만
         elif workflow_type == "BUDGET_CHECK":
+            budget_step = self._lookup_step(
+                "예산 현황 조회", "예산 현황을", "'예산 현황 조회' 도구를 사용하세요."
+            )
             budget_task = Task(
                 description=(
-                    f"사용자 요청: {user_request}\n\n"
+                    f"{self._with_user_context(user_request)}"
                     "사용자의 예산 현황을 확인하고 보고하세요.\n"
-                    "1. '예산 현황 조회' 도구를 사용하세요.\n"
+                    f"1. {budget_step}\n"
                     "2. 현재 남은 예산, 사용한 금액, 선호 가격대를 알려주세요.\n"
                     "3. 예산 관리 조언을 제공하세요."
                 ),
@@ -186,11 +286,14 @@ class FoodRecommendationCrew:
         
         # NUTRITION_INFO: 영양 정보만
         elif workflow_type == "NUTRITION_INFO":
+            history_step = self._lookup_step(
+                "식단 기록 조회", "최근 식단을", "'식단 기록 조회' 도구로 최근 식단을 확인하세요."
+            )
             nutrition_task = Task(
                 description=(
-                    f"사용자 요청: {user_request}\n\n"
+                    f"{self._with_user_context(user_request)}"
                     "영양 정보를 제공하세요.\n"
-                    "1. '식단 기록 조회' 도구로 최근 식단을 확인하세요.\n"
+                    f"1. {history_step}\n"
                     "2. 칼로리와 영양소 분석을 제공하세요.\n"
                     "3. 건강 조언을 제공하세요."
                 ),
@@ -201,11 +304,14 @@ class FoodRecommendationCrew:
         
         # SCHEDULE_CHECK: 일정 확인만
         elif workflow_type == "SCHEDULE_CHECK":
+            schedule_step = self._lookup_step(
+                "사용자 일정 조회", "일정과 가용 시간을", "'사용자 일정 조회' 도구를 사용하세요."
+            )
             schedule_task = Task(
                 description=(
-                    f"사용자 요청: {user_request}\n\n"
+                    f"{self._with_user_context(user_request)}"
                     "사용자의 일정을 확인하고 보고하세요.\n"
-                    "1. '사용자 일정 조회' 도구를 사용하세요.\n"
+                    f"1. {schedule_step}\n"
                     "2. 오늘 일정과 식사 가능한 시간을 알려주세요."
                 ),
                 expected_output="일정 보고서",
@@ -215,11 +321,14 @@ class FoodRecommendationCrew:
         
         # QUICK_MEAL: 빠른 식사
         elif workflow_type == "QUICK_MEAL":
+            schedule_step = self._lookup_step(
+                "사용자 일정 조회", "가용 시간을", "'사용자 일정 조회' 도구를 사용하세요."
+            )
             schedule_task = Task(
                 description=(
-                    f"사용자 요청: {user_request}\n\n"
+                    f"{self._with_user_context(user_request)}"
                     "사용자의 가용 시간을 확인하세요.\n"
-                    "1. '사용자 일정 조회' 도구를 사용하세요.\n"
+                    f"1. {schedule_step}\n"
                     "2. 식사 가능한 시간을 파악하세요."
                 ),
                 expected_output="가용 시간 정보",
@@ -252,20 +361,40 @@ class FoodRecommendationCrew:
     def create_full_recommendation_tasks(self, user_request: str) -> list[Task]:
         """전체 메뉴 추천을 위한 모든 태스크 생성"""
         
+        # Notion 조회 단계 (사전 조회된 컨텍스트가 있으면 도구 호출 생략)
+        prefs_step = self._lookup_step(
+            "사용자 선호도 조회", "알레르기 정보를",
+            "'사용자 선호도 조회' 도구를 **반드시 먼저** 사용하여 알레르기 정보를 확인하세요."
+        )
+        history_step = self._lookup_step(
+            "식단 기록 조회", "최근 7일간 식단을",
+            "'식단 기록 조회' 도구로 최근 7일간 식단을 분석하세요."
+        )
+        budget_step = self._lookup_step(
+            "예산 현황 조회", "예산 정보를",
+            "'예산 현황 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 예산 정보를 가져오세요."
+        )
+        schedule_step = self._lookup_step(
+            "사용자 일정 조회", "가용 시간을",
+            "'사용자 일정 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 가용 시간을 가져오세요."
+        )
+        
         # Task 1: 영양사 - 건강 및 영양 분석 (Notion 데이터 기반)
         nutrition_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "🔴 **최우선: 알레르기 확인**\n"
-                "1. '사용자 선호도 조회' 도구를 **반드시 먼저** 사용하여 알레르기 정보를 확인하세요.\n"
+                f"1. {prefs_step}\n"
                 "2. 알레르기 식재료가 포함된 메뉴는 절대 추천하지 마세요!\n\n"
                 "📊 **Notion 데이터 분석**\n"
-                "3. '식단 기록 조회' 도구로 최근 7일간 식단을 분석하세요.\n"
+                f"3. {history_step}\n"
                 "4. 부족한 영양소를 파악하고 보완 방향을 제시하세요.\n\n"
                 "🎯 **개인화된 추천**\n"
                 "5. 사용자의 선호 음식 종류를 우선적으로 고려하세요.\n"
                 "6. 다이어트 목표에 맞는 칼로리 범위의 메뉴를 선정하세요.\n"
                 "7. '메뉴 검색' 도구로 영양학적으로 적합한 메뉴 후보를 찾으세요.\n"
+                "   - 알레르기/식단 제한은 exclude_allergens / diet에 그대로 전달 (해당 메뉴가 미리 제외됨)\n"
+                "     예: search_restaurants(max_budget=15000, exclude_allergens='갑각류', diet='저염')\n"
                 "8. 건강 관점에서 최적의 메뉴 3-5개를 선정하고 Notion 데이터 기반 이유를 설명하세요."
             ),
             expected_output=(
@@ -277,9 +406,9 @@ class FoodRecommendationCrew:
         # Task 2: 예산 관리자 - 가성비 분석 (Notion 데이터 기반)
         budget_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "💰 **Notion 예산 데이터 확인**\n"
-                "1. '예산 현황 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 예산 정보를 가져오세요.\n"
+                f"1. {budget_step}\n"
                 "2. 남은 예산과 선호 가격대를 확인하세요.\n\n"
                 "🔒 **예산 범위 엄수**\n"
                 "3. 남은 예산을 절대 초과하지 않는 메뉴만 선정하세요.\n"
@@ -298,9 +427,9 @@ class FoodRecommendationCrew:
         # Task 3: 시간 관리자 - 시간 효율성 분석 (Notion 데이터 기반)
         scheduler_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "⏰ **Notion 일정 데이터 확인**\n"
-                "1. '사용자 일정 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 가용 시간을 가져오세요.\n"
+                f"1. {schedule_step}\n"
                 "2. 식사 시간대와 가용 시간(분)을 정확히 파악하세요.\n\n"
                 "🔒 **시간 제약 엄수**\n"
                 "3. 가용 시간을 절대 초과하지 않는 메뉴만 선정하세요.\n"
@@ -320,7 +449,7 @@ class FoodRecommendationCrew:
         # Task 4: 요리사 - 집밥 레시피 추천
         chef_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "1. 사용자의 요리 실력과 선호도를 확인하세요.\n"
                 "2. 집에서 만들 수 있는 레시피를 검색하세요.\n"
                 "3. 난이도와 조리 시간을 고려하여 실행 가능한 레시피를 선별하세요.\n"
@@ -336,7 +465,7 @@ class FoodRecommendationCrew:
         # Task 5: 맛슐랭 - 맛 평가
         taste_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "1. 사용자의 음식 선호도 (한식/일식 선호, 매운맛 정도 등)를 확인하세요.\n"
                 "2. 메뉴를 검색하여 평점이 높고 리뷰가 많은 레스토랑을 찾으세요.\n"
                 "3. 각 메뉴의 맛 특징 (매운맛, 단맛, 짠맛 등)을 분석하세요.\n"
@@ -352,7 +481,7 @@ class FoodRecommendationCrew:
         # Task 6: 코디네이터 - 최종 종합 판단 (Notion 데이터 기반)
         coordinator_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "🎯 **Notion 실시간 데이터 기반 종합 판단**\n"
                 "다음 전문가들이 Notion에서 가져온 개인화 데이터를 분석했습니다:\n"
                 "- 영양사: Notion 알레르기/선호도/식단 기록 분석\n"
@@ -388,6 +517,9 @@ class FoodRecommendationCrew:
             context=[nutrition_task, budget_task, scheduler_task, chef_task, taste_task]
         )
         
+        # 전문가 태스크 5개는 서로 독립적 - coordinator만 결과를 종합
+        self.parallel_tasks = [nutrition_task, budget_task, scheduler_task, chef_task, taste_task]
+        
         return [
             nutrition_task,
             budget_task,
@@ -400,12 +532,53 @@ class FoodRecommendationCrew:
     def create_restaurant_delivery_tasks(self, user_request: str) -> list[Task]:
         """외식/배달 추천을 위한 태스크 생성 (식당_DB.json 활용)"""
         
+        # Notion 조회 단계 (사전 조회된 컨텍스트가 있으면 도구 호출 생략)
+        budget_step = self._lookup_step(
+            "예산 현황 조회", "예산 정보를",
+            "'예산 현황 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 예산 정보를 가져오세요."
+        )
+        schedule_step = self._lookup_step(
+            "사용자 일정 조회", "가용 시간을",
+            "'사용자 일정 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 가용 시간을 가져오세요."
+        )
+        if self.user_context:
+            nutrition_lookup = (
+                "1. 위 '사용자 컨텍스트'에서 알레르기, 식이 제한 확인\n"
+                "2. 위 '사용자 컨텍스트'에서 최근 식단 확인\n"
+            )
+            nutrition_tool_rule = (
+                "⚠️ **중요: 사용자 정보는 이미 제공되었습니다**\n"
+                "- 선호도/식단 기록 조회 도구는 컨텍스트에 정보가 없을 때만 1회 사용\n"
+            )
+        else:
+            nutrition_lookup = (
+                "1. '사용자 선호도 조회' 도구를 1회만 사용하여 알레르기, 식이 제한 확인\n"
+                "2. '식단 기록 조회' 도구를 1회만 사용하여 최근 식단 확인\n"
+            )
+            nutrition_tool_rule = (
+                "⚠️ **중요: 도구는 정확히 2개만 사용하세요**\n"
+                "- 선호도 조회 (1회)\n"
+                "- 식단 기록 조회 (1회)\n"
+            )
+        prefs_step = self._lookup_step(
+            "사용자 선호도 조회", "선호 음식 종류를",
+            "'사용자 선호도 조회' 도구로 선호 음식 종류를 확인하세요."
+        )
+        history_step = self._lookup_step(
+            "식단 기록 조회", "과거 선호 패턴을",
+            "'식단 기록 조회' 도구로 과거 선호 패턴을 파악하세요."
+        )
+        persona_step = self._lookup_step(
+            "사용자 선호도 조회", "사용자 페르소나를",
+            "'사용자 선호도 조회' 도구로 최종 확인"
+        )
+        
         # Task 1: 예산 관리자 - 예산 기반 레스토랑 검색
         budget_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "💰 **Notion 예산 데이터 확인**\n"
-                "1. '예산 현황 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 예산 정보를 가져오세요.\n"
+                f"1. {budget_step}\n"
                 "2. 남은 예산과 선호 가격대를 확인하세요.\n\n"
                 "🍽️ **식당_DB.json에서 가성비 레스토랑 검색**\n"
                 "3. '예산 최적화 레스토랑 추천' 도구를 사용하여 예산 내 가성비 좋은 레스토랑을 찾으세요.\n"
@@ -432,9 +605,9 @@ class FoodRecommendationCrew:
         # Task 2: 일정 관리자 - 시간 기반 레스토랑 필터링
         scheduler_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "⏰ **Notion 일정 데이터 확인**\n"
-                "1. '사용자 일정 조회' 도구를 **반드시 먼저** 사용하여 Notion에서 가용 시간을 가져오세요.\n"
+                f"1. {schedule_step}\n"
                 "2. 식사 시간대와 가용 시간(분)을 정확히 파악하세요.\n\n"
                 "🍽️ **시간 제약 고려한 레스토랑 검색**\n"
                 "3. '레스토랑 검색 (예산 및 시간 기반)' 도구를 사용하여 시간 내 가능한 레스토랑을 찾으세요.\n"
@@ -442,6 +615,9 @@ class FoodRecommendationCrew:
                 "   - 매장 식사를 원하면: meal_type='매장'\n"
                 "   - ⚠️ keyword는 선택 사항! 필요시만 사용\n"
                 "   - 예: search_restaurants(max_budget=20000, max_time_minutes=30, meal_type='배달')\n"
+                "   - 식사 시간대(meal_window)가 있으면 open_at에 그대로 전달 (그 시간에 영업 중인 곳만 검색)\n"
+                "     예: search_restaurants(max_budget=20000, max_time_minutes=15, open_at='23:00–23:15')\n"
+                "   - 알레르기/식단 제한이 있으면 exclude_allergens / diet에 그대로 전달\n"
                 "   - ⚠️ 최대 2회만 호출! 결과 없으면 다음 단계로\n"
                 "4. 가용 시간을 초과하는 레스토랑은 제외하세요.\n\n"
                 "✅ **출력 요구사항**\n"
@@ -456,27 +632,25 @@ class FoodRecommendationCrew:
                 "- 추천 이유"
             ),
             agent=self.scheduler_agent,
-            context=[budget_task]
+            # 병렬 실행 시 예산 태스크와 동시에 시작 (설명상 예산 결과를 참조하지 않음)
+            context=[] if CREW_CONFIG["parallel_tasks"] else [budget_task]
         )
         
         # Task 3: 영양사 - 사용자 건강 정보 수집 및 영양 가이드라인 제공
         nutrition_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "당신은 영양사입니다. 이전 에이전트(예산, 일정)가 찾은 레스토랑 후보들을 평가하세요.\n\n"
                 
                 "**작업 순서:**\n"
-                "1. '사용자 선호도 조회' 도구를 1회만 사용하여 알레르기, 식이 제한 확인\n"
-                "2. '식단 기록 조회' 도구를 1회만 사용하여 최근 식단 확인\n"
+                f"{nutrition_lookup}"
                 "3. 이전 에이전트들이 추천한 레스토랑 목록을 보고:\n"
                 "   - 알레르기 위험 레스토랑 표시\n"
                 "   - 채식주의자에게 부적합한 레스토랑 표시 (고기집 등)\n"
                 "   - 건강 관점에서 추천/비추천 의견 제시\n"
                 "4. 작업 완료\n\n"
                 
-                "⚠️ **중요: 도구는 정확히 2개만 사용하세요**\n"
-                "- 선호도 조회 (1회)\n"
-                "- 식단 기록 조회 (1회)\n"
+                f"{nutrition_tool_rule}"
                 "- 레스토랑 검색은 하지 마세요! (이미 이전 에이전트가 했음)\n"
                 "- 추가 도구 호출 금지!"
             ),
@@ -495,7 +669,7 @@ class FoodRecommendationCrew:
         # Task 4: 맛슐랭 - 최종 레스토랑 추천 (desc/menu 적극 활용)
         taste_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "🔍 **이전 에이전트 분석 종합**\n"
                 "1. 예산 관리자, 일정 관리자, 영양사의 추천을 모두 검토하세요.\n"
                 "2. 공통적으로 추천된 레스토랑을 우선 고려하세요.\n"
@@ -513,11 +687,12 @@ class FoodRecommendationCrew:
                 "   예: '해물파전과 해물칼국수, 그날그날 들어오는 신선한 해물을 사용하여...'\n"
                 "   예: '정동진 관광지 근처의 망치매운탕 전문점으로, 이색 어종인 망치로...'\n\n"
                 "👤 **사용자 선호도 반영**\n"
-                "8. '사용자 선호도 조회' 도구로 선호 음식 종류를 확인하세요.\n"
-                "9. '식단 기록 조회' 도구로 과거 선호 패턴을 파악하세요.\n"
+                f"8. {prefs_step}\n"
+                f"9. {history_step}\n"
                 "10. 사용자의 맛 선호도 (매운맛, 단맛 등)에 맞는 레스토랑을 선정하세요.\n\n"
                 "🤖 **LLM as Judge - 개인화 최종 확인**\n"
-                "11. 최종 후보를 선정한 후, '메뉴 개인화 적합성 판단' 도구를 사용하세요.\n"
+                "11. 최종 후보를 선정한 후, 후보 메뉴 전체를 '메뉴 일괄 적합성 판단' 도구에 한 번에 전달하세요.\n"
+                "   예: judge_menus_batch(menus=['시골식당 - 매운탕', '썬한식 - 손두부'], user_persona_info='갑각류 알레르기')\n"
                 "   - 영양사가 이미 판단했지만, 맛 중심으로 추가한 메뉴가 있다면 재확인 필요\n"
                 "12. LLM 판단 결과가 '❌ 부적합'인 메뉴는 즉시 제외하세요.\n\n"
                 "🎯 **최종 추천 선정**\n"
@@ -553,7 +728,7 @@ class FoodRecommendationCrew:
         # Task 5: Coordinator - 최종 종합 판단 및 추천
         coordinator_task = Task(
             description=(
-                f"사용자 요청: {user_request}\n\n"
+                f"{self._with_user_context(user_request)}"
                 "🎯 **최종 의사결정자로서 종합 판단**\n\n"
                 "1. **모든 에이전트 결과 수집**\n"
                 "   - 예산 관리자의 가성비 분석\n"
@@ -561,7 +736,7 @@ class FoodRecommendationCrew:
                 "   - 영양사의 건강/알레르기 분석\n"
                 "   - 맛슐랭의 맛/품질 분석 (반드시 레스토랑명 포함!)\n\n"
                 "2. **사용자 페르소나 확인**\n"
-                "   - '사용자 선호도 조회' 도구로 최종 확인\n"
+                f"   - {persona_step}\n"
                 "   - 알레르기, 식이 제한, 건강 상태, 선호도 재확인\n\n"
                 "3. **중요: 레스토랑명 반드시 포함**\n"
                 "   - 이전 에이전트들(특히 맛슐랭)이 추천한 레스토랑의 **실제 이름**을 확인하세요\n"
@@ -609,8 +784,60 @@ class FoodRecommendationCrew:
             context=[budget_task, scheduler_task, nutrition_task, taste_task]
         )
         
+        # 예산/일정 태스크는 서로 독립적 - 영양사부터 두 결과를 함께 참조
+        self.parallel_tasks = [budget_task, scheduler_task]
+        
         return [budget_task, scheduler_task, nutrition_task, taste_task, coordinator_task]
     
+    def _run_single_task(self, task: Task) -> float:
+        """태스크 1개를 전용 Crew로 실행하고 소요 시간(초) 반환"""
+        start = time.perf_counter()
+        Crew(
+            agents=[task.agent],
+            tasks=[task],
+            process=Process.sequential,
+            verbose=CREW_CONFIG["verbose"],
+            memory=CREW_CONFIG["memory"],
+        ).kickoff()
+        return time.perf_counter() - start
+    
+    def _run_parallel_tasks(self, tasks: list[Task]) -> float:
+        """
+        서로 독립적인 태스크를 동시에 실행 (최대 max_parallel_tasks개)
+        결과는 각 task.output에 저장되어 이후 태스크의 context로 전달됨
+        
+        Returns:
+            병렬 단계 전체 소요 시간(초)
+        """
+        max_workers = max(1, min(CREW_CONFIG["max_parallel_tasks"], len(tasks)))
+        print(f"⚡ 독립 태스크 {len(tasks)}개 병렬 실행 (동시 실행 최대 {max_workers}개)\n")
+        
+        # 같은 역할의 태스크가 여러 개면 "역할 #순번"으로 구분해 소요 시간 기록
+        roles = [task.agent.role for task in tasks]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # 스레드마다 현재 컨텍스트(캐시 워크플로우 등)를 복사해 실행
+            futures = [executor.submit(contextvars.copy_context().run, self._run_single_task, task) for task in tasks]
+            for k, (role, future) in enumerate(zip(roles, futures)):
+                label = role if roles.count(role) == 1 else f"{role} #{k + 1}"
+                self.last_timing["tasks"][label] = future.result()
+        return time.perf_counter() - start
+    
+    def _print_timing_report(self):
+        """병렬 단계 소요 시간 리포트 (순차 실행 대비)"""
+        timing = self.last_timing
+        sequential_estimate = sum(timing["tasks"].values())
+        speedup = sequential_estimate / timing["parallel_wall"] if timing["parallel_wall"] > 0 else 1.0
+        
+        print(f"\n{'='*80}")
+        print(f"⏱️  실행 시간 리포트 ({timing['workflow_type']})")
+        print(f"{'='*80}")
+        for role, elapsed in timing["tasks"].items():
+            print(f"   - {role}: {elapsed:.1f}초")
+        print(f"   병렬 단계: {timing['parallel_wall']:.1f}초 (순차 실행 시 약 {sequential_estimate:.1f}초, {speedup:.1f}배)")
+        print(f"   종합 단계: {timing['sequential_wall']:.1f}초")
+        print(f"   전체: {timing['total_wall']:.1f}초")
+    
     def run(self, user_request: str) -> str:
         """
         동적 워크플로우로 크루 실행
@@ -622,11 +849,29 @@ class FoodRecommendationCrew:
         print(f"🚀 사용자 요청: {user_request}")
         print(f"{'='*80}\n")
         
-        # 1단계: 사용자 의도 분석
+        # 1단계: 사용자 의도 분석 (사용자 컨텍스트 사전 조회와 동시 진행)
         print("📊 1단계: 사용자 의도 분석 중...\n")
-        intent = self.analyze_intent(user_request)
-        
+        self.user_context = ""
+        self.recipe_health_info = ""
+        if CREW_CONFIG["prefetch_user_context"]:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                context_future = executor.submit(self.prefetch_user_context)
+                intent = self.analyze_intent(user_request)
+                self.user_context = context_future.result()
+        else:
+            intent = self.analyze_intent(user_request)
+
+        # 캐시된 레시피로 바로 답할 수 있으면 에이전트 실행 생략
+        if intent.get("workflow_type") == "RECIPE_ONLY":
+            cached = self.cached_recipe_response(user_request)
+            if cached is not None:
+                self.last_timing = {"workflow_type": "RECIPE_ONLY", "tasks": {}, "recipe_cache": True}
+                self.conversation_history.append(f"사용자: {user_request}")
+                self.conversation_history.append(f"시스템: {cached[:200]}...")
+                return cached
+
         # 2단계: 동적 태스크 생성
+        set_cache_workflow(intent.get("workflow_type"))
         print("🔧 2단계: 워크플로우 구성 중...\n")
         tasks = self.create_dynamic_tasks(user_request, intent)
         
@@ -646,6 +891,16 @@ class FoodRecommendationCrew:
         print("⚙️  3단계: 에이전트 실행 중...\n")
         print(f"{'='*80}\n")
         
+        run_start = time.perf_counter()
+        parallel_tasks = [task for task in tasks if task in self.parallel_tasks]
+        self.last_timing = {"workflow_type": workflow_type, "tasks": {}}
+        
+        if CREW_CONFIG["parallel_tasks"] and len(parallel_tasks) > 1:
+            # 독립 태스크를 동시에 실행한 뒤 나머지(종합) 태스크를 순차 실행
+            self.last_timing["parallel_wall"] = self._run_parallel_tasks(parallel_tasks)
+            tasks = [task for task in tasks if task not in parallel_tasks]
+            active_agents = [agent for agent in active_agents if any(task.agent is agent for task in tasks)]
+        
         crew = Crew(
             agents=active_agents,
             tasks=tasks,
@@ -655,7 +910,13 @@ class FoodRecommendationCrew:
         )
         
         # 실행
+        sequential_start = time.perf_counter()
         result = crew.kickoff()
+        self.last_timing["sequential_wall"] = time.perf_counter() - sequential_start
+        self.last_timing["total_wall"] = time.perf_counter() - run_start
+        
+        if "parallel_wall" in self.last_timing:
+            self._print_timing_report()
         
         # 대화 히스토리 업데이트
         self.conversation_history.append(f"사용자: {user_request}")
@@ -0,0 +1,236 @@
+"""
+LLM 응답 캐시 - 같은 모델·온도·메시지로 다시 호출하면 네트워크 없이 이전 응답 반환 (opt-in)
+
+같은 페르소나의 사용자는 태스크 설명·도구 결과가 같아 의도 분석, 예산 요약처럼 결정적인 단계에서
+똑같은 프롬프트가 반복됨. 워크플로우 단위로 켜고(LLM_CACHE_WORKFLOWS), 파일 크기가
+LLM_CACHE_MAX_MB를 넘으면 가장 오래 사용하지 않은 응답부터 삭제함.
+
+설정 (환경 변수, config.py):
+    LLM_CACHE_ENABLED     true일 때만 사용 (기본 false)
+    LLM_CACHE_PATH        SQLite 파일 경로
+    LLM_CACHE_WORKFLOWS   캐시할 워크플로우 (쉼표 구분, "*"는 전체)
+    LLM_CACHE_MAX_MB      저장할 응답 총 크기 상한
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from crewai.llms.providers.openai.completion import OpenAICompletion
+from openai import OpenAIError
+from openai.types.chat import ChatCompletionMessageFunctionToolCall
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_MAX_MB, LLM_CACHE_PATH, LLM_CACHE_WORKFLOWS
+
+# 의도 분석 단계 (오케스트레이터 에이전트 / '사용자 의도 분석' 도구)
+INTENT_WORKFLOW = "INTENT"
+
+LLM_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,             -- response_key()
+    workflow TEXT,
+    model TEXT,
+    response TEXT,                    -- JSON {"type": "text" | "tool_calls" | "completion", "value": ...}
+    size INTEGER,
+    created_at REAL,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+_llm_cache_stats = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+
+# 현재 실행 중인 워크플로우 (크루 실행마다 지정, 병렬 태스크 스레드에는 컨텍스트 복사로 전달)
+_current_workflow: ContextVar[Optional[str]] = ContextVar("llm_cache_workflow", default=None)
+
+
+def set_cache_workflow(workflow: Optional[str]):
+    """현재 실행 컨텍스트의 캐시 워크플로우 지정 (공유 LLM 인스턴스를 바꾸지 않음)"""
+    _current_workflow.set(workflow)
+
+
+def response_key(model: str, temperature: Optional[float], messages: Any, extra: Any = None) -> str:
+    """(모델, 온도, 메시지 전체, 도구 정의 등) 해시"""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages, "extra": extra},
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_enabled_for(workflow: Optional[str]) -> bool:
+    """워크플로우별 캐시 사용 여부"""
+    if not LLM_CACHE_ENABLED or not LLM_CACHE_PATH or not workflow:
+        return False
+    return "*" in LLM_CACHE_WORKFLOWS or workflow in LLM_CACHE_WORKFLOWS
+
+
+class LLMResponseCache:
+    """
+    SQLite LLM 응답 캐시 - response_key() -> 응답
+    - 스레드마다 연결을 따로 열고 WAL 모드로 여러 프로세스가 같은 파일을 공유
+    - 저장 후 응답 총 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 응답부터 삭제 (LRU)
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024)):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(LLM_CACHE_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시된 응답 (없으면 None), 조회 시각 갱신"""
+        conn = self._conn()
+        row = conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, response: dict, workflow: str = "", model: str = "") -> int:
+        """
+        응답 저장 후 크기 상한을 넘은 만큼 LRU 삭제
+
+        Returns:
+            삭제한 응답 수
+        """
+        text = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, workflow, model, text, len(text.encode("utf-8")), now, now)
+        )
+        return conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM ("
+            "SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running FROM responses"
+            ") WHERE running > ?)",
+            (self.max_bytes,)
+        ).rowcount
+
+    def total_bytes(self) -> int:
+        return self._conn().execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        """모든 응답 삭제"""
+        self._conn().execute("DELETE FROM responses")
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """공유 LLM 응답 캐시 (LLM_CACHE_ENABLED가 아니면 None)"""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED or not LLM_CACHE_PATH:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMResponseCache(LLM_CACHE_PATH)
+        return _llm_cache
+
+
+def get_llm_cache_stats() -> dict:
+    """LLM 응답 캐시 적중 통계"""
+    total = _llm_cache_stats["hits"] + _llm_cache_stats["misses"]
+    return {
+        **_llm_cache_stats,
+        "total": total,
+        "hit_ratio": _llm_cache_stats["hits"] / total if total else 0.0,
+    }
+
+
+def cached_response(workflow: Optional[str], key: str) -> Optional[dict]:
+    """캐시에서 찾은 응답 (워크플로우가 꺼져 있거나 없으면 None)"""
+    if not cache_enabled_for(workflow):
+        return None
+    try:
+        response = get_llm_cache().get(key)
+    except sqlite3.Error as e:
+        print(f"⚠️ LLM 응답 캐시 조회 실패: {e}")
+        return None
+    _llm_cache_stats["hits" if response is not None else "misses"] += 1
+    return response
+
+
+def store_response(workflow: Optional[str], key: str, response: dict, model: str = ""):
+    if not cache_enabled_for(workflow):
+        return
+    try:
+        evicted = get_llm_cache().put(key, response, workflow, model)
+    except sqlite3.Error as e:
+        print(f"⚠️ LLM 응답 캐시 저장 실패: {e}")
+        return
+    _llm_cache_stats["stores"] += 1
+    _llm_cache_stats["evicted"] += evicted
+
+
+def _encode_result(result: Any) -> Optional[dict]:
+    """LLM.call 결과 -> 저장 형식 (텍스트 / 도구 호출 목록만 저장)"""
+    if isinstance(result, str):
+        return {"type": "text", "value": result}
+    if isinstance(result, list) and result and all(isinstance(r, ChatCompletionMessageFunctionToolCall) for r in result):
+        return {"type": "tool_calls", "value": [r.model_dump() for r in result]}
+    return None
+
+
+def _decode_result(response: dict) -> Any:
+    if response["type"] == "tool_calls":
+        return [ChatCompletionMessageFunctionToolCall.model_validate(r) for r in response["value"]]
+    return response["value"]
+
+
+class CachingOpenAICompletion(OpenAICompletion):
+    """
+    응답 캐시를 거치는 CrewAI OpenAI LLM (config.get_llm에서 생성)
+
+    현재 워크플로우(크루가 실행마다 set_cache_workflow로 지정, 인스턴스의 cache_workflow가 있으면 우선)가
+    LLM_CACHE_WORKFLOWS에 있을 때만 캐시를 사용함. 에이전트들이 LLM 하나를 공유하므로
+    워크플로우는 인스턴스 대신 실행 컨텍스트에 둠. 도구를 LLM 안에서 바로 실행하는 호출
+    (available_functions)이나 구조화 출력(response_model)은 캐시하지 않음.
+    """
+
+    cache_workflow: Optional[str] = None
+
+    def _get_sync_client(self):
+        """공유 클라이언트 사용 (연결 풀 재생성, cassette 전송 계층 교체가 이미 만든 LLM에도 적용)"""
+        from llm_client import get_openai_client
+
+        try:
+            return get_openai_client()
+        except OpenAIError:
+            return super()._get_sync_client()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        workflow = self.cache_workflow or _current_workflow.get()
+        if available_functions or response_model or self.stream or not cache_enabled_for(workflow):
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+
+        key = response_key(self.model, self.temperature, self._format_messages(messages), {"tools": tools})
+        response = cached_response(workflow, key)
+        if response is not None:
+            return _decode_result(response)
+
+        result = super().call(messages, tools, callbacks, available_functions, from_task, from_agent, response_model)
+        encoded = _encode_result(result)
+        if encoded is not None:
+            store_response(workflow, key, encoded, self.model)
+        return result
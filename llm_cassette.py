@@ -0,0 +1,225 @@
+"""
+LLM 요청 녹화 / 재생 (cassette) - OpenAI 키·네트워크 없이 크루 실행을 재현
+
+공유 OpenAI 클라이언트(llm_client.py)의 HTTP 전송 계층에서 요청/응답을 기록하므로
+에이전트 LLM 호출(get_llm), '사용자 의도 분석', 'AI 레시피 생성', 메뉴 일괄 판정이 모두 포함됨.
+재생 모드에서는 기록된 응답을 그대로 돌려주고, 필요하면 고정 지연 또는 녹화 당시 지연을 넣음.
+
+사용:
+    with use_cassette("bench/cassettes/recipe.json", mode="record"):
+        FoodRecommendationCrew().run("된장찌개 만드는 법 알려줘")
+
+    with use_cassette("bench/cassettes/recipe.json", mode="replay", latency="recorded"):
+        FoodRecommendationCrew().run("된장찌개 만드는 법 알려줘")
+
+환경 변수 (config.py, 프로세스 전체에 적용):
+    LLM_CASSETTE_MODE      record / replay (비어 있으면 사용 안 함)
+    LLM_CASSETTE_PATH      cassette 파일 경로
+    LLM_CASSETTE_LATENCY   재생 지연 (초 또는 "recorded")
+"""
+import atexit
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+import httpx
+
+from config import LLM_CASSETTE_LATENCY, LLM_CASSETTE_MODE, LLM_CASSETTE_PATH
+
+CASSETTE_VERSION = 1
+# 재생 모드에서 OPENAI_API_KEY가 없을 때 사용하는 값 (llm_client._api_key, 요청은 네트워크로 나가지 않음)
+REPLAY_API_KEY = "sk-cassette-replay"
+
+
+class CassetteMiss(httpx.TransportError):
+    """재생할 응답이 cassette에 없음"""
+
+
+def request_key(body: dict) -> str:
+    """요청 body 전체 해시 (완전 일치 재생용)"""
+    payload = json.dumps(body, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def route_key(body: dict) -> str:
+    """
+    요청 종류 해시 (모델 + 첫 메시지) - 완전 일치가 없을 때 같은 종류의 다음 응답으로 재생
+    에이전트 태스크 설명에 들어간 사용자 데이터가 바뀌어도 같은 단계의 응답을 찾기 위함
+    """
+    messages = body.get("messages") or [{}]
+    payload = json.dumps([body.get("model"), messages[0].get("content")], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    LLM 요청/응답 기록 파일
+
+    재생 순서: 같은 요청(request_key)의 기록을 녹화 순서대로 -> 없으면 같은 종류(route_key)의
+    남은 기록 -> strict가 아니면 남은 기록 중 가장 앞의 것
+    """
+
+    def __init__(self, path: Union[str, Path], strict: bool = False):
+        self.path = Path(path)
+        self.strict = strict
+        self.interactions = []
+        self.stats = {"recorded": 0, "exact": 0, "route": 0, "fallback": 0, "missing": 0}
+        self._lock = threading.Lock()
+        self._by_key = defaultdict(deque)
+        self._by_route = defaultdict(deque)
+        self._played = set()
+
+    def load(self) -> "Cassette":
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.interactions = data.get("interactions", [])
+        for i, interaction in enumerate(self.interactions):
+            self._by_key[interaction["key"]].append(i)
+            self._by_route[interaction["route"]].append(i)
+        return self
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    def record(self, path: str, body: dict, status: int, response, elapsed: float):
+        with self._lock:
+            self.interactions.append({
+                "key": request_key(body),
+                "route": route_key(body),
+                "path": path,
+                "request": body,
+                "status": status,
+                "response": response,
+                "elapsed": round(elapsed, 4),
+            })
+            self.stats["recorded"] += 1
+
+    def _next(self, queue: deque) -> Optional[int]:
+        while queue:
+            i = queue.popleft()
+            if i not in self._played:
+                return i
+        return None
+
+    def play(self, body: dict) -> dict:
+        """body에 맞는 기록 반환 (재생한 기록은 다시 쓰지 않음)"""
+        with self._lock:
+            for kind, queue in (("exact", self._by_key[request_key(body)]), ("route", self._by_route[route_key(body)])):
+                i = self._next(queue)
+                if i is not None:
+                    break
+            else:
+                kind = "fallback"
+                i = None if self.strict else next((k for k in range(len(self.interactions)) if k not in self._played), None)
+            if i is None:
+                self.stats["missing"] += 1
+                raise CassetteMiss(f"cassette에 재생할 응답이 없습니다: {self.path}")
+            self._played.add(i)
+            self.stats[kind] += 1
+            return self.interactions[i]
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """
+    녹화: 실제 전송 계층으로 보내고 요청/응답을 cassette에 기록
+    재생: 네트워크 없이 cassette의 응답 반환 (latency: 초 또는 "recorded")
+    """
+
+    def __init__(self, cassette: Cassette, mode: str, inner: Optional[httpx.BaseTransport] = None,
+                 latency: Union[float, str, None] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"cassette 모드는 record / replay 중 하나여야 합니다: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.inner = inner
+        self.latency = latency
+
+    def _delay(self, interaction: dict) -> float:
+        if self.latency == "recorded":
+            return interaction.get("elapsed", 0.0)
+        return float(self.latency or 0.0)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.read() or b"{}")
+        if self.mode == "replay":
+            interaction = self.cassette.play(body)
+            delay = self._delay(interaction)
+            if delay > 0:
+                time.sleep(delay)
+            return httpx.Response(interaction["status"], json=interaction["response"], request=request)
+
+        start = time.perf_counter()
+        response = self.inner.handle_request(request)
+        content = response.read()
+        elapsed = time.perf_counter() - start
+        try:
+            payload = json.loads(content)
+        except ValueError:
+            payload = content.decode("utf-8", "replace")
+        self.cassette.record(request.url.path, body, response.status_code, payload, elapsed)
+        # read()로 압축이 풀린 본문을 그대로 전달
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length")]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+
+def _parse_latency(value: Union[float, str, None]) -> Union[float, str, None]:
+    if value in (None, ""):
+        return None
+    if value == "recorded":
+        return value
+    return float(value)
+
+
+@contextmanager
+def use_cassette(path: Union[str, Path], mode: str = "replay", latency: Union[float, str, None] = None,
+                 strict: bool = False):
+    """
+    블록 안의 모든 공유 클라이언트 LLM 호출을 녹화 / 재생
+
+    Yields:
+        Cassette (stats로 재생 / 녹화 횟수 확인)
+    """
+    from llm_client import http_limits, set_http_transport
+
+    cassette = Cassette(path, strict=strict)
+    if mode == "replay":
+        cassette.load()
+    inner = httpx.HTTPTransport(limits=http_limits()) if mode == "record" else None
+    set_http_transport(CassetteTransport(cassette, mode, inner, _parse_latency(latency)))
+    try:
+        yield cassette
+    finally:
+        set_http_transport(None)
+        if mode == "record":
+            cassette.save()
+            print(f"📼 LLM 요청 {cassette.stats['recorded']}개 녹화: {cassette.path}")
+
+
+def transport_from_env() -> Optional[CassetteTransport]:
+    """LLM_CASSETTE_MODE가 설정돼 있으면 프로세스 전체용 cassette 전송 계층 생성"""
+    if not LLM_CASSETTE_MODE:
+        return None
+    from llm_client import http_limits
+
+    cassette = Cassette(LLM_CASSETTE_PATH)
+    if LLM_CASSETTE_MODE == "replay":
+        cassette.load()
+        inner = None
+    else:
+        inner = httpx.HTTPTransport(limits=http_limits())
+        atexit.register(cassette.save)
+    print(f"📼 LLM cassette {LLM_CASSETTE_MODE} 모드: {cassette.path}")
+    return CassetteTransport(cassette, LLM_CASSETTE_MODE, inner, _parse_latency(LLM_CASSETTE_LATENCY))
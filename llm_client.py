@@ -0,0 +1,169 @@
+"""
+공유 OpenAI 클라이언트 - 도구와 에이전트 LLM이 HTTP 연결 풀(keep-alive)을 함께 사용
+
+기존에는 레시피 생성 / 의도 분석 / 메뉴 일괄 판정이 호출마다 OpenAI()를 새로 만들어
+매번 TCP·TLS 연결과 클라이언트 초기화 비용을 냈음. 프로세스당 클라이언트를 한 번만 만들고
+동시 호출 수는 세마포어로 제한함.
+
+설정 (환경 변수, config.py):
+    OPENAI_TIMEOUT / OPENAI_CONNECT_TIMEOUT   요청 / 연결 타임아웃 (초)
+    OPENAI_MAX_RETRIES                        재시도 횟수
+    OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE   연결 풀 크기
+    OPENAI_MAX_CONCURRENCY                    chat_completion 동시 호출 상한
+"""
+import atexit
+import os
+import threading
+from typing import Optional
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI, OpenAIError
+from openai.types.chat import ChatCompletion
+
+from config import (
+    OPENAI_CONNECT_TIMEOUT,
+    OPENAI_MAX_CONCURRENCY,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE,
+    OPENAI_MAX_RETRIES,
+    OPENAI_TIMEOUT
+)
+from llm_cache import cache_enabled_for, cached_response, response_key, store_response
+from llm_cassette import REPLAY_API_KEY, transport_from_env
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()  # 클라이언트 교체 / 통계 갱신
+# 동기 클라이언트의 HTTP 전송 계층 교체 (llm_cassette.py 녹화 / 재생)
+_transport = None
+_transport_from_env_checked = False
+_semaphore = threading.BoundedSemaphore(max(1, OPENAI_MAX_CONCURRENCY))
+
+_client_stats = {"clients_created": 0, "calls": 0}
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+
+
+def http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE
+    )
+
+
+def _api_key() -> str:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key and getattr(_transport, "mode", None) == "replay":
+        return REPLAY_API_KEY
+    if not api_key:
+        raise OpenAIError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+    return api_key
+
+
+def get_openai_client() -> OpenAI:
+    """
+    공유 동기 OpenAI 클라이언트 반환 (API 키가 바뀌면 새로 생성)
+
+    Raises:
+        OpenAIError: OPENAI_API_KEY가 없을 때
+    """
+    global _client, _client_key, _transport, _transport_from_env_checked
+    with _client_lock:
+        if not _transport_from_env_checked:
+            _transport_from_env_checked = True
+            _transport = _transport or transport_from_env()
+        api_key = _api_key()
+        if _client is None or _client_key != api_key:
+            if _client is not None:
+                _client.close()
+            http_client = (
+                DefaultHttpxClient(transport=_transport, timeout=_timeout()) if _transport is not None
+                else DefaultHttpxClient(limits=http_limits(), timeout=_timeout())
+            )
+            _client = OpenAI(
+                api_key=api_key,
+                timeout=_timeout(),
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=http_client
+            )
+            _client_key = api_key
+            _client_stats["clients_created"] += 1
+    return _client
+
+
+def chat_completion(cache_workflow: Optional[str] = None, **kwargs) -> ChatCompletion:
+    """
+    공유 클라이언트로 chat.completions.create 호출 (동시 호출 수 제한)
+
+    Args:
+        cache_workflow: 응답 캐시 단위 (llm_cache.py, LLM_CACHE_WORKFLOWS에 있을 때만 캐시)
+    """
+    key = None
+    if cache_enabled_for(cache_workflow):
+        key = response_key(kwargs.get("model"), kwargs.get("temperature"), kwargs.get("messages"), {
+            name: value for name, value in kwargs.items() if name not in ("model", "temperature", "messages")
+        })
+        response = cached_response(cache_workflow, key)
+        if response is not None:
+            return ChatCompletion.model_validate(response["value"])
+
+    client = get_openai_client()
+    with _semaphore:
+        with _client_lock:
+            _client_stats["calls"] += 1  # 세마포어는 여러 스레드가 함께 통과하므로 락으로 갱신
+        completion = client.chat.completions.create(**kwargs)
+    if key is not None:
+        store_response(cache_workflow, key, {"type": "completion", "value": completion.model_dump()}, kwargs.get("model", ""))
+    return completion
+
+
+def set_http_transport(transport: Optional[httpx.BaseTransport]):
+    """
+    공유 동기 클라이언트의 HTTP 전송 계층 교체 (None이면 기본 연결 풀)
+    기존 클라이언트는 닫고, 다음 호출부터 새 전송 계층으로 클라이언트를 다시 만듦
+    """
+    global _client, _client_key, _transport, _transport_from_env_checked
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _client_key = None
+        _transport = transport
+        _transport_from_env_checked = True
+
+
+def attach_shared_client(llm):
+    """
+    CrewAI LLM(OpenAI 네이티브 provider)이 공유 동기 클라이언트를 쓰도록 연결
+
+    CrewAI는 LLM마다 OpenAI 클라이언트를 따로 만들기 때문에, 에이전트 호출도 같은 연결 풀을
+    재사용하도록 교체함. API 키가 없거나 다른 provider면 그대로 둠.
+    """
+    if not hasattr(llm, "_client"):
+        return llm
+    try:
+        llm._client = get_openai_client()
+    except OpenAIError:
+        pass
+    return llm
+
+
+def get_client_stats() -> dict:
+    """클라이언트 생성 / 호출 통계"""
+    with _client_lock:
+        return dict(_client_stats)
+
+
+def close_openai_clients():
+    """공유 동기 클라이언트 연결 종료 (다음 호출 시 다시 생성)"""
+    global _client, _client_key
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _client_key = None
+
+
+atexit.register(close_openai_clients)
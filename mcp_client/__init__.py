@@ -1,7 +1,6 @@
 """
 MCP 클라이언트 모듈
 """
-from .notion_mcp_client import NotionMCPClient, get_mcp_client
-
-__all__ = ["NotionMCPClient", "get_mcp_client"]
+from .notion_mcp_client import NotionMCPClient, NotionMCPSessionPool, get_mcp_client, get_mcp_pool
 
+__all__ = ["NotionMCPClient", "NotionMCPSessionPool", "get_mcp_client", "get_mcp_pool"]
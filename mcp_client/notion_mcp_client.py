@@ -1,10 +1,17 @@
 """
 Notion MCP 클라이언트
 MCP 서버와 stdio 통신하여 Notion 데이터 가져오기
+
+- NotionMCPClient: 호출마다 서버 프로세스를 띄우는 1회성 연결 (테스트/디버깅용)
+- NotionMCPSessionPool: 초기화된 세션을 재사용하는 장기 실행 풀 (CrewAI 도구용)
 """
 import asyncio
+import atexit
 import json
 import os
+import sys
+import threading
+import time
 from typing import Optional, Any
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -14,81 +21,430 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# 세션 풀 설정
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))  # 사용자별 최대 세션 수
+MCP_POOL_IDLE_TIMEOUT = float(os.getenv("MCP_POOL_IDLE_TIMEOUT", "300"))  # 초, 유휴 세션 정리 기준
+MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30"))  # 초, 이 시간 이상 쉬면 ping
+MCP_CALL_TIMEOUT = float(os.getenv("MCP_CALL_TIMEOUT", "60"))  # 초, 도구 호출 최대 대기 시간
+
+
+def _resolve_server_script() -> str:
+    """USE_NOTION_MCP 설정에 따라 서버 스크립트 선택 (NOTION_MCP_SERVER로 직접 지정 가능, 벤치마크용)"""
+    override = os.getenv("NOTION_MCP_SERVER")
+    if override:
+        return override
+    use_mcp = os.getenv("USE_NOTION_MCP", "false").lower() == "true"
+    return "notion_server_real.py" if use_mcp else "notion_server.py"
+
+
+def _build_server_params(project_root: Path, server_script: str) -> StdioServerParameters:
+    """MCP 서버 실행 파라미터 생성"""
+    # 🔥 중요: 부모 프로세스의 환경 변수를 MCP 서버로 전달
+    # 이를 통해 app.py에서 설정한 CURRENT_NOTION_USER가 MCP 서버로 전달됨
+    return StdioServerParameters(
+        command="python",
+        args=["-u", str(project_root / "mcp_servers" / server_script)],
+        env=os.environ.copy()  # ← 환경 변수 복사하여 전달!
+    )
+
+
+def _extract_tool_text(result) -> str:
+    """CallToolResult의 TextContent에서 텍스트 추출"""
+    if result.content:
+        return result.content[0].text
+    return ""
+
 
 class NotionMCPClient:
     """Notion MCP 서버와 통신하는 클라이언트"""
-    
+
     def __init__(self):
         self.session: Optional[ClientSession] = None
         self._read = None
         self._write = None
-        
+
         # 프로젝트 루트 경로 찾기
         self.project_root = Path(__file__).parent.parent
-        
+
         # USE_NOTION_MCP 설정에 따라 서버 선택
-        use_mcp = os.getenv("USE_NOTION_MCP", "false").lower() == "true"
-        if use_mcp:
-            self.server_script = "notion_server_real.py"
-        else:
-            self.server_script = "notion_server.py"
-    
+        self.server_script = _resolve_server_script()
+
     @asynccontextmanager
     async def connect(self):
         """MCP 서버에 연결"""
-        server_script = str(self.project_root / "mcp_servers" / self.server_script)
-        
-        # 🔥 중요: 부모 프로세스의 환경 변수를 MCP 서버로 전달
-        # 이를 통해 app.py에서 설정한 CURRENT_NOTION_USER가 MCP 서버로 전달됨
-        server_params = StdioServerParameters(
-            command="python",
-            args=["-u", server_script],
-            env=os.environ.copy()  # ← 환경 변수 복사하여 전달!
-        )
-        
+        server_params = _build_server_params(self.project_root, self.server_script)
+
         async with stdio_client(server_params) as (read, write):
             async with ClientSession(read, write) as session:
                 await session.initialize()
                 self.session = session
                 yield self
-    
+
     async def call_tool(self, tool_name: str, arguments: dict = None) -> str:
         """MCP 도구 호출"""
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
-        
+
         if arguments is None:
             arguments = {}
-        
+
         result = await self.session.call_tool(tool_name, arguments)
-        
+
         # TextContent에서 텍스트 추출
-        if result.content:
-            return result.content[0].text
-        return ""
-    
+        return _extract_tool_text(result)
+
     async def read_resource(self, uri: str) -> str:
         """리소스 읽기"""
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
-        
+
         result = await self.session.read_resource(uri)
-        
+
         if result.contents:
             return result.contents[0].text
         return ""
-    
+
     async def list_tools(self) -> list:
         """사용 가능한 도구 목록 조회"""
         if not self.session:
             raise RuntimeError("Not connected to MCP server")
-        
+
         result = await self.session.list_tools()
         return result.tools
 
 
+class _PooledSession:
+    """풀에서 관리하는 단일 MCP 세션 (서버 프로세스 1개)
+
+    stdio_client/ClientSession 컨텍스트는 같은 태스크 안에서 열고 닫아야 하므로
+    전용 태스크에서 세션을 유지하고, 종료 신호를 받을 때까지 대기합니다.
+    """
+
+    def __init__(self, key: tuple, server_params: StdioServerParameters):
+        self.key = key
+        self.server_params = server_params
+        self.session: Optional[ClientSession] = None
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self):
+        """서버 프로세스를 띄우고 session.initialize()까지 완료"""
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self):
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except BaseException as e:  # 서버 크래시 포함
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self) -> bool:
+        """헬스 체크"""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=5)
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        """세션 종료 (서버 프로세스 정리)"""
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except Exception:
+                self._task.cancel()
+
+
+class NotionMCPSessionPool:
+    """초기화된 MCP 세션을 재사용하는 프로세스 전역 풀
+
+    - 키: (서버 스크립트, CURRENT_NOTION_USER) → 사용자가 바뀌면 별도 세션 사용
+    - 헬스 체크: MCP_HEALTH_CHECK_INTERVAL 이상 유휴였던 세션은 ping 후 재사용
+    - 크래시 복구: 호출 실패 시 세션을 폐기하고 새 세션으로 1회 재시도
+    - 유휴 정리: MCP_POOL_IDLE_TIMEOUT 이상 사용되지 않은 세션 종료
+
+    세션은 전용 이벤트 루프 스레드에서 유지되므로 어떤 스레드/루프에서든
+    동기 메서드(call_tool, read_resource)로 호출할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        max_sessions_per_key: int = MCP_POOL_SIZE,
+        idle_timeout: float = MCP_POOL_IDLE_TIMEOUT,
+        health_check_interval: float = MCP_HEALTH_CHECK_INTERVAL,
+        call_timeout: float = MCP_CALL_TIMEOUT,
+    ):
+        self.project_root = Path(__file__).parent.parent
+        self.max_sessions_per_key = max(1, max_sessions_per_key)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.call_timeout = call_timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # 루프 스레드 안에서만 접근
+        self._idle: dict = {}        # key -> list[_PooledSession]
+        self._counts: dict = {}      # key -> 현재 열린 세션 수
+        self._conditions: dict = {}  # key -> asyncio.Condition
+        self._reaper: Optional[asyncio.Task] = None
+        self._background: set = set()  # 락 밖에서 진행 중인 세션 종료 / 폐기 태스크
+
+        self.stats = {
+            "calls": 0,
+            "spawns": 0,
+            "reuses": 0,
+            "restarts": 0,
+            "reaped": 0,
+            "failed_health_checks": 0,
+        }
+
+    # ------------------------------------------------------------
+    # 이벤트 루프 스레드
+    # ------------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run_loop():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_run_loop, name="mcp-session-pool", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+                asyncio.run_coroutine_threadsafe(self._start_reaper(), loop).result()
+        return self._loop
+
+    def _submit(self, coro):
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=self.call_timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def _start_reaper(self):
+        if self.idle_timeout > 0:
+            self._reaper = asyncio.create_task(self._reap_idle_sessions())
+
+    # ------------------------------------------------------------
+    # 세션 획득/반환
+    # ------------------------------------------------------------
+    def _current_key(self) -> tuple:
+        return (_resolve_server_script(), os.getenv("CURRENT_NOTION_USER", "소윤"))
+
+    async def _acquire(self, key: tuple) -> _PooledSession:
+        condition = self._conditions.setdefault(key, asyncio.Condition())
+        async with condition:
+            while True:
+                idle = self._idle.setdefault(key, [])
+                while idle:
+                    pooled = idle.pop()
+                    if await self._is_healthy(pooled):
+                        self.stats["reuses"] += 1
+                        return pooled
+                    self.stats["failed_health_checks"] += 1
+                    self._forget(pooled)
+                    self._run_in_background(pooled.close())
+
+                if self._counts.get(key, 0) < self.max_sessions_per_key:
+                    self._counts[key] = self._counts.get(key, 0) + 1
+                    break
+
+                await condition.wait()
+
+        # 프로세스 기동은 락 밖에서 (다른 키/세션 반환을 막지 않도록)
+        try:
+            return await self._spawn(key)
+        except BaseException:
+            async with condition:
+                self._counts[key] -= 1
+                condition.notify()
+            raise
+
+    async def _spawn(self, key: tuple) -> _PooledSession:
+        server_script, _ = key
+        pooled = _PooledSession(key, _build_server_params(self.project_root, server_script))
+        await pooled.start()
+        self.stats["spawns"] += 1
+        print(f"[MCP Pool] 🚀 세션 생성: {server_script} (user={key[1]})", file=sys.stderr)
+        return pooled
+
+    async def _is_healthy(self, pooled: _PooledSession) -> bool:
+        if not pooled.alive:
+            return False
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        return await pooled.ping()
+
+    async def _release(self, pooled: _PooledSession):
+        condition = self._conditions[pooled.key]
+        async with condition:
+            pooled.last_used = time.monotonic()
+            self._idle.setdefault(pooled.key, []).append(pooled)
+            condition.notify()
+
+    def _forget(self, pooled: _PooledSession):
+        """세션 수에서 제외하고 대기 중인 호출 1개를 깨움 (호출자가 condition 락을 잡고 있어야 함)"""
+        self._counts[pooled.key] = max(0, self._counts.get(pooled.key, 1) - 1)
+        self._conditions[pooled.key].notify()
+
+    def _run_in_background(self, coro):
+        """취소되지 않도록 별도 태스크로 실행 (완료될 때까지 참조 유지)"""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _discard(self, pooled: _PooledSession):
+        """세션 폐기 - 세션 수를 줄인 뒤 프로세스 종료(최대 5초)는 락 밖에서"""
+        async with self._conditions[pooled.key]:
+            self._forget(pooled)
+        await pooled.close()
+
+    async def _reap_idle_sessions(self):
+        """유휴 세션 주기적 정리"""
+        interval = max(1.0, min(self.idle_timeout / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for key, condition in list(self._conditions.items()):
+                async with condition:
+                    idle = self._idle.get(key, [])
+                    keep = []
+                    for pooled in idle:
+                        if now - pooled.last_used >= self.idle_timeout or not pooled.alive:
+                            self.stats["reaped"] += 1
+                            self._forget(pooled)
+                            self._run_in_background(pooled.close())
+                        else:
+                            keep.append(pooled)
+                    self._idle[key] = keep
+
+    # ------------------------------------------------------------
+    # 호출
+    # ------------------------------------------------------------
+    async def _with_session(self, key: tuple, operation):
+        """
+        세션을 빌려 operation(session) 실행, 실패 시 새 세션으로 1회 재시도
+
+        호출 제한 시간 초과로 취소되면(CancelledError) 응답 상태를 알 수 없는 세션을 폐기해
+        세션 수를 돌려놓음 (취소된 태스크 대신 별도 태스크에서 정리)
+        """
+        for attempt in range(2):
+            pooled = await self._acquire(key)
+            try:
+                result = await operation(pooled.session)
+            except Exception:
+                await self._discard(pooled)
+                if attempt == 0:
+                    self.stats["restarts"] += 1
+                    print("[MCP Pool] ♻️ 세션 오류 - 새 세션으로 재시도", file=sys.stderr)
+                    continue
+                raise
+            except BaseException:
+                self._run_in_background(self._discard(pooled))
+                raise
+            await self._release(pooled)
+            return result
+
+    async def call_tool_async(self, tool_name: str, arguments: dict = None, key: tuple = None) -> str:
+        """MCP 도구 호출 (풀 이벤트 루프 안에서 실행)"""
+        if arguments is None:
+            arguments = {}
+        self.stats["calls"] += 1
+
+        async def _call(session):
+            return _extract_tool_text(await session.call_tool(tool_name, arguments))
+
+        return await self._with_session(key or self._current_key(), _call)
+
+    async def read_resource_async(self, uri: str, key: tuple = None) -> str:
+        """리소스 읽기 (풀 이벤트 루프 안에서 실행)"""
+        self.stats["calls"] += 1
+
+        async def _read(session):
+            result = await session.read_resource(uri)
+            return result.contents[0].text if result.contents else ""
+
+        return await self._with_session(key or self._current_key(), _read)
+
+    def call_tool(self, tool_name: str, arguments: dict = None) -> str:
+        """MCP 도구 호출 (동기)"""
+        # 키는 호출 스레드의 환경 변수 기준으로 결정
+        return self._submit(self.call_tool_async(tool_name, arguments, self._current_key()))
+
+    def read_resource(self, uri: str) -> str:
+        """리소스 읽기 (동기)"""
+        return self._submit(self.read_resource_async(uri, self._current_key()))
+
+    def get_stats(self) -> dict:
+        """풀 사용 통계"""
+        stats = dict(self.stats)
+        stats["open_sessions"] = sum(self._counts.values())
+        return stats
+
+    # ------------------------------------------------------------
+    # 종료
+    # ------------------------------------------------------------
+    async def _close_all(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+        closing = []
+        for key, condition in list(self._conditions.items()):
+            async with condition:
+                for pooled in self._idle.get(key, []):
+                    self._forget(pooled)
+                    closing.append(pooled)
+                self._idle[key] = []
+        await asyncio.gather(*(pooled.close() for pooled in closing), *self._background, return_exceptions=True)
+
+    def close(self):
+        """모든 세션과 이벤트 루프 종료"""
+        with self._start_lock:
+            loop = self._loop
+            self._loop = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
 # 싱글톤 인스턴스 (모듈 레벨)
 _client_instance = None
+_pool_instance = None
+_pool_lock = threading.Lock()
 
 
 def get_mcp_client() -> NotionMCPClient:
@@ -98,3 +454,12 @@ def get_mcp_client() -> NotionMCPClient:
         _client_instance = NotionMCPClient()
     return _client_instance
 
+
+def get_mcp_pool() -> NotionMCPSessionPool:
+    """MCP 세션 풀 싱글톤 인스턴스 반환"""
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = NotionMCPSessionPool()
+            atexit.register(_pool_instance.close)
+    return _pool_instance
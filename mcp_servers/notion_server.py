@@ -43,6 +43,53 @@ def load_notion_data():
             return json.load(f)
 
 
+def build_meal_history(data, days=7):
+    """식단 기록 요약"""
+    history = data["meal_history"][:days]
+    return {
+        "recent_meals": history,
+        "average_calories": sum(m["calories"] for m in history) / len(history) if history else 0,
+        "total_cost": sum(m["cost"] for m in history)
+    }
+
+
+def build_budget_status(data):
+    """예산 현황 (남은 예산, 상태 포함)"""
+    budget = data["budget"]
+    remaining = budget["daily_limit"] - budget["today_spent"]
+    return {
+        **budget,
+        "remaining": remaining,
+        "status": "초과" if remaining < 0 else "여유있음" if remaining > 5000 else "빠듯함"
+    }
+
+
+# get_user_context에서 선택 가능한 섹션
+USER_CONTEXT_FIELDS = ["preferences", "schedule", "budget", "meal_history"]
+
+
+def build_user_context(data, fields=None, days=7, meal_history=build_meal_history):
+    """
+    선호도·일정·예산·식단 기록을 하나의 응답으로 구성
+
+    Mock 모드 도구(tools/notion_tools.py)와 실시간 서버(notion_server_real.py)도 이 함수를 사용
+    (실시간 서버는 날짜 기준 식단 기록 요약을 meal_history로 전달)
+    """
+    selected = [f for f in (fields or USER_CONTEXT_FIELDS) if f in USER_CONTEXT_FIELDS]
+    context = {"user": os.getenv("CURRENT_NOTION_USER", "소윤")}
+    
+    if "preferences" in selected:
+        context["preferences"] = data["preferences"]
+    if "schedule" in selected:
+        context["schedule"] = data["schedule"]
+    if "budget" in selected:
+        context["budget"] = build_budget_status(data)
+    if "meal_history" in selected:
+        context["meal_history"] = meal_history(data, days)
+    
+    return context
+
+
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     """사용 가능한 리소스 목록"""
@@ -152,6 +199,25 @@ async def list_tools() -> list[Tool]:
                 "properties": {}
             }
         ),
+        Tool(
+            name="get_user_context",
+            description="선호도·일정·예산·식단 기록을 한 번에 조회 (필요한 섹션만 선택 가능)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": USER_CONTEXT_FIELDS},
+                        "description": "조회할 섹션 목록 (생략 시 전체)"
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "식단 기록 조회 일수 (기본: 7일)",
+                        "default": 7
+                    }
+                }
+            }
+        ),
     ]
 
 
@@ -161,13 +227,7 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     data = load_notion_data()
     
     if name == "get_meal_history":
-        days = arguments.get("days", 7)
-        history = data["meal_history"][:days]
-        result = {
-            "recent_meals": history,
-            "average_calories": sum(m["calories"] for m in history) / len(history) if history else 0,
-            "total_cost": sum(m["cost"] for m in history)
-        }
+        result = build_meal_history(data, arguments.get("days", 7))
         return [TextContent(
             type="text",
             text=json.dumps(result, ensure_ascii=False, indent=2)
@@ -203,13 +263,18 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
         )]
     
     elif name == "get_budget_status":
-        budget = data["budget"]
-        remaining = budget["daily_limit"] - budget["today_spent"]
-        result = {
-            **budget,
-            "remaining": remaining,
-            "status": "초과" if remaining < 0 else "여유있음" if remaining > 5000 else "빠듯함"
-        }
+        result = build_budget_status(data)
+        return [TextContent(
+            type="text",
+            text=json.dumps(result, ensure_ascii=False, indent=2)
+        )]
+    
+    elif name == "get_user_context":
+        result = build_user_context(
+            data,
+            fields=arguments.get("fields"),
+            days=arguments.get("days", 7)
+        )
         return [TextContent(
             type="text",
             text=json.dumps(result, ensure_ascii=False, indent=2)
@@ -4,6 +4,8 @@
 import json
 import asyncio
 import os
+import sys
+import time
 from pathlib import Path
 from typing import Any, Sequence
 from mcp.server import Server
@@ -12,6 +14,12 @@ from mcp.types import Resource, Tool, TextContent
 from notion_client import AsyncClient
 from dotenv import load_dotenv
 
+# 프로젝트 루트를 Python path에 추가 (user_manager import)
+sys.path.append(str(Path(__file__).parent.parent))
+from user_manager import get_user_id
+from mcp_servers.notion_server import USER_CONTEXT_FIELDS, build_budget_status
+from mcp_servers.notion_server import build_user_context as _build_user_context
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -55,12 +63,55 @@ async def fetch_table_rows(table_block_id):
         return []
 
 
+# 테이블 동시 조회 개수 (Notion API rate limit 고려)
+NOTION_FETCH_CONCURRENCY = int(os.getenv("NOTION_FETCH_CONCURRENCY", "4"))
+
+
+def collect_section_tables(blocks):
+    """블록 순회로 (테이블 ID, 섹션 제목) 목록 수집
+
+    섹션 헤더 아래에 있지 않은 테이블은 파싱에 쓰이지 않으므로 제외합니다.
+    """
+    tables = []
+    current_section = None
+    
+    for block in blocks:
+        block_type = block.get('type')
+        if block_type in ('heading_2', 'heading_3'):
+            heading = block.get(block_type, {})
+            current_section = extract_text_from_rich_text(heading.get('rich_text', []))
+        elif block_type == 'table' and current_section:
+            tables.append((block.get('id'), current_section))
+    
+    return tables
+
+
+async def fetch_tables_concurrently(table_ids):
+    """여러 테이블의 행을 동시에 가져오기 (세마포어로 동시 요청 수 제한)
+
+    Returns:
+        {table_id: rows}
+    """
+    semaphore = asyncio.Semaphore(max(1, NOTION_FETCH_CONCURRENCY))
+    
+    async def _fetch(table_id):
+        async with semaphore:
+            return await fetch_table_rows(table_id)
+    
+    results = await asyncio.gather(*[_fetch(table_id) for table_id in table_ids])
+    return dict(zip(table_ids, results))
+
+
 async def parse_user_page(page_id):
     """사용자 페이지에서 데이터 파싱 - 완전 재작성"""
     # 페이지 블록들 가져오기
     response = await notion.blocks.children.list(block_id=page_id)
     blocks = response.get('results', [])
     
+    # 섹션 아래 테이블들을 먼저 수집해서 한 번에 동시 조회
+    section_tables = collect_section_tables(blocks)
+    table_rows = await fetch_tables_concurrently([table_id for table_id, _ in section_tables])
+    
     # 데이터 구조 (기본값 제거 - 모두 Notion에서 가져옴)
     user_data = {
         "meal_history": [],
@@ -125,7 +176,7 @@ async def parse_user_page(page_id):
         # 테이블 처리 - 완전 재작성
         elif block_type == 'table':
             table_id = block.get('id')
-            rows = await fetch_table_rows(table_id)
+            rows = table_rows.get(table_id, [])
             
             if rows and current_section:
                 import re
@@ -295,70 +346,244 @@ async def parse_user_page(page_id):
     return user_data
 
 
-async def query_notion_pages():
-    """Notion 페이지들에서 데이터 조회"""
-    if not notion or not NOTION_DATABASE_ID:
-        # Fallback to mock data
-        from pathlib import Path
-        data_path = Path(__file__).parent.parent / "data" / "mock_notion.json"
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+def _load_mock_data():
+    """Mock 데이터 로드 (Notion 연결 불가 시 fallback)"""
+    data_path = Path(__file__).parent.parent / "data" / "mock_notion.json"
+    with open(data_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================
+# 사용자 → Notion 페이지 ID 해석
+# ============================================================
+# 1순위: user_manager.USERS에 등록된 페이지 ID (pages.retrieve 1회)
+# 2순위: 메인 페이지 하위 child_page 제목 인덱스 (한 번 만들고, 못 찾으면 재구축)
+_title_index = {}          # 페이지 제목 -> page_id
+_title_index_built = False
+
+
+async def _build_title_index():
+    """메인 페이지의 child_page 블록으로 제목 인덱스 구축
+
+    child_page 블록에 제목이 들어있으므로 페이지별 retrieve 없이
+    목록 조회(페이지네이션 포함)만으로 인덱스를 만듭니다.
+    """
+    global _title_index_built
+    index = {}
+    cursor = None
     
-    try:
-        # 환경 변수에서 현재 사용자 가져오기
-        target_user = os.getenv("CURRENT_NOTION_USER", "소윤")
-        
-        # 디버깅: stderr로 현재 사용자 출력 (stdout은 JSON-RPC 전용)
-        import sys
-        print(f"[MCP Server] 🔍 Target User from ENV: {target_user}", file=sys.stderr)
-        
-        # 메인 페이지의 하위 페이지들 가져오기
-        children = await notion.blocks.children.list(block_id=NOTION_DATABASE_ID)
-        
-        user_page_id = None
+    while True:
+        kwargs = {"block_id": NOTION_DATABASE_ID}
+        if cursor:
+            kwargs["start_cursor"] = cursor
+        children = await notion.blocks.children.list(**kwargs)
         
         for block in children.get('results', []):
             if block.get('type') == 'child_page':
-                page_id = block.get('id')
-                page = await notion.pages.retrieve(page_id=page_id)
-                
-                # 페이지 제목 추출
-                title = ""
-                if 'properties' in page:
-                    for prop_name, prop_data in page['properties'].items():
-                        if prop_data.get('type') == 'title':
-                            if prop_data.get('title'):
-                                title = prop_data['title'][0]['plain_text']
-                                break
-                
-                # 사용자 이름 확인
-                if target_user in title:
-                    user_page_id = page_id
-                    import sys
-                    print(f"[MCP Server] ✅ Found {target_user}'s page: {page_id}", file=sys.stderr)
-                    break
+                title = block.get('child_page', {}).get('title', "")
+                if title:
+                    index[title] = block.get('id')
+        
+        if not children.get('has_more'):
+            break
+        cursor = children.get('next_cursor')
+    
+    _title_index.clear()
+    _title_index.update(index)
+    _title_index_built = True
+    print(f"[MCP Server] 📇 Title index built: {len(index)} pages", file=sys.stderr)
+
+
+def _lookup_title_index(target_user):
+    for title, page_id in _title_index.items():
+        if target_user in title:
+            return page_id
+    return None
+
+
+async def resolve_user_page(target_user):
+    """사용자 페이지 ID와 last_edited_time 조회
+
+    Returns:
+        (page_id, last_edited_time) 또는 (None, None)
+    """
+    # 1순위: 등록된 페이지 ID
+    known_id = get_user_id(target_user)
+    if known_id:
+        try:
+            page = await notion.pages.retrieve(page_id=known_id)
+            if not page.get('archived'):
+                return known_id, page.get('last_edited_time')
+        except Exception as e:
+            print(f"[MCP Server] ⚠️ Known page ID for {target_user} failed: {e}", file=sys.stderr)
+    
+    # 2순위: 제목 인덱스 (없으면 구축, 못 찾으면 재구축)
+    if not _title_index_built:
+        await _build_title_index()
+        page_id = _lookup_title_index(target_user)
+    else:
+        page_id = _lookup_title_index(target_user)
+        if not page_id:
+            await _build_title_index()
+            page_id = _lookup_title_index(target_user)
+    
+    if not page_id:
+        return None, None
+    
+    print(f"[MCP Server] ✅ Found {target_user}'s page: {page_id}", file=sys.stderr)
+    page = await notion.pages.retrieve(page_id=page_id)
+    return page_id, page.get('last_edited_time')
+
+
+# ============================================================
+# 사용자별 파싱 결과 캐시 (TTL + stale-while-revalidate)
+# ============================================================
+# NOTION_CACHE_TTL 이내: 캐시 그대로 반환
+# NOTION_CACHE_STALE_TTL 이내: 캐시를 반환하면서 백그라운드에서 갱신
+# 그 이상: 동기적으로 다시 가져옴
+NOTION_CACHE_TTL = float(os.getenv("NOTION_CACHE_TTL", "300"))
+NOTION_CACHE_STALE_TTL = float(os.getenv("NOTION_CACHE_STALE_TTL", "1800"))
+
+_user_cache = {}      # user -> {"data", "page_id", "last_edited_time", "fetched_at"}
+_user_locks = {}      # user -> asyncio.Lock (동시 갱신 방지)
+_refresh_tasks = {}   # user -> 진행 중인 백그라운드 갱신 태스크
+
+
+async def _refresh_user_data(target_user):
+    """Notion에서 사용자 데이터를 가져와 캐시 갱신
+
+    페이지 last_edited_time이 캐시와 같으면 테이블 재파싱을 건너뜁니다.
+    """
+    lock = _user_locks.setdefault(target_user, asyncio.Lock())
+    async with lock:
+        page_id, last_edited_time = await resolve_user_page(target_user)
+        if not page_id:
+            return None
+        
+        entry = _user_cache.get(target_user)
+        if (
+            entry
+            and entry["page_id"] == page_id
+            and last_edited_time
+            and entry["last_edited_time"] == last_edited_time
+        ):
+            entry["fetched_at"] = time.monotonic()
+            print(f"[MCP Server] ♻️ {target_user}'s page unchanged - cache revalidated", file=sys.stderr)
+            return entry["data"]
         
         # 사용자 페이지 파싱
-        if user_page_id:
-            user_data = await parse_user_page(user_page_id)
-            import sys
-            # 알레르기 정보 확인 로그
-            allergies = user_data.get('preferences', {}).get('allergies', [])
-            print(f"[MCP Server] 📊 Parsed {target_user}'s data - Allergies: {allergies}", file=sys.stderr)
-            return user_data
-        else:
-            # Fallback to mock data
-            from pathlib import Path
-            data_path = Path(__file__).parent.parent / "data" / "mock_notion.json"
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        user_data = await parse_user_page(page_id)
+        # 알레르기 정보 확인 로그
+        allergies = user_data.get('preferences', {}).get('allergies', [])
+        print(f"[MCP Server] 📊 Parsed {target_user}'s data - Allergies: {allergies}", file=sys.stderr)
         
-    except Exception as e:
+        _user_cache[target_user] = {
+            "data": user_data,
+            "page_id": page_id,
+            "last_edited_time": last_edited_time,
+            "fetched_at": time.monotonic(),
+        }
+        return user_data
+
+
+def _schedule_background_refresh(target_user):
+    """stale 캐시 반환 후 백그라운드에서 갱신 (사용자별 1개만)"""
+    task = _refresh_tasks.get(target_user)
+    if task and not task.done():
+        return
+    
+    async def _refresh():
+        try:
+            await _refresh_user_data(target_user)
+        except Exception as e:
+            print(f"[MCP Server] ⚠️ Background refresh failed for {target_user}: {e}", file=sys.stderr)
+    
+    _refresh_tasks[target_user] = asyncio.create_task(_refresh())
+
+
+def invalidate_user_cache(user=None):
+    """캐시 무효화 (user=None이면 전체)
+
+    Returns:
+        무효화된 사용자 목록
+    """
+    if user is None:
+        invalidated = list(_user_cache.keys())
+        _user_cache.clear()
+    else:
+        invalidated = [user] if _user_cache.pop(user, None) is not None else []
+    return invalidated
+
+
+async def query_notion_pages():
+    """Notion 페이지들에서 데이터 조회 (사용자별 캐시 사용)"""
+    if not notion or not NOTION_DATABASE_ID:
         # Fallback to mock data
-        from pathlib import Path
-        data_path = Path(__file__).parent.parent / "data" / "mock_notion.json"
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return _load_mock_data()
+    
+    # 환경 변수에서 현재 사용자 가져오기
+    target_user = os.getenv("CURRENT_NOTION_USER", "소윤")
+    
+    # 디버깅: stderr로 현재 사용자 출력 (stdout은 JSON-RPC 전용)
+    print(f"[MCP Server] 🔍 Target User from ENV: {target_user}", file=sys.stderr)
+    
+    entry = _user_cache.get(target_user)
+    if entry:
+        age = time.monotonic() - entry["fetched_at"]
+        if age < NOTION_CACHE_TTL:
+            return entry["data"]
+        if age < NOTION_CACHE_STALE_TTL:
+            _schedule_background_refresh(target_user)
+            return entry["data"]
+    
+    try:
+        user_data = await _refresh_user_data(target_user)
+        if user_data is not None:
+            return user_data
+    except Exception as e:
+        print(f"[MCP Server] ⚠️ Notion fetch failed: {e}", file=sys.stderr)
+        # 만료된 캐시라도 있으면 mock보다 우선
+        if entry:
+            return entry["data"]
+    
+    # Fallback to mock data
+    return _load_mock_data()
+
+
+def build_meal_history(data, days=7):
+    """식단 기록 요약 (날짜 기반 필터링)"""
+    # 날짜 기반으로 필터링 (7일 = 모든 끼니)
+    from datetime import datetime, timedelta
+    
+    if days > 0 and data["meal_history"]:
+        # 가장 최근 날짜 찾기
+        try:
+            latest_date_str = data["meal_history"][0]["date"]
+            latest_date = datetime.strptime(latest_date_str, "%Y-%m-%d")
+            cutoff_date = latest_date - timedelta(days=days-1)
+            
+            # 날짜 범위 내의 모든 식사 필터링
+            history = [
+                meal for meal in data["meal_history"]
+                if datetime.strptime(meal["date"], "%Y-%m-%d") >= cutoff_date
+            ]
+        except:
+            # 날짜 파싱 실패 시 기존 방식 사용
+            history = data["meal_history"][:days]
+    else:
+        history = data["meal_history"][:days]
+    
+    return {
+        "recent_meals": history,
+        "average_calories": sum(m["calories"] for m in history) / len(history) if history else 0,
+        "total_cost": sum(m["cost"] for m in history),
+        "days_covered": days
+    }
+
+
+def build_user_context(data, fields=None, days=7):
+    """선호도·일정·예산·식단 기록을 하나의 응답으로 구성 (식단 기록은 날짜 기준 요약)"""
+    return _build_user_context(data, fields, days, meal_history=build_meal_history)
 
 
 def load_notion_data():
@@ -475,44 +700,55 @@ async def list_tools() -> list[Tool]:
                 "properties": {}
             }
         ),
+        Tool(
+            name="get_user_context",
+            description="선호도·일정·예산·식단 기록을 한 번에 조회 (필요한 섹션만 선택 가능)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "fields": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": USER_CONTEXT_FIELDS},
+                        "description": "조회할 섹션 목록 (생략 시 전체)"
+                    },
+                    "days": {
+                        "type": "integer",
+                        "description": "식단 기록 조회 일수 (기본: 7일)",
+                        "default": 7
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="invalidate_cache",
+            description="Notion 데이터 캐시 무효화 (Notion 페이지 수정 직후 사용)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "user": {
+                        "type": "string",
+                        "description": "무효화할 사용자 이름 (생략 시 전체)"
+                    }
+                }
+            }
+        ),
     ]
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     """도구 실행"""
+    if name == "invalidate_cache":
+        invalidated = invalidate_user_cache(arguments.get("user") if arguments else None)
+        return [TextContent(
+            type="text",
+            text=json.dumps({"invalidated": invalidated}, ensure_ascii=False, indent=2)
+        )]
+    
     data = await query_notion_pages()
     
     if name == "get_meal_history":
-        days = arguments.get("days", 7)
-        
-        # 날짜 기반으로 필터링 (7일 = 모든 끼니)
-        from datetime import datetime, timedelta
-        
-        if days > 0 and data["meal_history"]:
-            # 가장 최근 날짜 찾기
-            try:
-                latest_date_str = data["meal_history"][0]["date"]
-                latest_date = datetime.strptime(latest_date_str, "%Y-%m-%d")
-                cutoff_date = latest_date - timedelta(days=days-1)
-                
-                # 날짜 범위 내의 모든 식사 필터링
-                history = [
-                    meal for meal in data["meal_history"]
-                    if datetime.strptime(meal["date"], "%Y-%m-%d") >= cutoff_date
-                ]
-            except:
-                # 날짜 파싱 실패 시 기존 방식 사용
-                history = data["meal_history"][:days]
-        else:
-            history = data["meal_history"][:days]
-        
-        result = {
-            "recent_meals": history,
-            "average_calories": sum(m["calories"] for m in history) / len(history) if history else 0,
-            "total_cost": sum(m["cost"] for m in history),
-            "days_covered": days
-        }
+        result = build_meal_history(data, arguments.get("days", 7))
         return [TextContent(
             type="text",
             text=json.dumps(result, ensure_ascii=False, indent=2)
@@ -548,13 +784,18 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
         )]
     
     elif name == "get_budget_status":
-        budget = data["budget"]
-        remaining = budget["daily_limit"] - budget["today_spent"]
-        result = {
-            **budget,
-            "remaining": remaining,
-            "status": "초과" if remaining < 0 else "여유있음" if remaining > 5000 else "빠듯함"
-        }
+        result = build_budget_status(data)
+        return [TextContent(
+            type="text",
+            text=json.dumps(result, ensure_ascii=False, indent=2)
+        )]
+    
+    elif name == "get_user_context":
+        result = build_user_context(
+            data,
+            fields=arguments.get("fields"),
+            days=arguments.get("days", 7)
+        )
         return [TextContent(
             type="text",
             text=json.dumps(result, ensure_ascii=False, indent=2)
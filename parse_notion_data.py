@@ -47,6 +47,38 @@ async def fetch_table_rows(notion, table_block_id):
         return []
 
 
+# 테이블 동시 조회 개수 (Notion API rate limit 고려)
+NOTION_FETCH_CONCURRENCY = int(os.getenv("NOTION_FETCH_CONCURRENCY", "4"))
+
+
+def collect_section_tables(blocks):
+    """블록 순회로 (테이블 ID, 섹션 제목) 목록 수집 (heading_3 기준)"""
+    tables = []
+    current_section = None
+    
+    for block in blocks:
+        block_type = block.get('type')
+        if block_type == 'heading_3':
+            heading = block.get('heading_3', {})
+            current_section = extract_text_from_rich_text(heading.get('rich_text', []))
+        elif block_type == 'table' and current_section:
+            tables.append((block.get('id'), current_section))
+    
+    return tables
+
+
+async def fetch_tables_concurrently(notion, table_ids):
+    """여러 테이블의 행을 동시에 가져오기 (세마포어로 동시 요청 수 제한)"""
+    semaphore = asyncio.Semaphore(max(1, NOTION_FETCH_CONCURRENCY))
+    
+    async def _fetch(table_id):
+        async with semaphore:
+            return await fetch_table_rows(notion, table_id)
+    
+    results = await asyncio.gather(*[_fetch(table_id) for table_id in table_ids])
+    return dict(zip(table_ids, results))
+
+
 async def parse_user_page(notion, page_id, username):
     """사용자 페이지에서 데이터 파싱"""
     print(f"\n{'='*70}")
@@ -57,6 +89,10 @@ async def parse_user_page(notion, page_id, username):
     response = await notion.blocks.children.list(block_id=page_id)
     blocks = response.get('results', [])
     
+    # 섹션 아래 테이블들을 먼저 수집해서 한 번에 동시 조회
+    section_tables = collect_section_tables(blocks)
+    table_rows = await fetch_tables_concurrently(notion, [table_id for table_id, _ in section_tables])
+    
     # 데이터 구조
     user_data = {
         "meal_history": [],
@@ -105,8 +141,8 @@ async def parse_user_page(notion, page_id, username):
             table_id = block.get('id')
             print(f"   테이블 ID: {table_id}")
             
-            # 테이블 행 가져오기
-            rows = await fetch_table_rows(notion, table_id)
+            # 미리 가져온 테이블 행 사용
+            rows = table_rows.get(table_id, [])
             
             if rows and current_section:
                 print(f"   행 수: {len(rows)}")
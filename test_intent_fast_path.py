@@ -0,0 +1,66 @@
+"""
+규칙 기반 의도 분류 테스트 - LLM 없이 워크플로우가 결정되는지 확인
+"""
+from tools.orchestrator_tools import classify_intent_fast, get_intent_stats, record_intent_route
+from config import INTENT_FAST_PATH_THRESHOLD
+
+# (메시지, 기대 워크플로우)
+CASES = [
+    ("된장찌개 만드는 법 알려줘", "RECIPE_ONLY"),
+    ("오늘 저녁 메뉴 추천해줘", "FULL_RECOMMENDATION"),
+    ("배달 시켜먹을래", "RESTAURANT_DELIVERY"),
+    ("오늘 외식하고 싶어", "RESTAURANT_DELIVERY"),
+    ("빨리 먹을 수 있는 음식", "QUICK_MEAL"),
+    ("이번 달 식비 얼마 썼어?", "BUDGET_CHECK"),
+    ("이 음식 칼로리 얼마야?", "NUTRITION_INFO"),
+    ("오늘 일정 어때?", "SCHEDULE_CHECK"),
+]
+
+
+def test_fast_path_cases():
+    """확실한 메시지는 fast path로 분류"""
+    print("\n" + "="*80)
+    print(f"규칙 기반 의도 분류 (임계값 {INTENT_FAST_PATH_THRESHOLD})")
+    print("="*80)
+
+    for message, expected in CASES:
+        intent = classify_intent_fast(message)
+        ok = intent["workflow_type"] == expected and intent["confidence"] >= INTENT_FAST_PATH_THRESHOLD
+        print(f"{'✅' if ok else '❌'} {message} → {intent['workflow_type']} "
+              f"(신뢰도 {intent['confidence']:.2f}) | {intent['reasoning']}")
+        assert ok, f"{message}: {intent}"
+
+
+def test_ambiguous_falls_back():
+    """모호하거나 이전 대화에 의존하는 메시지는 LLM으로 넘김"""
+    print("\n" + "="*80)
+    print("LLM 폴백 대상")
+    print("="*80)
+
+    cases = [
+        ("안녕", ""),
+        ("그거 말고 다른 거", "사용자: 된장찌개 레시피 알려줘"),
+    ]
+    for message, history in cases:
+        intent = classify_intent_fast(message, history)
+        ok = intent["confidence"] < INTENT_FAST_PATH_THRESHOLD
+        print(f"{'✅' if ok else '❌'} {message} → 신뢰도 {intent['confidence']:.2f}")
+        assert ok, f"{message}: {intent}"
+
+
+def test_intent_stats():
+    """fast path 비율 집계"""
+    before = get_intent_stats()
+    record_intent_route("fast_path")
+    record_intent_route("llm")
+    after = get_intent_stats()
+    print(f"\n📊 의도 분석 통계: {after}")
+    assert after["total"] == before["total"] + 2
+    assert after["fast_path"] == before["fast_path"] + 1
+
+
+if __name__ == "__main__":
+    test_fast_path_cases()
+    test_ambiguous_falls_back()
+    test_intent_stats()
+    print("\n✅ 모든 테스트 통과")
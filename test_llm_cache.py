@@ -0,0 +1,179 @@
+"""
+LLM 응답 캐시 테스트 - 키, 크기 기반 삭제, 워크플로우별 사용 여부, 반복 호출 시 네트워크 생략
+(로컬 OpenAI 호환 스텁 서버 사용, 실제 API 호출 없음)
+"""
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+from openai.types.chat import ChatCompletionMessageFunctionToolCall
+
+import llm_cache
+from bench.openai_stub import OpenAIStubServer
+from config import get_llm
+from llm_cache import (
+    LLMResponseCache,
+    _decode_result,
+    _encode_result,
+    cache_enabled_for,
+    get_llm_cache_stats,
+    response_key,
+    set_cache_workflow
+)
+from llm_client import close_openai_clients
+from tools import llm_judge_tools, notion_tools, recipe_tools
+from tools.orchestrator_tools import analyze_user_intent
+
+TMP_DIR = tempfile.mkdtemp()
+SERVER = None
+_patches = ExitStack()
+
+
+def responder(body: dict) -> str:
+    """의도 분석 도구는 JSON, 에이전트는 바로 최종 답변"""
+    if "워크플로우 타입" in body["messages"][-1]["content"]:
+        return json.dumps({"workflow_type": "BUDGET_CHECK", "required_agents": ["budget_agent"]})
+    return "오늘 남은 예산은 충분합니다."
+
+
+def setup_module():
+    """
+    임시 캐시 파일 + Mock 데이터 모드, 의도 분석 / 예산 확인만 캐시
+
+    설정은 import 시점에 읽히므로 환경 변수 대신 모듈 상수를 바꾸고 teardown_module에서 복원
+    """
+    global SERVER
+    SERVER = OpenAIStubServer(responder).start()
+    _patches.enter_context(mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": SERVER.base_url}))
+    _patches.enter_context(mock.patch.multiple(
+        llm_cache,
+        LLM_CACHE_ENABLED=True,
+        LLM_CACHE_PATH=str(Path(TMP_DIR) / "llm_cache.sqlite"),
+        LLM_CACHE_WORKFLOWS={"INTENT", "BUDGET_CHECK"},
+        _llm_cache=None
+    ))
+    _patches.enter_context(mock.patch.object(notion_tools, "USE_NOTION_MCP", False))
+    _patches.enter_context(mock.patch.object(llm_judge_tools, "JUDGE_CACHE_PATH", ""))
+    _patches.enter_context(mock.patch.object(recipe_tools, "RECIPE_CACHE_PATH", ""))
+    close_openai_clients()   # 다른 주소로 만든 공유 클라이언트 재사용 방지
+
+
+def teardown_module():
+    close_openai_clients()
+    _patches.close()
+    SERVER.stop()
+
+
+MESSAGES = [{"role": "user", "content": "오늘 예산 얼마 남았어?"}]
+
+
+def test_keys_and_flags():
+    """모델·온도·메시지가 모두 같아야 같은 키, 지정한 워크플로우만 캐시"""
+    print("\n" + "="*80)
+    print("캐시 키 / 워크플로우 설정")
+    print("="*80)
+
+    assert response_key("gpt-4o-mini", 0.7, MESSAGES) == response_key("gpt-4o-mini", 0.7, [dict(m) for m in MESSAGES])
+    assert response_key("gpt-4o-mini", 0.7, MESSAGES) != response_key("gpt-4o-mini", 0.3, MESSAGES)
+    assert response_key("gpt-4o-mini", 0.7, MESSAGES) != response_key("gpt-4o", 0.7, MESSAGES)
+    assert cache_enabled_for("INTENT") and cache_enabled_for("BUDGET_CHECK")
+    assert not cache_enabled_for("FULL_RECOMMENDATION") and not cache_enabled_for(None)
+    print("✅ 키 / 워크플로우 설정 확인")
+
+    # 에이전트의 도구 호출 응답도 같은 형태로 복원
+    tool_calls = [ChatCompletionMessageFunctionToolCall(
+        id="call_1", type="function", function={"name": "get_budget_status", "arguments": "{}"}
+    )]
+    assert _decode_result(json.loads(json.dumps(_encode_result(tool_calls)))) == tool_calls
+    assert _encode_result(None) is None
+    print("✅ 도구 호출 응답 저장 / 복원")
+
+
+def test_size_eviction():
+    """총 크기가 상한을 넘으면 가장 오래 사용하지 않은 응답부터 삭제"""
+    print("\n" + "="*80)
+    print("크기 기반 삭제")
+    print("="*80)
+
+    cache = LLMResponseCache(Path(TMP_DIR) / "small.sqlite", max_bytes=300)   # 응답 하나 89바이트
+    for i in range(3):
+        cache.put(f"k{i}", {"type": "text", "value": "가" * 20})
+        time.sleep(0.01)
+    assert cache.get("k0") is not None                  # k0을 최근 사용
+    cache.put("k3", {"type": "text", "value": "가" * 20})
+    assert cache.total_bytes() <= 300
+    assert cache.get("k1") is None and cache.get("k0") is not None and cache.get("k3") is not None
+    print(f"✅ 응답 {len(cache)}개 / {cache.total_bytes()}바이트 유지")
+
+
+def test_repeat_calls_skip_network():
+    """같은 요청은 두 번째부터 스텁 서버에 요청하지 않음"""
+    print("\n" + "="*80)
+    print("반복 호출")
+    print("="*80)
+
+    requests = SERVER.requests
+    for _ in range(2):
+        assert "BUDGET_CHECK" in analyze_user_intent.run(user_message="이번 주 외식비 얼마나 썼는지 궁금해")
+    assert SERVER.requests == requests + 1
+    print("✅ '사용자 의도 분석' 도구 - 두 번째 호출은 캐시 사용")
+
+    llm = get_llm()
+    llm.cache_workflow = "FULL_RECOMMENDATION"
+    requests = SERVER.requests
+    llm.call(MESSAGES)
+    llm.call(MESSAGES)
+    assert SERVER.requests == requests + 2
+    print("✅ 캐시하지 않는 워크플로우는 매번 호출")
+
+    llm.cache_workflow = "BUDGET_CHECK"
+    requests = SERVER.requests
+    first = llm.call(MESSAGES)
+    other = get_llm()                      # 다른 세션의 LLM 인스턴스도 같은 캐시 사용
+    other.cache_workflow = "BUDGET_CHECK"
+    second = other.call(MESSAGES)
+    assert SERVER.requests == requests + 1 and first == second == "오늘 남은 예산은 충분합니다."
+    print("✅ BUDGET_CHECK 워크플로우 - 두 번째 호출은 캐시 사용")
+    print(f"📊 LLM 캐시 통계: {get_llm_cache_stats()}")
+
+
+
+def test_workflow_per_context():
+    """에이전트들이 공유하는 LLM 하나를 스레드마다 다른 워크플로우로 동시에 사용"""
+    print("\n" + "="*80)
+    print("실행 컨텍스트별 워크플로우")
+    print("="*80)
+
+    llm = get_llm()
+    messages = [{"role": "user", "content": "이번 달 외식비 알려줘"}]
+
+    def run(workflow: str):
+        set_cache_workflow(workflow)   # 스레드의 컨텍스트에만 적용
+        return [llm.call(messages) for _ in range(2)]
+
+    requests = SERVER.requests
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(run, ["BUDGET_CHECK", "FULL_RECOMMENDATION"]))
+    assert SERVER.requests == requests + 3      # BUDGET_CHECK 1회 + FULL_RECOMMENDATION 2회
+    assert llm.cache_workflow is None
+    print("✅ 공유 LLM을 바꾸지 않고 워크플로우별 캐시 사용")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_keys_and_flags()
+        test_size_eviction()
+        test_repeat_calls_skip_network()
+        test_workflow_per_context()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,138 @@
+"""
+LLM cassette 테스트 - 스텁 서버로 녹화한 요청을 서버 없이 재생 (지연 주입 포함)
+"""
+import json
+import os
+import tempfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+import llm_cache
+from bench.openai_stub import OpenAIStubServer
+from config import get_llm
+from llm_cassette import use_cassette
+from llm_client import close_openai_clients, set_http_transport
+from tools import llm_judge_tools, recipe_tools
+from tools.orchestrator_tools import analyze_user_intent
+from tools.recipe_tools import generate_recipe_with_ai
+
+CASSETTE_PATH = Path(tempfile.mkdtemp()) / "cassette.json"
+SERVER = None
+_patches = ExitStack()
+
+
+def responder(body: dict) -> str:
+    prompt = body["messages"][-1]["content"]
+    if "워크플로우 타입" in prompt:
+        return json.dumps({"workflow_type": "RECIPE_ONLY", "required_agents": ["chef_agent"]})
+    if "레시피" in prompt:
+        return "## 두부조림\n간장 대신 저염 양념 사용"
+    return "Final Answer: 오늘 남은 예산은 12,000원입니다."
+
+
+def setup_module():
+    """
+    스텁 서버 시작 - 스텁 응답이 로컬 캐시에 남지 않도록 캐시 끄기
+
+    설정은 import 시점에 읽히므로 모듈 상수를 바꾸고 teardown_module에서 복원
+    """
+    global SERVER
+    SERVER = OpenAIStubServer(responder, latency=0.05).start()
+    _patches.enter_context(mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": SERVER.base_url}))
+    _patches.enter_context(mock.patch.object(llm_cache, "LLM_CACHE_ENABLED", False))
+    _patches.enter_context(mock.patch.object(llm_judge_tools, "JUDGE_CACHE_PATH", ""))
+    _patches.enter_context(mock.patch.object(recipe_tools, "RECIPE_CACHE_PATH", ""))
+    set_http_transport(None)   # 다른 주소로 만든 공유 클라이언트 / 남은 cassette 제거
+
+
+def teardown_module():
+    set_http_transport(None)
+    close_openai_clients()
+    _patches.close()
+    SERVER.stop()
+
+
+AGENT_MESSAGES = [
+    {"role": "system", "content": "당신은 총무입니다."},
+    {"role": "user", "content": "오늘 예산 얼마 남았어?"}
+]
+
+
+def run_workflow(llm) -> list:
+    """의도 분석 도구 -> 에이전트 LLM 호출 -> 레시피 도구"""
+    return [
+        analyze_user_intent.run(user_message="두부조림 어떻게 만들어?"),
+        llm.call(AGENT_MESSAGES),
+        generate_recipe_with_ai.run(dish_name="두부조림", user_health_info="고혈압"),
+    ]
+
+
+def test_record_and_replay():
+    """녹화한 응답을 네트워크 없이 같은 순서로 재생"""
+    print("\n" + "="*80)
+    print("녹화 / 재생")
+    print("="*80)
+
+    llm = get_llm()   # cassette보다 먼저 만든 LLM도 녹화 / 재생됨
+    with use_cassette(CASSETTE_PATH, mode="record") as cassette:
+        recorded = run_workflow(llm)
+    assert cassette.stats["recorded"] == 3 and SERVER.requests == 3
+    print(f"✅ 요청 {cassette.stats['recorded']}개 녹화")
+
+    SERVER.stop()
+    with mock.patch.dict(os.environ, {"OPENAI_BASE_URL": "http://127.0.0.1:9/v1"}):   # 연결할 수 없는 주소
+        with use_cassette(CASSETTE_PATH, mode="replay") as cassette:
+            replayed = run_workflow(llm)
+    assert replayed == recorded
+    assert cassette.stats["exact"] == 3 and cassette.stats["missing"] == 0
+    print(f"✅ 네트워크 없이 재생: {cassette.stats}")
+
+
+def test_replay_latency_and_fallback():
+    """지연 주입, 요청이 조금 달라도 같은 종류의 응답으로 재생, strict면 실패"""
+    print("\n" + "="*80)
+    print("지연 주입 / 대체 재생")
+    print("="*80)
+
+    llm = get_llm()
+    with use_cassette(CASSETTE_PATH, mode="replay", latency=0.2):
+        start = time.perf_counter()
+        llm.call(AGENT_MESSAGES)
+        assert time.perf_counter() - start >= 0.2
+    print("✅ 고정 지연 0.2초 주입")
+
+    with use_cassette(CASSETTE_PATH, mode="replay", latency="recorded"):
+        start = time.perf_counter()
+        llm.call(AGENT_MESSAGES)
+        assert time.perf_counter() - start >= 0.05
+    print("✅ 녹화 당시 지연 재현")
+
+    changed = AGENT_MESSAGES[:1] + [{"role": "user", "content": "이번 주 예산은?"}]
+    with use_cassette(CASSETTE_PATH, mode="replay") as cassette:
+        assert "12,000원" in llm.call(changed)
+    assert cassette.stats["route"] == 1
+    print("✅ 사용자 메시지가 달라도 같은 단계의 응답 재생")
+
+    with use_cassette(CASSETTE_PATH, mode="replay", strict=True) as cassette:
+        try:
+            llm.call([{"role": "user", "content": "녹화하지 않은 요청"}])
+            failed = False
+        except Exception:   # CassetteMiss -> OpenAI 연결 오류로 전달됨
+            failed = True
+    assert failed and cassette.stats["missing"] >= 1
+    print("✅ strict 모드 - 기록에 없는 요청 거부")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_record_and_replay()
+        test_replay_latency_and_fallback()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,112 @@
+"""
+공유 OpenAI 클라이언트 테스트 - 도구 / 에이전트 LLM이 같은 연결 풀을 쓰는지 확인
+(로컬 OpenAI 호환 스텁 서버 사용, 실제 API 호출 없음)
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from unittest import mock
+
+import llm_cache
+from bench.openai_stub import OpenAIStubServer
+from config import get_llm
+from llm_client import chat_completion, close_openai_clients, get_client_stats, get_openai_client
+from tools import llm_judge_tools, recipe_tools
+from tools.llm_judge_tools import judge_menus_batch
+from tools.orchestrator_tools import analyze_user_intent
+from tools.recipe_tools import generate_recipe_with_ai
+
+SERVER = None
+_patches = ExitStack()
+
+
+def responder(body: dict) -> str:
+    """의도 분석 / 일괄 판정 / 레시피 요청별 고정 응답"""
+    prompt = body["messages"][-1]["content"]
+    if "verdicts" in prompt:
+        return json.dumps({"verdicts": [{"index": 1, "suitable": True, "reason": "고단백 저지방"}]})
+    if "워크플로우 타입" in prompt:
+        return json.dumps({"workflow_type": "RECIPE_ONLY", "required_agents": ["chef"], "reasoning": "레시피 요청"})
+    return "## 두부조림\n간단한 두부 요리"
+
+
+def setup_module():
+    """
+    스텁 서버 시작 - 스텁 응답이 로컬 캐시에 남지 않도록 캐시 끄기
+
+    설정은 import 시점에 읽히므로 모듈 상수를 바꾸고 teardown_module에서 복원
+    """
+    global SERVER
+    SERVER = OpenAIStubServer(responder).start()
+    _patches.enter_context(mock.patch.dict(os.environ, {"OPENAI_API_KEY": "sk-test", "OPENAI_BASE_URL": SERVER.base_url}))
+    _patches.enter_context(mock.patch.object(llm_cache, "LLM_CACHE_ENABLED", False))
+    _patches.enter_context(mock.patch.object(llm_judge_tools, "JUDGE_CACHE_PATH", ""))
+    _patches.enter_context(mock.patch.object(recipe_tools, "RECIPE_CACHE_PATH", ""))
+    close_openai_clients()   # 다른 주소로 만든 공유 클라이언트 재사용 방지
+
+
+def teardown_module():
+    close_openai_clients()
+    _patches.close()
+    SERVER.stop()
+
+
+def test_shared_client():
+    """클라이언트는 한 번만 생성, 연결 풀 설정 적용"""
+    print("\n" + "="*80)
+    print("공유 클라이언트")
+    print("="*80)
+
+    client = get_openai_client()
+    assert get_openai_client() is client
+    assert get_llm()._client is client and get_llm(temperature=0.2)._client is client
+    print(f"✅ 도구 / 에이전트 LLM 클라이언트 공유 (timeout={client.timeout})")
+
+
+def test_tools_reuse_connection():
+    """레시피 / 의도 분석 / 일괄 판정 도구가 연결 하나를 재사용"""
+    print("\n" + "="*80)
+    print("도구 호출 연결 재사용")
+    print("="*80)
+
+    connections = SERVER.connections
+    created = get_client_stats()["clients_created"]
+
+    assert "두부조림" in generate_recipe_with_ai.run(dish_name="두부조림")
+    assert "RECIPE_ONLY" in analyze_user_intent.run(user_message="두부조림 레시피 알려줘")
+    assert "LLM 1" in judge_menus_batch.run(menus=["썬한식 - 손두부"], user_persona_info="다이어트 목표")
+
+    assert get_client_stats()["clients_created"] == created
+    assert SERVER.connections - connections <= 1
+    print(f"✅ 요청 {SERVER.requests}개 / TCP 연결 {SERVER.connections}개")
+
+
+def test_concurrent_calls_counted():
+    """여러 스레드가 동시에 호출해도 호출 수 통계가 빠짐없이 집계됨"""
+    print("\n" + "="*80)
+    print("동시 호출 통계")
+    print("="*80)
+
+    calls, requests = get_client_stats()["calls"], SERVER.requests
+    messages = [{"role": "user", "content": "두부조림 레시피"}]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda _: chat_completion(model="gpt-4o-mini", messages=messages), range(64)))
+
+    assert all("두부조림" in result.choices[0].message.content for result in results)
+    assert get_client_stats()["calls"] - calls == SERVER.requests - requests == 64
+    print(f"✅ 동시 호출 64회 집계: {get_client_stats()}")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_shared_client()
+        test_tools_reuse_connection()
+        test_concurrent_calls_counted()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,82 @@
+"""
+메뉴 일괄 적합성 판단 테스트 - 응답 파싱과 규칙 판정만으로 끝나는 경우 확인
+"""
+from unittest import mock
+
+from tools import llm_judge_tools
+from tools.llm_judge_tools import build_batch_prompt, judge_menus, judge_menus_batch, parse_batch_verdicts
+
+# 로컬 판정 캐시에 남은 결과와 무관하게 실행 (JUDGE_CACHE_PATH는 import 시점에 읽힘)
+_no_cache = mock.patch.object(llm_judge_tools, "JUDGE_CACHE_PATH", "")
+
+
+def setup_module():
+    _no_cache.start()
+
+
+def teardown_module():
+    _no_cache.stop()
+
+
+MENUS = ["원조장충왕족발 - 족발", "시골식당 - 매운탕", "썬한식 - 손두부"]
+
+
+def test_parse_batch_verdicts():
+    """JSON 응답 -> 메뉴 순서대로 구조화된 판정"""
+    print("\n" + "="*80)
+    print("일괄 판정 응답 파싱")
+    print("="*80)
+
+    response = """```json
+{"verdicts": [
+  {"index": 3, "suitable": true, "reason": "저칼로리 고단백", "alternative": ""},
+  {"index": 1, "suitable": "부적합", "reason": "돼지고기", "alternative": "두부 요리"}
+]}
+```"""
+    verdicts = parse_batch_verdicts(response, MENUS)
+    assert [v.suitable for v in verdicts] == [False, None, True]
+    assert verdicts[0].alternative == "두부 요리" and verdicts[1].reason == "판정 결과 누락"
+    assert all(v.source == "llm" for v in verdicts)
+
+    # index 없이 메뉴명으로 짝 맞추기 + 앞뒤 설명
+    response = '판정 결과입니다: [{"menu": "매운탕", "suitable": false, "reason": "고염"}]'
+    assert [v.suitable for v in parse_batch_verdicts(response, MENUS)] == [None, False, None]
+    assert [v.suitable for v in parse_batch_verdicts("JSON 아님", MENUS)] == [None, None, None]
+    print("✅ 응답 파싱 완료")
+
+
+def test_compact_prompt():
+    """일괄 프롬프트는 few-shot 없이 메뉴 번호 목록만 포함"""
+    prompt = build_batch_prompt(MENUS, {"allergies": ["갑각류"]})
+    assert "Few-Shot" not in prompt and "3. 썬한식 - 손두부" in prompt
+    print(f"✅ 메뉴 {len(MENUS)}개 일괄 프롬프트 {len(prompt)}자")
+
+
+def test_rule_only_batch():
+    """모든 메뉴가 규칙으로 확정되면 LLM 호출 없이 판정"""
+    print("\n" + "="*80)
+    print("규칙 판정만으로 끝나는 일괄 판정")
+    print("="*80)
+
+    persona = "- 알레르기: 갑각류\n- 식이 제한: 락토오보"
+    verdicts = judge_menus(["원조장충왕족발 - 족발", "해물짬뽕", "짬뽕집 - 탕수육"], persona)
+    assert [v.suitable for v in verdicts] == [False, False, False]
+    assert all(v.source == "rule" for v in verdicts)
+
+    result = judge_menus_batch.run(menus=["원조장충왕족발 - 족발", "해물짬뽕", "짬뽕집 - 탕수육"], user_persona_info=persona)
+    assert "규칙 3 · LLM 0" in result and "직접 판단" not in result
+    print(result)
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_parse_batch_verdicts()
+        test_compact_prompt()
+        test_rule_only_batch()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,164 @@
+"""
+메뉴 판정 캐시 테스트 - 페르소나 지문/메뉴 정규화, TTL, 선호도 변경 시 무효화
+"""
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from tools import llm_judge_tools
+from tools.llm_judge_tools import (
+    MenuVerdict,
+    VerdictCache,
+    _cached_verdicts,
+    _store_verdicts,
+    get_judge_stats,
+    get_verdict_cache,
+    judge_menus,
+    menu_key,
+    persona_fingerprint,
+    track_user_preferences
+)
+from tools.notion_tools import format_user_context
+
+# 임시 캐시 파일 사용 (JUDGE_CACHE_PATH는 import 시점에 읽히므로 모듈 상수와 공유 캐시를 교체)
+TMP_DIR = tempfile.mkdtemp()
+_tmp_cache = mock.patch.multiple(
+    llm_judge_tools,
+    JUDGE_CACHE_PATH=str(Path(TMP_DIR) / "judge_verdicts.sqlite"),
+    _verdict_cache=None,
+    _user_preferences={}
+)
+
+
+def setup_module():
+    _tmp_cache.start()
+
+
+def teardown_module():
+    _tmp_cache.stop()
+
+
+def load_preferences(user: str) -> dict:
+    with open(f"data/parsed_notion_{user}.json", encoding="utf-8") as f:
+        return json.load(f)["preferences"]
+
+
+def test_keys():
+    """같은 선호도는 dict / 컨텍스트 텍스트 모두 같은 지문, 메뉴명은 공백·가격 무시"""
+    print("\n" + "="*80)
+    print("캐시 키")
+    print("="*80)
+
+    for user in ["소윤", "현우", "지민"]:
+        prefs = load_preferences(user)
+        text = format_user_context({"user": user, "preferences": prefs})
+        assert persona_fingerprint(prefs) == persona_fingerprint(text), user
+    assert persona_fingerprint(load_preferences("소윤")) != persona_fingerprint(load_preferences("현우"))
+    print("✅ 페르소나 지문 일치")
+
+    # 규칙 판정이 모르는 값도 지문에 반영
+    personas = ["알레르기: 없음", "알레르기: 복숭아", "알레르기: 키위, 망고", "건강 상태: 임신 중", "통풍", "신장질환 저칼륨 식단"]
+    assert len({persona_fingerprint(p) for p in personas}) == len(personas)
+    assert persona_fingerprint("알레르기: 키위, 망고") == persona_fingerprint("- 알레르기: 망고,키위")
+    assert persona_fingerprint("- 알레르기: 갑각류\n[예산]\n- 일일 20,000원") == persona_fingerprint("- 알레르기: 갑각류")
+    print("✅ 규칙에 없는 알레르기·건강 상태 구분")
+
+    # 요일별 식단은 요일 묶음까지 지문에 포함
+    monday, saturday = datetime(2026, 10, 12, 12), datetime(2026, 10, 17, 12)
+    assert persona_fingerprint("평일 락토오보", monday) != persona_fingerprint("주말 락토오보", monday)
+    assert persona_fingerprint("평일 락토오보", monday) != persona_fingerprint("평일 락토오보", saturday)
+    assert "@" not in persona_fingerprint("- 알레르기: 갑각류")
+    print("✅ 요일별 식단 지문 구분")
+
+    assert menu_key("원조장충왕족발 - 족발 세트") == menu_key("- 원조장충왕족발 - 족발세트: 15,000원")
+    assert menu_key("원조장충왕족발 - 족발") != menu_key("다른족발집 - 족발")
+    print(f"✅ 메뉴 키: {menu_key('원조장충왕족발 - 족발 세트')}")
+
+
+def test_ttl_and_invalidation():
+    """TTL이 지나면 조회 안 됨, 선호도 지문이 바뀌면 이전 판정 삭제"""
+    print("\n" + "="*80)
+    print("TTL / 선호도 변경 무효화")
+    print("="*80)
+
+    expired = VerdictCache(Path(TMP_DIR) / "expired.sqlite", ttl_hours=-1)
+    expired.put_many("p", [MenuVerdict("시골식당 - 매운탕", True, "적합", "", "llm")])
+    assert expired.get_many("p", ["시골식당 - 매운탕"]) == {}
+    print("✅ TTL 지난 판정 무시")
+
+    cache = get_verdict_cache()
+    prefs = load_preferences("현우")
+    old = persona_fingerprint(prefs)
+    cache.put_many(old, [MenuVerdict("썬한식 - 손두부", True, "고단백", "", "llm")])
+    assert track_user_preferences("현우", prefs) == 0
+    assert cache.get_many(old, ["썬한식 - 손두부"])
+
+    changed = {**prefs, "dislikes": ["두부"]}
+    assert track_user_preferences("현우", changed) == 1
+    assert cache.get_many(old, ["썬한식 - 손두부"]) == {}
+    print("✅ 선호도 변경 시 이전 판정 삭제")
+
+
+def test_preferences_change_invalidates_agent_verdicts():
+    """에이전트가 넘긴 페르소나 텍스트로 저장한 판정도 Notion 선호도가 바뀌면 더 이상 사용하지 않음"""
+    print("\n" + "="*80)
+    print("선호도 변경 후 판정 캐시")
+    print("="*80)
+
+    persona = "지민님은 버섯 식감을 싫어하고 장 건강을 챙기는 중입니다."   # 에이전트가 요약한 페르소나
+    menu = "썬한식 - 손두부"
+    with mock.patch.dict(os.environ, {"CURRENT_NOTION_USER": "지민"}):
+        prefs = load_preferences("지민")
+        track_user_preferences("지민", prefs)
+        _store_verdicts([MenuVerdict(menu, True, "고단백 저지방", "", "llm")], persona)
+        assert _cached_verdicts([menu], persona)
+        print("✅ 같은 선호도 - 캐시 사용")
+
+        assert track_user_preferences("지민", {**prefs, "allergies": ["대두"]}) == 1
+        assert _cached_verdicts([menu], persona) == {}
+    print("✅ 선호도 변경 후 이전 판정 미사용")
+
+
+def test_cache_hit_skips_llm():
+    """캐시에 있는 판정은 LLM 없이 재사용"""
+    print("\n" + "="*80)
+    print("캐시 적중")
+    print("="*80)
+
+    persona = "- 알레르기: 갑각류"
+    get_verdict_cache().put_many(persona_fingerprint(persona), [
+        MenuVerdict("메이린 - 점심특선코스 A", False, "코스에 새우 요리 포함", "사천탕면", "llm")
+    ])
+
+    before = get_judge_stats()
+    verdicts = judge_menus(["메이린 - 점심특선코스 A", "해물짬뽕"], persona)
+    after = get_judge_stats()
+    assert [(v.suitable, v.source) for v in verdicts] == [(False, "cache"), (False, "rule")]
+    assert verdicts[0].alternative == "사천탕면"
+    assert after["cache"] == before["cache"] + 1 and after["llm"] == before["llm"]
+    print(f"📊 판정 통계: {after}")
+
+    # 다른 알레르기의 판정은 재사용하지 않음
+    get_verdict_cache().put_many(persona_fingerprint("알레르기: 없음"), [
+        MenuVerdict("과일가게 - 복숭아 빙수", True, "제한 없음", "", "llm")
+    ])
+    assert _cached_verdicts(["과일가게 - 복숭아 빙수"], "알레르기: 복숭아") == {}
+    print("✅ 알레르기가 다르면 캐시 미적중")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_keys()
+        test_ttl_and_invalidation()
+        test_preferences_change_invalidates_agent_verdicts()
+        test_cache_hit_skips_llm()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,128 @@
+"""
+LLM as Judge 규칙 기반 사전 판정 테스트 - 확실한 부적합만 LLM 없이 판정되는지 확인
+"""
+import json
+from unittest import mock
+
+from tools import llm_judge_tools
+from tools.llm_judge_tools import (
+    get_judge_stats,
+    judge_menu_personalization,
+    judge_restaurant_recommendations,
+    parse_persona_rules,
+    rule_judge_menu
+)
+
+# 로컬 판정 캐시에 남은 결과와 무관하게 실행 (JUDGE_CACHE_PATH는 import 시점에 읽힘)
+_no_cache = mock.patch.object(llm_judge_tools, "JUDGE_CACHE_PATH", "")
+
+
+def setup_module():
+    _no_cache.start()
+
+
+def teardown_module():
+    _no_cache.stop()
+
+
+# (메뉴, 페르소나, 기대 판정 - None이면 LLM 판단, 규칙은 부적합만 확정)
+CASES = [
+    ("원조장충왕족발 - 족발 세트", "채식주의자 (락토오보), 평일에는 고기를 먹지 않음", False),
+    ("매드독스시카고피자 - 슈퍼콤보 피자", "당뇨·고혈압, 저염·저당식 필요", False),
+    ("시골식당 - 해물칼국수", "페스코 채식주의자 (생선·해물은 섭취)", None),
+    ("해물탕 (새우, 게 포함)", "알레르기: 갑각류(새우, 게)", False),
+    ("썬한식 - 손두부", "다이어트 목표, 저칼로리 식단 선호", None),        # 칼로리는 규칙으로 확인 불가
+    ("고등어구이", "평일 락토오보, 주말 페스코", None),                     # 요일에 따라 다름
+    ("족발", "평일 락토오보, 주말 페스코", False),                          # 두 요일 모두 고기 금지
+    ("두부김치", "평일 락토오보, 주말 페스코", None),
+    ("버섯전골", "- 싫어하는 음식: 버섯 식감, 생양파", False),
+    ("점심특선코스 A", "- 알레르기: 갑각류", None),                         # 재료 불명
+    ("해물칼국수 집 - 칼국수", "- 알레르기: 갑각류", False),                # 식당 재료 교차 오염
+    ("해물칼국수 - 파전", "- 알레르기: 갑각류", False),
+    ("짬뽕집 - 탕수육", "- 알레르기: 갑각류", False),
+    ("시골식당 - 된장찌개", "- 알레르기: 갑각류", None),                    # 태그에 없는 재료가 있을 수 있음
+    ("디저트 - 초코 쿠키", "- 알레르기: 땅콩", None),
+    ("원조장충왕족발 - 쟁반국수", "채식주의자 (락토오보)", None),            # 식이 제한은 메뉴 재료만 확인
+]
+
+
+def test_rule_cases():
+    """확실한 부적합만 규칙으로 확정"""
+    print("\n" + "="*80)
+    print("규칙 기반 사전 판정")
+    print("="*80)
+
+    for menu, persona, expected in CASES:
+        verdict = rule_judge_menu(menu, parse_persona_rules(persona))
+        label = {True: "적합", False: "부적합", None: "LLM 판단"}[verdict.suitable]
+        print(f"{'✅' if verdict.suitable == expected else '❌'} {menu} | {persona} → {label} {verdict.reason}")
+        assert verdict.suitable == expected, (menu, persona, verdict)
+
+
+def test_persona_dict():
+    """Notion 선호도 dict (현우: 유당불내증, 지민: 기피 음식)"""
+    print("\n" + "="*80)
+    print("Notion 선호도 dict")
+    print("="*80)
+
+    with open("data/parsed_notion_현우.json", encoding="utf-8") as f:
+        hyunwoo = json.load(f)["preferences"]
+    verdict = rule_judge_menu("알프레도파스타", parse_persona_rules(hyunwoo))
+    assert verdict.suitable is False and "유제품" in verdict.reason
+    print(f"✅ 현우 - 알프레도파스타 → {verdict.reason}")
+
+    rules = parse_persona_rules({"dislikes": ["버섯 식감"], "dietary_restrictions": {
+        "평일": "락토오보 (유제품과 계란은 가능, 고기와 생선은 불가)",
+        "주말": "페스코 (생선과 해물은 가능, 고기는 불가)"
+    }})
+    assert rule_judge_menu("표고버섯덮밥", rules).suitable is False
+    assert rule_judge_menu("제육볶음", rules).suitable is False
+    assert rule_judge_menu("연어덮밥", rules).suitable is None
+    print("✅ 지민 - 기피 음식 / 요일별 식단 판정 완료")
+
+
+def test_tool_short_circuit():
+    """모든 메뉴가 규칙으로 확정되면 LLM 프롬프트 없이 결과 반환"""
+    print("\n" + "="*80)
+    print("도구 출력 (규칙 판정 + 통계)")
+    print("="*80)
+
+    before = get_judge_stats()
+    result = judge_menu_personalization.run(
+        menu_recommendations="원조장충왕족발 - 족발 세트\n시골식당 - 해물칼국수",
+        user_persona_info="채식주의자 (락토오보)"
+    )
+    assert "규칙 기반 판정" in result and "Few-Shot" not in result
+    print(result)
+
+    result = judge_menu_personalization.run(
+        menu_recommendations="족발\n연어덮밥",
+        user_persona_info="평일 락토오보, 주말 페스코"
+    )
+    assert "Few-Shot" in result and "- 연어덮밥" in result
+    assert "**추천 메뉴:**\n- 연어덮밥\n" in result
+
+    result = judge_restaurant_recommendations.run(
+        all_agent_recommendations="### 1. 시골식당\n  - 매운탕: ₩5,000\n  - 해물칼국수: ₩5,000",
+        user_persona_info="- 알레르기: 갑각류"
+    )
+    assert "해물칼국수: ₩5,000  ⛔" in result and "매운탕: ₩5,000\n" in result
+
+    after = get_judge_stats()
+    assert after["rule"] == before["rule"] + 4
+    assert after["llm"] == before["llm"] + 2
+    print(f"\n📊 판정 통계: {after}")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_rule_cases()
+        test_persona_dict()
+        test_tool_short_circuit()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,50 @@
+"""
+MCP 세션 풀 테스트 - 호출 제한 시간 초과 후에도 세션 수가 돌아와 같은 키를 계속 사용할 수 있는지 확인
+(Mock 서버 notion_server.py 사용)
+"""
+import asyncio
+import time
+
+from mcp_client.notion_mcp_client import NotionMCPSessionPool
+
+KEY = ("notion_server.py", "소윤")
+
+
+async def hang(session):
+    """응답하지 않는 도구 호출"""
+    await asyncio.sleep(30)
+
+
+def test_timeout_releases_session():
+    """제한 시간 초과로 취소된 호출의 세션은 폐기되고, 풀 크기보다 많이 초과돼도 다음 호출은 성공"""
+    print("\n" + "="*80)
+    print("호출 제한 시간 초과 후 세션 반환")
+    print("="*80)
+
+    pool = NotionMCPSessionPool(max_sessions_per_key=2, call_timeout=3, idle_timeout=0)
+    try:
+        for _ in range(3):   # 풀 크기(2)보다 많이
+            try:
+                pool._submit(pool._with_session(KEY, hang))
+                timed_out = False
+            except TimeoutError:
+                timed_out = True
+            assert timed_out
+        print(f"✅ 제한 시간 초과 3회: {pool.get_stats()}")
+
+        pool.call_timeout = 30
+        start = time.perf_counter()
+        result = pool._submit(pool.call_tool_async("get_budget_status", {}, KEY))
+        assert "daily_limit" in result
+        assert pool.get_stats()["open_sessions"] <= 2
+        print(f"✅ 같은 키로 다시 호출 성공 ({time.perf_counter() - start:.1f}초): {pool.get_stats()}")
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    test_timeout_releases_session()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
@@ -0,0 +1,134 @@
+"""
+레시피 캐시 테스트 - 키 정규화, LRU / TTL, 프로세스 간 공유, 반복 요청 시 LLM·에이전트 생략
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+from tools import notion_tools, recipe_tools
+from tools.recipe_tools import (
+    RecipeCache,
+    generate_recipe_with_ai,
+    get_recipe_cache,
+    get_recipe_cache_stats,
+    parse_recipe_request,
+    recipe_cache_key
+)
+
+TMP_DIR = tempfile.mkdtemp()
+_patches = ExitStack()
+
+RECIPE = "## 된장찌개\n저염 된장으로 끓인 찌개"
+
+
+def setup_module():
+    """
+    임시 캐시 파일 + Mock 데이터 모드 사용
+
+    RECIPE_CACHE_PATH는 import 시점에 읽히므로 모듈 상수와 공유 캐시를 바꾸고 teardown_module에서 복원
+    (환경 변수는 캐시를 여는 하위 프로세스용)
+    """
+    cache_path = str(Path(TMP_DIR) / "recipe_cache.sqlite")
+    env = {"RECIPE_CACHE_PATH": cache_path, "USE_NOTION_MCP": "false"}
+    if not os.getenv("OPENAI_API_KEY"):
+        env["OPENAI_API_KEY"] = "sk-test"
+    _patches.enter_context(mock.patch.dict(os.environ, env))
+    _patches.enter_context(mock.patch.multiple(recipe_tools, RECIPE_CACHE_PATH=cache_path, _recipe_cache=None))
+    _patches.enter_context(mock.patch.object(notion_tools, "USE_NOTION_MCP", False))
+
+
+def teardown_module():
+    _patches.close()
+
+
+def test_keys():
+    """띄어쓰기·'레시피' 접미사·건강 정보 순서 무시"""
+    print("\n" + "="*80)
+    print("캐시 키 / 요청 파싱")
+    print("="*80)
+
+    assert recipe_cache_key("된장 찌개 레시피", "고혈압·당뇨") == recipe_cache_key("된장찌개", "당뇨, 고혈압")
+    assert recipe_cache_key("된장찌개", "없음") == recipe_cache_key("된장찌개") == ("된장찌개", "")
+    assert recipe_cache_key("된장찌개", "당뇨") != recipe_cache_key("된장찌개", "")
+    assert parse_recipe_request("된장찌개 만드는 법 알려줘") == "된장찌개"
+    assert parse_recipe_request("파스타 레시피 좀 알려주세요!") == "파스타"
+    assert parse_recipe_request("오늘 저녁 메뉴 추천해줘") is None
+    print(f"✅ {recipe_cache_key('된장 찌개 레시피', '고혈압·당뇨')}")
+
+
+def test_lru_and_ttl():
+    """max_entries를 넘으면 가장 오래 안 쓴 레시피 삭제, TTL 지나면 무시"""
+    print("\n" + "="*80)
+    print("LRU / TTL")
+    print("="*80)
+
+    cache = RecipeCache(Path(TMP_DIR) / "lru.sqlite", max_entries=2)
+    cache.put("김치찌개", "", "A")
+    cache.put("된장찌개", "", "B")
+    assert cache.get("김치찌개") == "A"      # 김치찌개가 최근 사용
+    cache.put("순두부찌개", "", "C")
+    assert len(cache) == 2 and cache.get("된장찌개") is None and cache.get("김치찌개") == "A"
+    print("✅ LRU 삭제")
+
+    expired = RecipeCache(Path(TMP_DIR) / "expired.sqlite", ttl_hours=-1)
+    expired.put("김치찌개", "", "A")
+    assert expired.get("김치찌개") is None
+    print("✅ TTL 지난 레시피 무시")
+
+
+def test_shared_across_processes():
+    """다른 프로세스가 저장한 레시피를 그대로 사용"""
+    print("\n" + "="*80)
+    print("프로세스 간 공유")
+    print("="*80)
+
+    subprocess.run([
+        sys.executable, "-c",
+        "from tools.recipe_tools import get_recipe_cache; "
+        f"get_recipe_cache().put('된장찌개', '갑각류 알레르기', {RECIPE!r})"
+    ], check=True, env=os.environ.copy(), capture_output=True)
+    assert get_recipe_cache().get("된장 찌개", "갑각류 알레르기") == RECIPE
+    print("✅ 다른 프로세스의 레시피 조회")
+
+
+def test_repeat_request_skips_llm():
+    """캐시된 레시피는 도구에서 LLM 없이, 크루에서는 에이전트 실행 없이 반환"""
+    print("\n" + "="*80)
+    print("반복 레시피 요청")
+    print("="*80)
+
+    before = get_recipe_cache_stats()
+    result = generate_recipe_with_ai.run(dish_name="된장찌개 레시피", user_health_info="갑각류 알레르기")
+    assert result == f"🍳 AI 생성 레시피 (갑각류 알레르기 고려)\n\n{RECIPE}"
+    assert get_recipe_cache_stats()["hits"] == before["hits"] + 1
+
+    from crew import FoodRecommendationCrew
+    crew = FoodRecommendationCrew()
+    crew.prefetch_user_context()
+    health_info = crew.recipe_health_info
+    get_recipe_cache().put("된장찌개", health_info, RECIPE)
+
+    result = crew.run("된장찌개 만드는 법 알려줘")
+    assert isinstance(result, str) and RECIPE in result
+    assert crew.last_timing.get("recipe_cache") and len(crew.conversation_history) == 2
+    print(f"✅ 에이전트 실행 없이 응답 (건강 정보: {health_info or '없음'})")
+    print(f"📊 레시피 캐시 통계: {get_recipe_cache_stats()}")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_keys()
+        test_lru_and_ttl()
+        test_shared_across_processes()
+        test_repeat_request_skips_llm()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
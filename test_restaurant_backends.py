@@ -0,0 +1,162 @@
+"""
+식당 검색 백엔드 일치 테스트 - 같은 검색 조건 격자에서 인덱스 검색 결과가
+식당_DB.json 선형 검사(기준 구현)와 같은지 확인
+"""
+import itertools
+import json
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from tools import restaurant_tools
+from tools.restaurant_hours import is_open, parse_open_at
+from tools.restaurant_menu_tags import parse_exclusions
+from tools.restaurant_snapshot import SnapshotRestaurantIndex, build_snapshot
+from tools.restaurant_sqlite import SQLiteRestaurantStore
+from tools.restaurant_tools import (
+    DB_PATH,
+    TIME_KEYS,
+    _keyword_match,
+    _menu_tags,
+    _parse_price,
+    _parse_time,
+    _schedule,
+)
+
+# 2026-10-18 (일요일) 정오 기준
+NOW = datetime(2026, 10, 18, 12, 0)
+
+# 검색 조건 격자
+BUDGETS = [0, 6000, 9000, 12000, 20000, 100000]
+TIMES = [10, 20, 35, 60, 120]
+MEAL_TYPES = ["배달", "매장"]
+KEYWORDS = [
+    "", "국", "해물", "칼국수", "족발", "똥돼지김치", "없는메뉴",
+    "  족발 ",             # 앞뒤 공백
+    "파전\x00해물",        # 필드 경계를 넘는 키워드 (매칭 안 됨)
+]
+OPEN_ATS = [None, parse_open_at("23:00–23:15", NOW), parse_open_at("월 12:00-13:00", NOW)]
+EXCLUDE_MASKS = [0, parse_exclusions("갑각류", "")[0], parse_exclusions("", "비건")[0]]
+
+# 백엔드 -> (RESTAURANT_BACKEND 값, 기대 인덱스 타입)
+BACKENDS = {
+    "memory": ("memory", restaurant_tools.RestaurantIndex),
+    "snapshot": ("memory", SnapshotRestaurantIndex),   # 최신 스냅샷이 있으면 mmap으로 사용
+    "sqlite": ("sqlite", SQLiteRestaurantStore),       # 파일이 없으면 빌드
+}
+
+_patches = ExitStack()
+_tmp_dir = None
+
+
+def setup_module():
+    """백엔드 파일(스냅샷/SQLite)은 임시 폴더에 생성"""
+    global _tmp_dir
+    _tmp_dir = Path(_patches.enter_context(tempfile.TemporaryDirectory()))
+
+
+def teardown_module():
+    _patches.close()
+
+
+def _open_backend(backend: str):
+    """백엔드 파일을 준비하고 앱과 같은 _build_restaurant_index 경로로 검색 인덱스 생성"""
+    setting, index_type = BACKENDS[backend]
+    snapshot_path = _tmp_dir / f"{backend}.snapshot"
+    if backend == "snapshot":
+        build_snapshot(DB_PATH, snapshot_path)
+    with mock.patch.multiple(
+        restaurant_tools,
+        RESTAURANT_BACKEND=setting,
+        SNAPSHOT_PATH=snapshot_path,
+        SQLITE_PATH=_tmp_dir / f"{backend}.sqlite",
+    ):
+        index = restaurant_tools._build_restaurant_index(restaurant_tools._db_signature())
+    assert type(index) is index_type, (backend, type(index))
+    return index
+
+
+def _baseline_candidates(restaurants, max_budget, max_time_minutes, meal_type, keyword="", open_at=None, exclude_mask=0):
+    """식당마다 원본 dict를 직접 검사하는 기준 구현 - [(식당 번호, 소요시간, 예산 내 메뉴 개수), ...]"""
+    time_key = TIME_KEYS["배달" if meal_type == "배달" else "매장"]
+    keyword_lower = keyword.strip().lower()
+    rows = []
+    for i, restaurant in enumerate(restaurants):
+        minutes = _parse_time(restaurant.get(time_key, ""))
+        menus = sorted(restaurant.get("menu") or [], key=lambda m: _parse_price(m.get("price")))
+        affordable = [menu for menu in menus if _parse_price(menu.get("price")) <= max_budget]
+        if not affordable or minutes > max_time_minutes:
+            continue
+        if keyword_lower and not _keyword_match(restaurant, keyword_lower):
+            continue
+        if open_at is not None and not is_open(_schedule(restaurant), open_at):
+            continue
+        if exclude_mask and all(tags & exclude_mask for tags in _menu_tags(restaurant, affordable)):
+            continue
+        rows.append((i, minutes, len(affordable)))
+    return rows
+
+
+def baseline_search(restaurants, max_budget, max_time_minutes, meal_type, keyword="", open_at=None, exclude_mask=0):
+    """기준 검색 - 소요시간 순 (같으면 DB 순서)"""
+    rows = _baseline_candidates(restaurants, max_budget, max_time_minutes, meal_type, keyword, open_at, exclude_mask)
+    return len(rows), sorted(rows, key=lambda row: (row[1], row[0]))
+
+
+def baseline_best_value(restaurants, max_budget, max_time_minutes, meal_type):
+    """기준 가성비 순위 - (예산 - 예산 내 평균 가격) / 소요시간 내림차순 (같으면 DB 순서)"""
+    rows = []
+    for i, minutes, count in _baseline_candidates(restaurants, max_budget, max_time_minutes, meal_type):
+        prices = sorted(_parse_price(menu.get("price")) for menu in restaurants[i]["menu"])[:count]
+        avg_price = sum(prices) / count
+        rows.append((i, minutes, count, avg_price, (max_budget - avg_price) / max(minutes, 1)))
+    return len(rows), sorted(rows, key=lambda row: (-row[4], row[0]))
+
+
+def test_backend_parity():
+    """모든 백엔드의 search / best_value 결과가 기준 구현과 동일 (페이지 조회 포함)"""
+    print("\n" + "="*80)
+    print(f"백엔드 검색 결과 일치 ({', '.join(BACKENDS)})")
+    print("="*80)
+
+    with open(DB_PATH, "r", encoding="utf-8") as f:
+        restaurants = json.load(f)
+
+    baseline_tags = [list(_menu_tags(r, sorted(r.get("menu") or [], key=lambda m: _parse_price(m.get("price"))))) for r in restaurants]
+    for backend in BACKENDS:
+        index = _open_backend(backend)
+        assert len(index) == len(restaurants)
+        assert [list(index.menu_tags[i]) for i in range(len(index))] == baseline_tags, backend   # 빌드 시 저장한 메뉴 태그
+
+        checked = 0
+        for budget, minutes, meal_type in itertools.product(BUDGETS, TIMES, MEAL_TYPES):
+            for keyword, open_at, exclude_mask in itertools.product(KEYWORDS, OPEN_ATS, EXCLUDE_MASKS):
+                query = (budget, minutes, meal_type, keyword)
+                expected = baseline_search(restaurants, *query, open_at, exclude_mask)
+                result = index.search(*query, limit=1000, open_at=open_at, exclude_mask=exclude_mask)
+                assert (result[0], list(result[1])) == expected, (backend, query, open_at, exclude_mask)
+                page = index.search(*query, limit=3, offset=2, open_at=open_at, exclude_mask=exclude_mask)
+                assert (page[0], list(page[1])) == (expected[0], expected[1][2:5]), (backend, query, "page")
+                checked += 1
+
+            expected = baseline_best_value(restaurants, budget, minutes, meal_type)
+            result = index.best_value(budget, minutes, meal_type, limit=1000)
+            assert (result[0], list(result[1])) == expected, (backend, budget, minutes, meal_type)
+            page = index.best_value(budget, minutes, meal_type, limit=2, offset=1)
+            assert (page[0], list(page[1])) == (expected[0], expected[1][1:3]), (backend, budget, minutes, meal_type)
+
+        print(f"✅ {backend}: 검색 {checked}개 조건 + 가성비 {len(BUDGETS) * len(TIMES) * len(MEAL_TYPES)}개 조건 일치")
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_backend_parity()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
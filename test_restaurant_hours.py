@@ -0,0 +1,120 @@
+"""
+식당 영업시간 파서 / open_at 필터 테스트
+"""
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from tools.restaurant_hours import WEEKDAYS, compile_schedule, describe_open_at, is_open, parse_open_at
+from tools.restaurant_sqlite import SQLiteRestaurantStore, build_sqlite_store
+from tools.restaurant_tools import DB_PATH, _get_restaurant_index, search_restaurants
+
+# 2026-10-18 (일요일, 셋째주) 정오 기준
+NOW = datetime(2026, 10, 18, 12, 0)
+
+# (영업시간, 휴무일, 확인 시간대, 기대 결과)
+CASES = [
+    ("영업시간:주중 09:00 ~ 18:00", None, "2026-10-12 12:00-13:00", True),           # 월요일 점심
+    ("영업시간:주중 09:00 ~ 18:00", None, "토 12:00-13:00", False),                   # 휴무일 정보 없으면 주중 = 월~금
+    ("영업시간:주중 11:00 ~ 22:00", "매주 월요일 휴무", "토 12:00-13:00", True),       # 휴무일 정보가 있으면 나머지 요일 영업
+    ("영업시간:주중 11:00 ~ 22:00", "매주 월요일 휴무", "일 12:00-13:00", True),
+    ("영업시간:주중 11:00 ~ 22:00", "매주 월요일 휴무", "월 12:00-13:00", False),
+    ("영업시간:주중 11:00 ~ 22:00", "정기휴무-매주(일,토)", "토 12:00-13:00", False),
+    ("영업시간:주중 11:00 ~ 22:00", "정기휴무-매월 둘째주(월)", "토 12:00-13:00", True),
+    ("영업시간:주중 09:00 ~ 18:00", "연휴-설날 전체,연휴-추석 당일", "토 12:00-13:00", True),
+    ("영업시간:주중 09:00 ~ 18:00 주말 10:00 ~ 15:00", "연중무휴", "토 16:00", False),  # 주말 시간이 따로 있음
+    ("영업시간:월,화,수 11:30 ~ 21:00", "연중무휴", "목 12:00", False),               # 요일을 직접 적으면 그대로
+    ("영업시간:주중 09:00 ~ 18:00", "연중무휴", "토 12:00-13:00", True),              # 연중무휴면 매일
+    ("영업시간:주중 09:00 ~ 18:00", None, "2026-10-12 17:30-18:30", False),          # 시간대 일부만 영업
+    ("영업시간:매일 18:00 ~ 06:00", None, "화 03:00–03:15", True),                   # 전날 밤부터 영업
+    ("영업시간:매일 18:00 ~ 06:00", None, "화 23:30–00:30", True),                   # 자정 넘는 시간대
+    ("영업시간:주중 00:00 ~ 00:00", "연중무휴", "일 04:00", True),                   # 24시간
+    ("영업시간:매일 12:00 ~ 00:00", None, "금 23:45-00:15", False),                  # 자정에 닫음
+    ("영업시간:매일 11:00 ~ 22:00", "매주 월요일 휴무", "월 12:00-13:00", False),
+    ("영업시간:매일 08:00 ~ 23:00", "정기휴무-매주(일,토)", "토 12:00-13:00", False),
+    ("영업시간:매일 08:00 ~ 23:00", "정기휴무-매주(일,토)", "금 12:00-13:00", True),
+    ("영업시간:매일 17:00 ~ 02:00", "정기휴무-매주(월)", "월 01:00", True),          # 일요일 영업분
+    ("영업시간:매일 17:00 ~ 02:00", "정기휴무-매주(월)", "화 01:00", False),         # 월요일 휴무분
+    ("영업시간:월,화,수,목,금,토 11:30 ~ 21:00", "정기휴무-매주(일)", "일 12:00", False),
+    ("영업시간:주중 10:00 ~ 22:00", "정기휴무-매월 둘째주(월)", "2026-10-12 12:00", False),
+    ("영업시간:주중 10:00 ~ 22:00", "정기휴무-매월 둘째주(월)", "2026-10-19 12:00", True),
+    ("영업시간:주중 10:00 ~ 22:00", "정기휴무-매월 둘째주(월)", "월 12:00", True),    # 날짜 모르면 매월 휴무 무시
+    ("영업시간:주말 12:00 ~ 02:00", None, "23:00–23:15, 03:00–03:15", True),          # 오늘(일) 23시 슬롯
+    (None, "연중무휴", "03:00", True),                                                # 정보 없음 -> 통과
+]
+
+
+def test_schedule_cases():
+    """영업시간/휴무일 문자열 해석"""
+    print("\n" + "="*80)
+    print("영업시간 비트맵 확인")
+    print("="*80)
+
+    for hours, holidays, window, expected in CASES:
+        open_at = parse_open_at(window, NOW)
+        result = is_open(compile_schedule(hours, holidays), open_at)
+        print(f"{'✅' if result == expected else '❌'} {hours} | {holidays} @ {describe_open_at(open_at)} → {result}")
+        assert result == expected, (hours, holidays, window)
+
+
+def test_parse_open_at():
+    """open_at 입력 형식"""
+    print("\n" + "="*80)
+    print("open_at 해석")
+    print("="*80)
+
+    assert describe_open_at(parse_open_at("23:00–23:15, 03:00–03:15", NOW)) == "일요일 23:00~23:15, 03:00~03:15"
+    assert describe_open_at(parse_open_at("토요일 12:00~13:00", NOW)) == "토요일 12:00~13:00"
+    assert parse_open_at("2026-10-12 12:00", NOW).week_of_month == 2
+    assert parse_open_at("2026-10-29 12:00", NOW).last_week
+    assert parse_open_at("아무때나", NOW) is None
+    assert parse_open_at("", NOW) is None
+    print("✅ open_at 형식 확인 완료")
+
+
+def test_search_open_at():
+    """search_restaurants open_at 필터 - 결과 식당은 모두 영업 중"""
+    print("\n" + "="*80)
+    print("메뉴 검색 open_at 필터 (소윤 야간 슬롯)")
+    print("="*80)
+
+    index = _get_restaurant_index()
+    open_at = parse_open_at("23:00–23:15", NOW)
+    total_all, _ = index.search(30000, 120, "배달", "", limit=1000)
+    total_open, rows = index.search(30000, 120, "배달", "", limit=1000, open_at=open_at)
+    assert 0 < total_open < total_all
+    assert all(index.is_open(i, open_at) for i, _, _ in rows)
+    print(f"✅ 전체 {total_all}개 중 영업 중 {total_open}개")
+
+    print(search_restaurants.run(max_budget=15000, max_time_minutes=15, open_at="23:00–23:15", limit=3))
+
+
+def test_sqlite_open_at():
+    """SQLite 저장소 open_at 필터 (빌드 시 저장한 영업 구간을 SQL로 비교) - 비트맵 확인과 같은 식당"""
+    print("\n" + "="*80)
+    print("SQLite 영업 구간 필터")
+    print("="*80)
+
+    index = _get_restaurant_index()
+    windows = [f"{day} {time}" for day in WEEKDAYS for time in ("03:00", "11:30-13:00", "17:50-18:10", "23:30-00:30")]
+    windows += ["2026-10-12 12:00", "2026-10-26 12:00-13:00", "2026-11-30 20:00", "23:00–23:15, 03:00–03:15"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SQLiteRestaurantStore(build_sqlite_store(DB_PATH, Path(tmp_dir) / "식당_DB.sqlite"))
+        for window in windows:
+            open_at = parse_open_at(window, NOW)
+            _, rows = store.search(100000, 999, "매장", limit=1000, open_at=open_at)
+            expected = [i for i, _, _ in index.search(100000, 999, "매장", limit=1000)[1] if index.is_open(i, open_at)]
+            assert sorted(i for i, _, _ in rows) == sorted(expected), window
+            print(f"✅ {describe_open_at(open_at)}: {len(rows)}개 영업 중")
+        store._conn().close()
+
+
+if __name__ == "__main__":
+    test_schedule_cases()
+    test_parse_open_at()
+    test_search_open_at()
+    test_sqlite_open_at()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
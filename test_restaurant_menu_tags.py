@@ -0,0 +1,102 @@
+"""
+메뉴 알레르기/식단 태그 테스트 - 사전 태깅과 search_restaurants exclude_allergens / diet 필터
+"""
+from tools.restaurant_menu_tags import menu_tag_mask, parse_exclusions, tag_names, tag_text
+from tools.restaurant_tools import _allowed_menus, _get_restaurant_index, search_restaurants
+
+# (메뉴명, 있어야 하는 태그, 없어야 하는 태그)
+CASES = [
+    ("해물탕", {"갑각류", "조개류", "해산물", "고염"}, set()),
+    ("족발 대", {"돼지고기", "육류", "고염"}, set()),
+    ("복수육(참복", {"생선"}, {"돼지고기"}),
+    ("고갈비", {"생선"}, {"육류"}),
+    ("탕수육 소", {"돼지고기", "밀", "고당"}, {"고염"}),
+    ("들깨칼국수", {"밀", "고염"}, set()),
+    ("찰순대국밥", {"돼지고기", "고염"}, set()),
+    ("비건 불고기 덮밥(콩단백)", {"대두"}, {"소고기", "육류"}),
+    ("GF 아몬드 크루아상", {"견과류", "유제품"}, {"밀"}),
+    ("저염 북어해장국", {"생선"}, {"고염"}),
+    ("알프레도파스타", {"유제품", "밀"}, set()),
+    ("오리백숙", {"육류"}, {"닭고기"}),
+    ("연어 스테이크", {"생선"}, {"소고기"}),
+    ("아메리카노", set(), {"유제품"}),
+    # 한 글자 단어는 단독으로 쓰였거나 등록된 합성어일 때만
+    ("회 (소)", {"생선"}, set()),
+    ("한치물회", {"생선", "연체류"}, set()),
+    ("밀면(물 / 비빔)", {"밀"}, set()),
+    ("콩나물국밥", {"대두", "고염"}, set()),
+    ("크런치 윙", {"닭고기"}, set()),
+    ("면세 특가 세트", set(), {"밀"}),
+    ("삼일회관 정식", set(), {"생선", "해산물"}),
+    ("능이버섯회", set(), {"생선"}),
+    ("렌틸콩 샐러드", set(), {"대두"}),
+    ("스윙칩", set(), {"닭고기"}),
+    ("육수 추가", set(), {"육류"}),
+    ("회오리감자", set(), {"육류"}),
+]
+
+
+def test_menu_tags():
+    """메뉴명 태깅"""
+    print("\n" + "="*80)
+    print("메뉴 태그")
+    print("="*80)
+
+    for name, expected, unexpected in CASES:
+        tags = set(tag_names(tag_text(name)))
+        ok = expected <= tags and not unexpected & tags
+        print(f"{'✅' if ok else '❌'} {name} → {', '.join(sorted(tags)) or '없음'}")
+        assert ok, (name, tags)
+
+    # 재료를 알 수 없는 메뉴는 식당 정보의 재료 태그를 물려받음 (음료 제외)
+    assert "생선" in tag_names(menu_tag_mask("4인", "명인횟집", "싱싱한 활어회 전문"))
+    assert "생선" not in tag_names(menu_tag_mask("콜라", "명인횟집", "싱싱한 활어회 전문"))
+    assert not tag_names(menu_tag_mask("정식", "돈수라", "들깨가루는 취향껏 넣어서 즐기면된다."))
+
+
+def test_parse_exclusions():
+    """사용자 알레르기/식단 문자열 해석"""
+    print("\n" + "="*80)
+    print("제외 조건 해석")
+    print("="*80)
+
+    assert parse_exclusions("갑각류")[1] == ["갑각류"]
+    assert parse_exclusions("유당불내증(우유·치즈·크림 주의)")[1] == ["유제품"]
+    assert parse_exclusions("새우, 땅콩")[1] == ["갑각류", "견과류"]
+    assert parse_exclusions("", "락토오보 (유제품과 계란은 가능, 고기와 생선은 불가)")[1] == ["해산물", "육류"]
+    assert parse_exclusions("", "비건")[1] == ["해산물", "유제품", "계란", "육류"]
+    assert parse_exclusions("없음", "")[0] == 0
+    print("✅ 제외 조건 해석 완료")
+
+
+def test_search_exclusions():
+    """search_restaurants 필터 - 남은 메뉴에 제외 태그가 없어야 함"""
+    print("\n" + "="*80)
+    print("메뉴 검색 알레르기/식단 필터 (소윤: 갑각류 / 저염)")
+    print("="*80)
+
+    index = _get_restaurant_index()
+    exclude_mask, _ = parse_exclusions("갑각류", "저염")
+    total_all, _ = index.search(30000, 120, "배달", "", limit=1000)
+    total, rows = index.search(30000, 120, "배달", "", limit=1000, exclude_mask=exclude_mask)
+    assert 0 < total < total_all
+    for i, _, affordable_count in rows:
+        menus = _allowed_menus(index, i, affordable_count, exclude_mask)
+        assert menus, index.restaurants[i].get("name")
+    print(f"✅ 전체 {total_all}개 중 {total}개 식당에 먹을 수 있는 메뉴가 있음")
+
+    result = search_restaurants.run(max_budget=20000, max_time_minutes=60, keyword="해물", exclude_allergens="갑각류", limit=3)
+    crustacean, _ = parse_exclusions("갑각류")
+    menus = [line.strip()[2:].rsplit(":", 1)[0] for line in result.splitlines() if line.startswith("  - ")]
+    assert menus and not any(tag_text(menu) & crustacean for menu in menus)
+    print(result)
+
+
+if __name__ == "__main__":
+    test_menu_tags()
+    test_parse_exclusions()
+    test_search_exclusions()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
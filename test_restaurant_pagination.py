@@ -0,0 +1,68 @@
+"""
+레스토랑 검색/추천 페이지 조회 테스트 - limit/offset으로 나눠 받은 결과가 전체 순위와 같은지 확인
+"""
+from tools.restaurant_tools import (
+    search_restaurants,
+    recommend_best_value_restaurants,
+    _get_restaurant_index
+)
+
+
+def test_search_pages():
+    """검색 결과를 페이지로 이어 붙이면 소요시간 순 전체 결과와 동일"""
+    print("\n" + "="*80)
+    print("검색 페이지 조회 (limit=7)")
+    print("="*80)
+
+    index = _get_restaurant_index()
+    total, full = index.search(30000, 120, "배달", "", limit=1000)
+    pages = []
+    for offset in range(0, total, 7):
+        page_total, rows = index.search(30000, 120, "배달", "", limit=7, offset=offset)
+        assert page_total == total, "페이지마다 전체 개수가 달라짐"
+        pages.extend(rows)
+
+    assert pages == full, "페이지 결과가 전체 순위와 다름"
+    assert full, "검색 결과 없음"
+    assert full == sorted(full, key=lambda row: (row[1], row[0])), "소요시간/DB 순서가 아님"
+    print(f"✅ {total}개 식당, {len(range(0, total, 7))}페이지 결과 일치")
+
+
+def test_best_value_pages():
+    """가성비 순위 페이지 조회 - 점수가 같으면 DB 순서"""
+    print("\n" + "="*80)
+    print("가성비 페이지 조회 (limit=3)")
+    print("="*80)
+
+    index = _get_restaurant_index()
+    total, full = index.best_value(30000, 120, "매장", limit=1000)
+    pages = index.best_value(30000, 120, "매장", limit=3)[1] + index.best_value(30000, 120, "매장", limit=1000, offset=3)[1]
+
+    assert pages == full, "페이지 결과가 전체 순위와 다름"
+    assert full == sorted(full, key=lambda row: (-row[4], row[0])), "가성비 점수/DB 순서가 아님"
+    print(f"✅ {total}개 식당 가성비 순위 일치")
+
+
+def test_tool_offset():
+    """도구 출력 - 순번이 offset 다음부터 시작하고 범위를 벗어나면 안내"""
+    print("\n" + "="*80)
+    print("도구 offset 출력")
+    print("="*80)
+
+    result = search_restaurants.run(max_budget=30000, max_time_minutes=120, meal_type="배달", limit=3, offset=3)
+    assert "### 4." in result and "### 7." not in result
+    print(result)
+
+    result = recommend_best_value_restaurants.run(max_budget=30000, max_time_minutes=120, offset=10000)
+    assert "결과가 없습니다" in result
+    print(result)
+
+
+if __name__ == "__main__":
+    test_search_pages()
+    test_best_value_pages()
+    test_tool_offset()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
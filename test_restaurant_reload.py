@@ -0,0 +1,331 @@
+"""
+식당 DB 검색 캐시 / 재로드 테스트 - 검색 결과 LRU가 DB 재로드 시 비워지고,
+재로드 도중에도 검색이 한 버전의 데이터로만 수행되는지 확인
+(임시 폴더에 복사한 식당_DB.json 사용)
+"""
+import copy
+import json
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from pathlib import Path
+from unittest import mock
+
+from tools import restaurant_tools
+from tools.restaurant_tools import (
+    DB_PATH,
+    _get_restaurant_index,
+    _search_candidates,
+    get_search_cache_stats,
+    reload_restaurant_db,
+)
+from tools.restaurant_snapshot import SnapshotRestaurantIndex, build_snapshot
+from tools.restaurant_sqlite import SCHEMA_VERSION, SQLiteRestaurantStore, open_sqlite_store
+
+# 검색 조건 (예산, 시간, meal_type)
+QUERY = (30000, 120, "배달")
+
+# 재로드 중 동시 검색 시간 (초)
+SWAP_TEST_SECONDS = 3
+
+with open(DB_PATH, "r", encoding="utf-8") as f:
+    RESTAURANTS = json.load(f)
+
+# 가격/소요시간은 같고 설명만 다른 버전 (검색 캐시 키가 원본과 같음)
+EDITED_RESTAURANTS = copy.deepcopy(RESTAURANTS)
+for _restaurant in EDITED_RESTAURANTS:
+    _restaurant["desc"] = (_restaurant.get("desc") or "").replace("해물", "")
+
+_patches = ExitStack()
+_db_path = None
+_tmp_dir = None
+
+
+def setup_module():
+    """식당 DB 경로와 인덱스/캐시 전역을 임시 값으로 교체"""
+    global _db_path, _tmp_dir
+    _tmp_dir = tmp_dir = Path(_patches.enter_context(tempfile.TemporaryDirectory()))
+    _db_path = tmp_dir / "식당_DB.json"
+    _write_db(RESTAURANTS)
+    _patches.enter_context(mock.patch.multiple(
+        restaurant_tools,
+        DB_PATH=_db_path,
+        SNAPSHOT_PATH=tmp_dir / "식당_DB.snapshot",
+        SQLITE_PATH=tmp_dir / "식당_DB.sqlite",
+        RESTAURANT_BACKEND="memory",
+        RESTAURANT_DB_WATCH_INTERVAL=0,
+        _restaurant_db=None,
+        _restaurant_index=None,
+        _restaurant_db_signature=None,
+        _failed_db_signature=None,
+        _search_cache=OrderedDict(),
+        _search_cache_stats={"hits": 0, "misses": 0},
+    ))
+
+
+def teardown_module():
+    _patches.close()
+
+
+def _write_db(restaurants):
+    """식당 DB 파일 쓰기 (같은 폴더 임시 파일에 쓴 뒤 교체)"""
+    tmp_path = _db_path.with_name(_db_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(restaurants, ensure_ascii=False), encoding="utf-8")
+    tmp_path.replace(_db_path)
+
+
+def test_search_cache():
+    """같은 조건 재검색은 캐시 적중, 크기 상한을 넘으면 오래된 조건부터 제거"""
+    print("\n" + "="*80)
+    print("검색 결과 LRU 캐시")
+    print("="*80)
+
+    reload_restaurant_db()
+    index = _get_restaurant_index()
+    first = _search_candidates(index, *QUERY)
+    assert _search_candidates(index, *QUERY) is first
+    stats = get_search_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1), stats
+
+    # 예산이 다음 메뉴 가격에 못 미치면 같은 캐시 항목 사용
+    assert _search_candidates(index, QUERY[0] + 1, *QUERY[1:]) is first
+
+    with mock.patch.object(restaurant_tools, "SEARCH_CACHE_SIZE", 3):
+        for keyword in ["국", "해물", "족발", "칼국수"]:
+            _search_candidates(index, *QUERY, keyword)
+        assert get_search_cache_stats()["size"] == 3
+        misses = get_search_cache_stats()["misses"]
+        _search_candidates(index, *QUERY, "국")  # 가장 오래된 항목은 제거됨
+        assert get_search_cache_stats()["misses"] == misses + 1
+    print(f"✅ 캐시 통계: {get_search_cache_stats()}")
+
+
+def test_reload_clears_cache():
+    """재로드하면 캐시가 비고, 이후 검색은 새 데이터 기준"""
+    print("\n" + "="*80)
+    print("재로드 시 검색 캐시 초기화")
+    print("="*80)
+
+    reload_restaurant_db()
+    old_index = _get_restaurant_index()
+    old_total = len(_search_candidates(old_index, *QUERY))
+    assert get_search_cache_stats()["size"] == 1
+
+    _write_db(RESTAURANTS[:40])
+    assert reload_restaurant_db(force=False)
+    assert not reload_restaurant_db(force=False)  # 바뀌지 않았으면 재로드 안 함
+    assert get_search_cache_stats()["size"] == 0
+
+    index = _get_restaurant_index()
+    assert index is not old_index and len(index) == 40
+    rows = _search_candidates(index, *QUERY)
+    assert rows == index.candidates(*QUERY) and len(rows) < old_total
+    print(f"✅ 재로드 전 {old_total}개 → 재로드 후 {len(rows)}개 후보")
+
+    _write_db(RESTAURANTS)
+    reload_restaurant_db(force=False)
+
+
+def test_old_index_skips_cache():
+    """재로드 전 인덱스로 진행 중인 검색은 새 인덱스가 채운 캐시 항목을 쓰지 않음"""
+    print("\n" + "="*80)
+    print("이전 인덱스 검색과 검색 캐시")
+    print("="*80)
+
+    reload_restaurant_db()
+    old_index = _get_restaurant_index()
+    _write_db(EDITED_RESTAURANTS)
+    assert reload_restaurant_db(force=False)
+    index = _get_restaurant_index()
+
+    query = QUERY + ("해물",)
+    assert old_index.query_key(*query) == index.query_key(*query)
+    new_rows = _search_candidates(index, *query)
+    old_rows = _search_candidates(old_index, *query)
+    assert old_rows == old_index.candidates(*QUERY, old_index.keyword_matches("해물"))
+    assert len(old_rows) > len(new_rows)
+    assert _search_candidates(index, *query) is new_rows
+    print(f"✅ 이전 인덱스 {len(old_rows)}개 / 새 인덱스 {len(new_rows)}개 후보")
+
+    _write_db(RESTAURANTS)
+    reload_restaurant_db(force=False)
+
+
+def test_reload_keeps_data_on_error():
+    """쓰다 만 JSON은 재로드하지 않고 기존 데이터 유지 (같은 버전은 다시 시도하지 않음)"""
+    print("\n" + "="*80)
+    print("재로드 실패 시 기존 데이터 유지")
+    print("="*80)
+
+    reload_restaurant_db()
+    index = _get_restaurant_index()
+    _db_path.write_text(json.dumps(RESTAURANTS, ensure_ascii=False)[:1000], encoding="utf-8")
+    assert not reload_restaurant_db(force=False)
+    assert _get_restaurant_index() is index
+    with mock.patch.object(restaurant_tools, "_build_restaurant_index", side_effect=AssertionError("재시도함")):
+        assert not reload_restaurant_db(force=False)
+
+    _write_db(RESTAURANTS)
+    assert reload_restaurant_db(force=False)
+    assert len(_get_restaurant_index()) == len(RESTAURANTS)
+    print("✅ 손상된 파일 무시, 복구된 파일 재로드")
+
+
+def test_hot_reload_during_search():
+    """검색과 재로드를 동시에 - 검색 결과는 항상 검색에 사용한 인덱스 버전의 결과와 일치"""
+    print("\n" + "="*80)
+    print(f"재로드 중 동시 검색 ({SWAP_TEST_SECONDS}초)")
+    print("="*80)
+
+    versions = [RESTAURANTS, RESTAURANTS[:40], EDITED_RESTAURANTS[:-1], RESTAURANTS[30:]]
+    queries = [QUERY + (keyword,) for keyword in ["", "국", "해물"]]
+    expected = {}
+    for restaurants in versions:
+        index = restaurant_tools.RestaurantIndex(restaurants)
+        expected[len(index)] = {query: index.search(*query, limit=1000) for query in queries}
+
+    reload_restaurant_db()
+    stop = threading.Event()
+    errors = []
+    counts = {"searches": 0, "reloads": 0}
+
+    def searcher():
+        while not stop.is_set():
+            for query in queries:
+                index = _get_restaurant_index()
+                result = index.search(*query, limit=1000)
+                if result != expected[len(index)][query]:
+                    errors.append((len(index), query))
+                counts["searches"] += 1
+
+    def reloader():
+        k = 0
+        while not stop.is_set():
+            k += 1
+            _write_db(versions[k % len(versions)])
+            counts["reloads"] += reload_restaurant_db(force=False)
+
+    threads = [threading.Thread(target=searcher) for _ in range(4)] + [threading.Thread(target=reloader)]
+    for thread in threads:
+        thread.start()
+    time.sleep(SWAP_TEST_SECONDS)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, f"다른 버전의 검색 결과 {len(errors)}건: {errors[:3]}"
+    assert counts["reloads"] > 1
+    print(f"✅ 재로드 {counts['reloads']}회 중 검색 {counts['searches']}회 모두 일치")
+
+    _write_db(RESTAURANTS)
+    reload_restaurant_db(force=False)
+
+
+def test_stale_snapshot_rebuilt():
+    """식당_DB.json이 바뀌면 오래된 스냅샷 대신 JSON을 사용하고 스냅샷을 새 데이터로 다시 저장"""
+    print("\n" + "="*80)
+    print("오래된 스냅샷 다시 빌드")
+    print("="*80)
+
+    snapshot_path = _tmp_dir / "식당_DB.snapshot"
+    try:
+        build_snapshot(_db_path, snapshot_path)
+        reload_restaurant_db()
+        assert type(_get_restaurant_index()) is SnapshotRestaurantIndex
+
+        _write_db(RESTAURANTS[:40])
+        assert reload_restaurant_db(force=False)
+        index = _get_restaurant_index()
+        assert type(index) is restaurant_tools.RestaurantIndex and len(index) == 40
+        assert SnapshotRestaurantIndex(snapshot_path).source_signature == restaurant_tools._db_signature()
+
+        reload_restaurant_db()   # 다음 로드부터 새 스냅샷 사용
+        index = _get_restaurant_index()
+        assert type(index) is SnapshotRestaurantIndex and len(index) == 40
+        assert index.search(*QUERY, limit=1000) == restaurant_tools.RestaurantIndex(RESTAURANTS[:40]).search(*QUERY, limit=1000)
+        print("✅ 원본 변경 후 스냅샷 재생성, 재로드 시 새 스냅샷 사용")
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+        _write_db(RESTAURANTS)
+        reload_restaurant_db(force=False)
+
+
+def test_stale_sqlite_rebuilt():
+    """sqlite 백엔드 - 식당_DB.json이 바뀌면 SQLite DB를 다시 빌드해 새 데이터로 검색"""
+    print("\n" + "="*80)
+    print("오래된 SQLite DB 다시 빌드")
+    print("="*80)
+
+    sqlite_path = _tmp_dir / "식당_DB.sqlite"
+    try:
+        with mock.patch.object(restaurant_tools, "RESTAURANT_BACKEND", "sqlite"):
+            reload_restaurant_db()
+            store = _get_restaurant_index()
+            assert type(store) is SQLiteRestaurantStore and len(store) == len(RESTAURANTS)
+
+            _write_db(RESTAURANTS[:40])
+            assert reload_restaurant_db(force=False)
+            store = _get_restaurant_index()
+            assert type(store) is SQLiteRestaurantStore and len(store) == 40
+            assert store.source_signature == restaurant_tools._db_signature()
+            assert SQLiteRestaurantStore(sqlite_path).source_signature == store.source_signature
+            assert store.search(*QUERY, limit=1000) == restaurant_tools.RestaurantIndex(RESTAURANTS[:40]).search(*QUERY, limit=1000)
+        print("✅ 원본 변경 후 SQLite DB 재생성")
+    finally:
+        sqlite_path.unlink(missing_ok=True)
+        _write_db(RESTAURANTS)
+        reload_restaurant_db(force=False)
+
+
+def test_old_format_rebuilt():
+    """저장 형식 버전이 다른 스냅샷/SQLite 파일은 원본이 같아도 다시 빌드"""
+    print("\n" + "="*80)
+    print("이전 형식 파일 다시 빌드")
+    print("="*80)
+
+    signature = restaurant_tools._db_signature()
+    snapshot_path = _tmp_dir / "식당_DB.snapshot"
+    sqlite_path = _tmp_dir / "식당_DB.sqlite"
+    try:
+        build_snapshot(_db_path, snapshot_path)
+        with open(snapshot_path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", 1))   # 헤더 version
+        reload_restaurant_db()
+        assert type(_get_restaurant_index()) is restaurant_tools.RestaurantIndex
+        assert SnapshotRestaurantIndex(snapshot_path).source_signature == signature
+
+        open_sqlite_store(sqlite_path, signature, _db_path)
+        with sqlite3.connect(sqlite_path) as conn:
+            conn.execute("UPDATE meta SET value = '1' WHERE key = 'schema_version'")
+        conn.close()
+        assert SQLiteRestaurantStore(sqlite_path).schema_version == 1
+        assert open_sqlite_store(sqlite_path, signature, _db_path).schema_version == SCHEMA_VERSION
+        print("✅ 스냅샷 / SQLite DB 형식 버전 확인 후 재생성")
+    finally:
+        snapshot_path.unlink(missing_ok=True)
+        sqlite_path.unlink(missing_ok=True)
+        reload_restaurant_db()
+
+
+if __name__ == "__main__":
+    setup_module()
+    try:
+        test_search_cache()
+        test_reload_clears_cache()
+        test_old_index_skips_cache()
+        test_reload_keeps_data_on_error()
+        test_hot_reload_during_search()
+        test_stale_snapshot_rebuilt()
+        test_stale_sqlite_rebuilt()
+        test_old_format_rebuilt()
+    finally:
+        teardown_module()
+
+    print("\n" + "="*80)
+    print("✅ 모든 테스트 완료!")
+    print("="*80)
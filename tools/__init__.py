@@ -17,7 +17,8 @@ if USE_NOTION_MCP:
         get_meal_history,
         get_user_preferences,
         get_user_schedule,
-        get_budget_status
+        get_budget_status,
+        get_user_context
     )
 else:
     print("📦 Mock 데이터 모드 활성화")
@@ -25,7 +26,8 @@ else:
         get_meal_history,
         get_user_preferences,
         get_user_schedule,
-        get_budget_status
+        get_budget_status,
+        get_user_context
     )
 
 # Recipe generation tools
@@ -49,7 +51,8 @@ from .restaurant_tools import (
 # LLM Judge tools
 from .llm_judge_tools import (
     judge_menu_personalization,
-    judge_restaurant_recommendations
+    judge_restaurant_recommendations,
+    judge_menus_batch
 )
 
 __all__ = [
@@ -57,6 +60,7 @@ __all__ = [
     'get_user_preferences',
     'get_user_schedule',
     'get_budget_status',
+    'get_user_context',
     'generate_recipe_with_ai',
     'analyze_user_intent',
     'plan_workflow',
@@ -65,4 +69,5 @@ __all__ = [
     'recommend_best_value_restaurants',
     'judge_menu_personalization',
     'judge_restaurant_recommendations',
+    'judge_menus_batch',
 ]
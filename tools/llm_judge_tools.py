@@ -3,9 +3,555 @@ LLM as Judge - 개인화 적합성 판단 도구
 각 에이전트가 추천한 메뉴가 사용자 페르소나에 적합한지 LLM이 판단
 """
 from crewai.tools import tool
-from typing import List, Dict, Any, Optional, Annotated, Union
+from typing import List, Dict, Any, Optional, Annotated, Union, NamedTuple, Tuple
 from pydantic import Field
+import hashlib
 import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from llm_client import chat_completion
+
+from tools.restaurant_menu_tags import INGREDIENT_MASK, diet_terms, menu_tag_mask, parse_exclusions, tag_names, tag_text
+
+
+# ============================================================
+# 규칙 기반 사전 판정 (확실한 부적합만 확정, 나머지는 LLM 판단)
+# ============================================================
+# 규칙으로 확정한 판정 / 캐시에서 찾은 판정 / LLM에 넘긴 판정 수 (병렬 크루 스레드에서 갱신)
+_judge_stats = {"rule": 0, "cache": 0, "llm": 0}
+_judge_stats_lock = threading.Lock()
+
+# 제외 사유 태그별 대안 (처음 걸린 태그 기준)
+TAG_ALTERNATIVES = {
+    "갑각류": "새우·게가 없는 생선 요리, 두부 요리",
+    "조개류": "조개가 없는 생선 요리, 두부 요리",
+    "생선": "두부, 계란, 채소 요리",
+    "연체류": "오징어·낙지가 없는 생선 요리, 두부 요리",
+    "해산물": "두부, 계란, 채소 요리",
+    "유제품": "유제품이 없는 한식, 두유 등 식물성 대체 메뉴",
+    "계란": "계란이 없는 두부·채소 요리",
+    "밀": "밥, 쌀국수 등 밀가루가 없는 메뉴",
+    "대두": "콩·두부가 없는 메뉴",
+    "견과류": "견과류가 없는 메뉴",
+    "메밀": "메밀이 없는 메뉴",
+    "돼지고기": "닭가슴살, 생선, 두부 요리",
+    "소고기": "닭가슴살, 생선, 두부 요리",
+    "닭고기": "생선, 두부 요리",
+    "육류": "두부, 샐러드, 채소 요리",
+    "고당": "찜 요리, 구이, 샐러드 등 당이 적은 메뉴",
+    "고염": "찜 요리, 구이, 샐러드 등 싱겁게 조리한 메뉴",
+}
+
+# 요일별 식단 ("평일 락토오보, 주말 페스코")
+WEEKDAY_GROUPS = ("평일", "주중")
+_DAY_GROUP = re.compile(r"(평일|주중|주말)")
+
+_ALLERGY_FIELD = re.compile(r"알레르기[^:：\n]*[:：]\s*([^\n]+)")
+_ALLERGY_SUFFIX = re.compile(r"([^\s,.|:：*]+)\s*알레르기")
+_DISLIKE_FIELD = re.compile(r"(?:싫어하는\s*음식|기피\s*음식|비선호)[^:：\n]*[:：]\s*([^\n]+)")
+_DISLIKE_SUFFIX = re.compile(r"([가-힣A-Za-z]+)(?:\s*식감)?\s*기피")
+_LIST_SEPARATOR = re.compile(r"\s*[,/、]\s*")
+_ITEM_PREFIX = re.compile(r"^\s*(?:[-*•]+|\d+[.)])\s*")
+_MARKDOWN = re.compile(r"\*\*|__|`")
+
+
+class Constraint(NamedTuple):
+    """제외 태그 마스크와 출처 ("알레르기: 갑각류", "식이 제한: 락토오보" 등)"""
+    mask: int
+    label: str
+    cross_contact: bool = False  # 알레르기 - 메뉴명에 재료가 있어도 식당 이름의 재료까지 확인
+
+
+class PersonaRules(NamedTuple):
+    """규칙 판정에 쓰는 페르소나 제한"""
+    required: Tuple[Constraint, ...]     # 항상 지켜야 하는 제한
+    conditional: Tuple[Constraint, ...]  # 요일에 따라 달라지는 제한 (LLM 판단)
+    dislikes: Tuple[str, ...]
+
+
+class MenuVerdict(NamedTuple):
+    """메뉴 1개 판정 결과 (suitable이 None이면 LLM 판단 필요)"""
+    menu: str
+    suitable: Optional[bool]
+    reason: str = ""
+    alternative: str = ""
+    source: str = "rule"  # "rule" 또는 "llm"
+
+
+def _as_list(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item for item in _LIST_SEPARATOR.split(value.strip()) if item]
+    return [str(item) for item in value if item]
+
+
+def _diet_constraints(lines: List[Tuple[Optional[str], str]], label: str) -> Tuple[List[Constraint], List[Constraint]]:
+    """
+    (요일 묶음, 식단 표현) 목록 -> (항상 적용할 제한, 요일별 제한)
+
+    평일과 주말 제한이 모두 있으면 공통 태그만 항상 적용하고 나머지는 요일별 제한으로 남깁니다.
+    """
+    required, day_masks, day_terms = [], {}, []
+    for day, text in lines:
+        terms = diet_terms(text)
+        if not terms:
+            continue
+        mask = parse_exclusions("", text)[0]
+        if day is None:
+            required.append(Constraint(mask, f"{label}: {'·'.join(terms)}"))
+        else:
+            group = "평일" if day in WEEKDAY_GROUPS else "주말"
+            day_masks[group] = day_masks.get(group, 0) | mask
+            day_terms.append(f"{day} {'·'.join(terms)}")
+    if not day_masks:
+        return required, []
+
+    day_label = f"{label}: {', '.join(day_terms)}"
+    union = common = 0
+    for mask in day_masks.values():
+        union |= mask
+    if len(day_masks) == 2:
+        common = day_masks["평일"] & day_masks["주말"]
+        required.append(Constraint(common, day_label))
+    return required, [Constraint(union & ~common, day_label)]
+
+
+def _split_days(text: str) -> List[Tuple[Optional[str], str]]:
+    """줄마다 요일 묶음 표현 앞뒤로 나눔: "채식, 평일 락토오보" -> [(None, "채식, "), ("평일", " 락토오보")]"""
+    parts = []
+    for line in (text or "").splitlines():
+        pieces = _DAY_GROUP.split(line)
+        parts.append((None, pieces[0]))
+        parts.extend(zip(pieces[1::2], pieces[2::2]))
+    return parts
+
+
+def parse_persona_rules(user_persona_info: Union[str, dict]) -> PersonaRules:
+    """
+    페르소나 정보 -> 규칙 판정용 제한
+
+    Notion 선호도 dict(allergies, dislikes, health_conditions, dietary_restrictions)나
+    사용자 컨텍스트 텍스트("- 알레르기: 갑각류", "채식주의자 (락토오보)" 등)를 모두 받습니다.
+    """
+    required, conditional, dislikes = [], [], []
+
+    if isinstance(user_persona_info, dict):
+        prefs = user_persona_info.get("preferences") or user_persona_info
+        for allergy in _as_list(prefs.get("allergies")):
+            required.append(Constraint(parse_exclusions(allergy)[0], f"알레르기: {allergy}", True))
+        for condition in _as_list(prefs.get("health_conditions")):
+            required.extend(_diet_constraints([(None, condition)], "건강 상태")[0])
+        restrictions = prefs.get("dietary_restrictions") or prefs.get("diet_type") or {}
+        if isinstance(restrictions, dict):
+            if restrictions.get("raw"):
+                restriction_lines = _split_days(restrictions["raw"])
+            else:
+                restriction_lines = [
+                    (_DAY_GROUP.match(day).group() if _DAY_GROUP.match(day) else None, str(text))
+                    for day, text in restrictions.items()
+                ]
+        else:
+            restriction_lines = _split_days(str(restrictions))
+        day_required, conditional = _diet_constraints(restriction_lines, "식이 제한")
+        required.extend(day_required)
+        dislikes = _as_list(prefs.get("dislikes"))
+    else:
+        text = str(user_persona_info or "")
+        for match in _ALLERGY_FIELD.finditer(text):
+            mask, names = parse_exclusions(match.group(1))
+            if mask:
+                required.append(Constraint(mask, f"알레르기: {', '.join(names)}", True))
+        for match in _ALLERGY_SUFFIX.finditer(text):
+            mask, names = parse_exclusions(match.group(1))
+            if mask:
+                required.append(Constraint(mask, f"알레르기: {', '.join(names)}", True))
+        day_required, conditional = _diet_constraints(_split_days(text), "식이·건강 제한")
+        required.extend(day_required)
+        for match in _DISLIKE_FIELD.finditer(text):
+            dislikes.extend(item for item in _as_list(match.group(1)) if item != "없음")
+        dislikes.extend(match.group(1) for match in _DISLIKE_SUFFIX.finditer(text))
+
+    return PersonaRules(
+        required=tuple(c for c in required if c.mask),
+        conditional=tuple(c for c in conditional if c.mask),
+        dislikes=tuple(dict.fromkeys(d.strip() for d in dislikes if d.strip())),
+    )
+
+
+def _dislike_hit(menu: str, dislike: str) -> bool:
+    """기피 음식 포함 여부 ("버섯 식감" -> 버섯이 들어간 메뉴)"""
+    compact_menu = re.sub(r"\s+", "", menu)
+    core = dislike.split()[0] if dislike.split() else dislike
+    return (len(core) >= 2 and core in compact_menu) or re.sub(r"\s+", "", dislike) in compact_menu
+
+
+def clean_menu_item(line: str) -> str:
+    """목록 기호/마크다운 제거: "1. **원조장충왕족발** - 족발" -> "원조장충왕족발 - 족발\""""
+    return _ITEM_PREFIX.sub("", _MARKDOWN.sub("", line)).strip()
+
+
+def rule_judge_menu(menu: str, rules: PersonaRules) -> MenuVerdict:
+    """
+    메뉴 1개 규칙 판정 - 부적합만 확정
+
+    - 알레르기/식이 제한/건강 제한 태그나 기피 음식이 있으면 부적합 확정
+    - 알레르기는 식당 이름의 재료도 확인 ("짬뽕집 - 탕수육" -> 갑각류 교차 오염)
+    - 그 외 (태그에 없는 재료, 요일별 제한, 칼로리 목표 등)는 모두 LLM 판단 (suitable=None)
+    """
+    restaurant, _, menu_name = menu.rpartition(" - ")
+    mask = menu_tag_mask(menu_name, restaurant or None)
+    restaurant_mask = tag_text(restaurant) & INGREDIENT_MASK if restaurant else 0
+
+    for constraint in rules.required:
+        hit = mask & constraint.mask
+        if hit:
+            names = tag_names(hit)
+            return MenuVerdict(
+                menu, False,
+                f"{menu_name} - {', '.join(names)} 포함으로 '{constraint.label}'에 맞지 않습니다.",
+                TAG_ALTERNATIVES.get(names[0], "")
+            )
+        hit = restaurant_mask & constraint.mask if constraint.cross_contact else 0
+        if hit:
+            names = tag_names(hit)
+            return MenuVerdict(
+                menu, False,
+                f"{menu_name} - {restaurant}의 {', '.join(names)} 재료와 섞일 수 있어 '{constraint.label}'에 맞지 않습니다.",
+                TAG_ALTERNATIVES.get(names[0], "")
+            )
+    for dislike in rules.dislikes:
+        if _dislike_hit(menu_name, dislike):
+            return MenuVerdict(menu, False, f"{menu_name} - 싫어하는 음식({dislike})이 들어간 메뉴입니다.", f"{dislike} 없는 메뉴")
+    return MenuVerdict(menu, None)
+
+
+def record_judge_route(route: str, count: int = 1):
+    """판정 경로 기록 ("rule", "cache" 또는 "llm")"""
+    with _judge_stats_lock:
+        _judge_stats[route] = _judge_stats.get(route, 0) + count
+
+
+def get_judge_stats() -> dict:
+    """판정 경로 통계 (LLM 없이 확정한 비율 포함)"""
+    with _judge_stats_lock:
+        stats = dict(_judge_stats)
+    total = stats["rule"] + stats["cache"] + stats["llm"]
+    return {
+        **stats,
+        "total": total,
+        "rule_ratio": stats["rule"] / total if total else 0.0,
+        "cache_ratio": stats["cache"] / total if total else 0.0,
+        "no_llm_ratio": (stats["rule"] + stats["cache"]) / total if total else 0.0
+    }
+
+
+def format_verdict(verdict: MenuVerdict) -> str:
+    """판정 결과를 LLM 판정과 같은 형식으로 표시"""
+    lines = [f"**{verdict.menu}**", "✅ **적합**" if verdict.suitable else "❌ **부적합**", f"**이유:** {verdict.reason}"]
+    if not verdict.suitable and verdict.alternative:
+        lines.append(f"**대안:** {verdict.alternative}")
+    return "\n".join(lines)
+
+# ============================================================
+# 판정 캐시 (페르소나 지문 + 식당/메뉴 -> LLM 판정, 프로세스 간 공유)
+# ============================================================
+# 빈 문자열이면 캐시 사용 안 함
+JUDGE_CACHE_PATH = os.getenv("JUDGE_CACHE_PATH", str(Path(__file__).parent.parent / "data" / "judge_verdicts.sqlite"))
+JUDGE_CACHE_TTL_HOURS = float(os.getenv("JUDGE_CACHE_TTL_HOURS", "168"))
+
+VERDICT_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    persona TEXT,                     -- persona_fingerprint()
+    menu_key TEXT,                    -- menu_key()
+    menu TEXT,
+    suitable INTEGER,
+    reason TEXT,
+    alternative TEXT,
+    created_at REAL,
+    PRIMARY KEY (persona, menu_key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS personas (
+    user TEXT PRIMARY KEY,            -- Notion 사용자 이름
+    fingerprint TEXT,                 -- 마지막으로 조회한 선호도의 지문
+    updated_at REAL
+);
+"""
+
+_PRICE_SUFFIX = re.compile(r"\s*[:：]?\s*₩?\s*[\d,]+\s*원?\s*$")
+
+
+# 판정에 영향을 주는 선호도 항목 (format_user_context 항목명 -> 지문 필드)
+PERSONA_FIELD_LABELS = {
+    "알레르기": "allergies",
+    "싫어하는음식": "dislikes",
+    "기피음식": "dislikes",
+    "비선호": "dislikes",
+    "건강상태": "health",
+    "식이제한": "diet",
+    "다이어트목표": "goal",
+}
+# 판정과 무관한 컨텍스트 항목 / 섹션
+CONTEXT_ONLY_LABELS = ("선호음식", "매운맛")
+CONTEXT_ONLY_SECTIONS = ("[일정]", "[예산]", "[최근 식단]")
+_FIELD_LINE = re.compile(r"^([^:：]{1,20})[:：]\s*(.*)$")
+
+
+def _normalized_values(values) -> List[str]:
+    """공백·대소문자를 무시한 항목 목록 ("없음" 제외, 정렬)"""
+    items = {
+        re.sub(r"\s+", "", _MARKDOWN.sub("", item)).lower()
+        for value in _as_list(values) for item in _as_list(value)
+    }
+    return sorted(item for item in items if item and item != "없음")
+
+
+def persona_fields(user_persona_info: Union[str, dict]) -> Dict[str, List[str]]:
+    """
+    판정에 영향을 주는 페르소나 항목 원문 (알레르기·기피 음식·건강 상태·식단·목표 + 기타)
+
+    규칙 판정이 인식하지 못하는 값("알레르기: 복숭아", "통풍")도 그대로 남깁니다.
+    텍스트는 format_user_context 항목명으로 나누고, 항목명이 없는 줄은 "other"에 모읍니다.
+    """
+    fields = {"allergies": [], "dislikes": [], "health": [], "diet": [], "goal": [], "other": []}
+    if isinstance(user_persona_info, dict):
+        prefs = user_persona_info.get("preferences") or user_persona_info
+        restrictions = prefs.get("dietary_restrictions") or prefs.get("diet_type") or {}
+        if isinstance(restrictions, dict):
+            restrictions = restrictions.get("raw") or [f"{day} {text}" for day, text in restrictions.items()]
+        fields["allergies"] = _as_list(prefs.get("allergies"))
+        fields["dislikes"] = _as_list(prefs.get("dislikes"))
+        fields["health"] = _as_list(prefs.get("health_conditions"))
+        fields["diet"] = _as_list(restrictions)
+        fields["goal"] = [prefs.get("diet_goal") or ""]
+    else:
+        skip_section = False
+        for line in str(user_persona_info or "").splitlines():
+            line = clean_menu_item(line)
+            if not line or line.startswith("==="):
+                continue
+            if line.startswith("["):
+                skip_section = line.startswith(CONTEXT_ONLY_SECTIONS)
+                continue
+            if skip_section:
+                continue
+            match = _FIELD_LINE.match(line)
+            label = re.sub(r"\s+", "", match.group(1)) if match else ""
+            field = next((name for key, name in PERSONA_FIELD_LABELS.items() if label.startswith(key)), None)
+            if field:
+                fields[field].append(match.group(2))
+            elif not label.startswith(CONTEXT_ONLY_LABELS):
+                fields["other"].append(line)
+    return {name: _normalized_values(values) for name, values in fields.items()}
+
+
+def day_group(now: Optional[datetime] = None) -> str:
+    """오늘의 요일 묶음 ("평일" 또는 "주말")"""
+    return "주말" if (now or datetime.now()).weekday() >= 5 else "평일"
+
+
+def persona_fingerprint(user_persona_info: Union[str, dict], now: Optional[datetime] = None) -> str:
+    """
+    판정에 영향을 주는 페르소나 항목 원문(persona_fields)의 해시
+
+    같은 선호도라면 dict / format_user_context 텍스트 형태가 달라도 같은 지문이 됩니다.
+    요일별 식단("평일 락토오보")이 있으면 오늘의 요일 묶음을 붙입니다: "<해시>@주말"
+    """
+    fields = persona_fields(user_persona_info)
+    payload = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    fingerprint = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+    if any(_DAY_GROUP.search(value) for values in fields.values() for value in values):
+        fingerprint += f"@{day_group(now)}"
+    return fingerprint
+
+
+def menu_key(menu: str) -> str:
+    """식당/메뉴 정규화: "원조장충왕족발 - 족발 세트: 15,000원" -> "원조장충왕족발|족발세트\""""
+    restaurant, _, name = clean_menu_item(menu).rpartition(" - ")
+    normalize = lambda text: re.sub(r"[^0-9a-z가-힣]", "", text.lower())
+    return f"{normalize(restaurant)}|{normalize(_PRICE_SUFFIX.sub('', name))}"
+
+
+class VerdictCache:
+    """
+    SQLite 판정 캐시 - (페르소나 지문, 메뉴 키) -> LLM 판정
+
+    - 스레드마다 연결을 따로 열고 WAL 모드로 여러 프로세스가 같은 파일을 공유
+    - TTL이 지난 판정은 조회하지 않고, 프로세스에서 처음 열 때 삭제
+    - 사용자 선호도 지문이 바뀌면 이전 지문의 판정을 삭제 (track_persona)
+    """
+
+    def __init__(self, path: Union[str, Path], ttl_hours: float = JUDGE_CACHE_TTL_HOURS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self._local = threading.local()
+        self._purged = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(VERDICT_CACHE_SCHEMA)
+            self._local.conn = conn
+            if not self._purged:
+                self._purged = True
+                conn.execute("DELETE FROM verdicts WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return conn
+
+    def get_many(self, fingerprint: str, menus: List[str]) -> Dict[str, MenuVerdict]:
+        """menus 중 캐시에 있는 판정 (menu -> MenuVerdict, source="cache")"""
+        keys = {menu_key(menu): menu for menu in menus}
+        rows = self._conn().execute(
+            f"SELECT menu_key, suitable, reason, alternative FROM verdicts "
+            f"WHERE persona = ? AND created_at >= ? AND menu_key IN ({', '.join('?' * len(keys))})",
+            (fingerprint, time.time() - self.ttl_seconds, *keys)
+        ).fetchall()
+        return {
+            keys[key]: MenuVerdict(keys[key], bool(suitable), reason, alternative, "cache")
+            for key, suitable, reason, alternative in rows
+        }
+
+    def put_many(self, fingerprint: str, verdicts: List[MenuVerdict]):
+        """판정 저장 (suitable이 None인 판정은 저장하지 않음)"""
+        now = time.time()
+        self._conn().executemany(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (fingerprint, menu_key(v.menu), v.menu, int(v.suitable), v.reason, v.alternative, now)
+                for v in verdicts if v.suitable is not None
+            ]
+        )
+
+    def track_persona(self, user: str, fingerprint: str) -> int:
+        """
+        사용자 선호도 지문 기록 - 바뀌었으면 이전 지문의 판정 삭제 (다른 사용자가 같은 지문이면 유지)
+
+        요일 묶음을 뺀 지문으로 기록하고, 삭제할 때는 요일별 판정("<지문>@평일")도 함께 지웁니다.
+
+        Returns:
+            삭제한 판정 수
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT fingerprint FROM personas WHERE user = ?", (user,)).fetchone()
+        conn.execute("INSERT OR REPLACE INTO personas VALUES (?, ?, ?)", (user, fingerprint, time.time()))
+        if not row or row[0] == fingerprint:
+            return 0
+        if conn.execute("SELECT 1 FROM personas WHERE fingerprint = ?", (row[0],)).fetchone():
+            return 0
+        return conn.execute(
+            "DELETE FROM verdicts WHERE persona = ? OR persona LIKE ?", (row[0], f"{row[0]}@%")
+        ).rowcount
+
+    def clear(self):
+        """모든 판정 삭제"""
+        self._conn().execute("DELETE FROM verdicts")
+
+
+_verdict_cache: Optional[VerdictCache] = None
+_verdict_cache_lock = threading.Lock()
+
+# 사용자별 최근 Notion 선호도 (track_user_preferences) - 판정 캐시 키의 기준
+_user_preferences: Dict[str, dict] = {}
+
+
+def get_verdict_cache() -> Optional[VerdictCache]:
+    """공유 판정 캐시 (JUDGE_CACHE_PATH가 비어 있으면 None)"""
+    global _verdict_cache
+    if not JUDGE_CACHE_PATH:
+        return None
+    with _verdict_cache_lock:
+        if _verdict_cache is None:
+            _verdict_cache = VerdictCache(JUDGE_CACHE_PATH)
+        return _verdict_cache
+
+
+def track_user_preferences(user: str, preferences: dict) -> int:
+    """
+    Notion에서 조회한 사용자 선호도를 기록하고, 이전과 달라졌으면 이전 판정을 무효화
+
+    Returns:
+        삭제한 판정 수
+    """
+    if not user or not isinstance(preferences, dict):
+        return 0
+    _user_preferences[user] = preferences
+    cache = get_verdict_cache()
+    if cache is None:
+        return 0
+    removed = cache.track_persona(user, persona_fingerprint(preferences).split("@")[0])
+    if removed:
+        print(f"🧹 {user}님 선호도가 변경되어 이전 메뉴 판정 {removed}개를 삭제했습니다.")
+    return removed
+
+
+def verdict_fingerprint(user_persona_info: Union[str, dict]) -> str:
+    """
+    판정 캐시 키로 쓸 페르소나 지문
+
+    현재 사용자(CURRENT_NOTION_USER)의 Notion 선호도를 기록했으면 에이전트가 넘긴 페르소나 텍스트 대신
+    그 선호도로 지문을 만들어, 선호도가 바뀌면 track_user_preferences가 지운 판정과 키가 일치하도록 함
+    """
+    preferences = _user_preferences.get(os.getenv("CURRENT_NOTION_USER", "소윤"))
+    return persona_fingerprint(preferences if preferences is not None else user_persona_info)
+
+
+def _cached_verdicts(menus: List[str], user_persona_info: Union[str, dict]) -> Dict[str, MenuVerdict]:
+    """캐시에서 찾은 판정 (캐시를 쓸 수 없으면 빈 dict)"""
+    cache = get_verdict_cache()
+    if cache is None or not menus:
+        return {}
+    try:
+        return cache.get_many(verdict_fingerprint(user_persona_info), menus)
+    except sqlite3.Error as e:
+        print(f"⚠️ 판정 캐시 조회 실패: {e}")
+        return {}
+
+
+def _store_verdicts(verdicts: List[MenuVerdict], user_persona_info: Union[str, dict]):
+    cache = get_verdict_cache()
+    if cache is None or not verdicts:
+        return
+    try:
+        cache.put_many(verdict_fingerprint(user_persona_info), verdicts)
+    except sqlite3.Error as e:
+        print(f"⚠️ 판정 캐시 저장 실패: {e}")
+
+
+def _menu_items(menu_recommendations: Union[str, dict, list]) -> List[str]:
+    """판단할 메뉴 목록 (dict/list는 문자열 값, 문자열은 줄 단위)"""
+    if isinstance(menu_recommendations, str) and menu_recommendations.strip()[:1] in ("{", "["):
+        try:
+            menu_recommendations = json.loads(menu_recommendations)
+        except ValueError:
+            pass
+    if isinstance(menu_recommendations, dict):
+        return [item for value in menu_recommendations.values() for item in _menu_items(value)]
+    if isinstance(menu_recommendations, list):
+        return [item for value in menu_recommendations for item in _menu_items(value)]
+    items = [clean_menu_item(line) for line in str(menu_recommendations or "").splitlines()]
+    return [item for item in items if item and not item.endswith((":", "："))]
+
+
+def _menu_line_name(line: str) -> Optional[str]:
+    """
+    종합 판단 입력의 메뉴 항목 줄 -> 메뉴명 (메뉴 항목이 아니면 None)
+
+    "  - 해물짬뽕: ₩10,000" -> "해물짬뽕", "1. 원조장충왕족발 - 족발" -> "원조장충왕족발 - 족발"
+    """
+    item = clean_menu_item(line)
+    if not item or not (_ITEM_PREFIX.match(line) or " - " in item):
+        return None
+    name = item.split(":", 1)[0].strip()
+    if not name or len(name) > 40 or "설명" in name:
+        return None
+    return name
 
 
 @tool("메뉴 개인화 적합성 판단")
@@ -29,8 +575,32 @@ def judge_menu_personalization(
             user_persona_info="채식주의자 (락토오보)"
         )
         → 결과: "❌ 부적합 - 채식주의자에게 족발(돼지고기) 추천 불가"
+    
+    알레르기·식이 제한·기피 음식에 걸리는 메뉴는 규칙으로 바로 부적합 판정하고,
+    나머지 메뉴만 LLM 판단 프롬프트로 넘깁니다.
     """
     
+    # 규칙 기반 사전 판정 (페르소나/메뉴가 있을 때만)
+    resolved_block = ""
+    if menu_recommendations and user_persona_info:
+        rules = parse_persona_rules(user_persona_info)
+        verdicts = [rule_judge_menu(item, rules) for item in _menu_items(menu_recommendations)]
+        record_judge_route("rule", sum(1 for v in verdicts if v.suitable is not None))
+        cached = _cached_verdicts([v.menu for v in verdicts if v.suitable is None], user_persona_info)
+        verdicts = [cached.get(v.menu, v) for v in verdicts]
+        resolved = [v for v in verdicts if v.suitable is not None]
+        pending = [v.menu for v in verdicts if v.suitable is None]
+        record_judge_route("cache", len(cached))
+        record_judge_route("llm", len(pending))
+        if resolved and not pending:
+            return "=== 규칙 기반 판정 (LLM 판단 불필요) ===\n\n" + "\n\n---\n\n".join(format_verdict(v) for v in resolved)
+        if resolved:
+            menu_recommendations = "\n".join(f"- {menu}" for menu in pending)
+            resolved_block = (
+                "\n**규칙/캐시로 확정된 판정 (다시 판단하지 말고 결과에 그대로 포함):**\n"
+                + "\n\n".join(format_verdict(v) for v in resolved) + "\n"
+            )
+    
     # dict를 JSON string으로 변환
     if isinstance(menu_recommendations, dict):
         menu_recommendations = json.dumps(menu_recommendations, ensure_ascii=False, indent=2)
@@ -114,7 +684,7 @@ def judge_menu_personalization(
 {few_shot_examples}
 
 === 판단 요청 ===
-
+{resolved_block}
 **추천 메뉴:**
 {menu_recommendations}
 
@@ -177,8 +747,31 @@ def judge_restaurant_recommendations(
             all_agent_recommendations="예산: 족발집, 일정: 피자집, 영양: 샐러드집",
             user_persona_info="채식주의자"
         )
+    
+    메뉴 항목 중 알레르기·식이 제한·기피 음식에 걸리는 줄은 규칙으로 제외 표시한 뒤 넘깁니다.
     """
     
+    # 규칙 기반 사전 판정 - 제외 확정 메뉴 표시
+    rule_excluded = []
+    if isinstance(all_agent_recommendations, str) and all_agent_recommendations and user_persona_info:
+        rules = parse_persona_rules(user_persona_info)
+        lines = all_agent_recommendations.splitlines()
+        judged = 0
+        for k, line in enumerate(lines):
+            name = _menu_line_name(line)
+            if not name:
+                continue
+            verdict = rule_judge_menu(name, rules)
+            if verdict.suitable is False:
+                lines[k] = f"{line}  ⛔ [규칙 판정: 제외 - {verdict.reason}]"
+                rule_excluded.append(verdict)
+            elif tag_text(name):
+                # 재료를 알 수 있는 메뉴만 LLM 판단 대상으로 집계 ("최대 예산: ..." 같은 조건 줄 제외)
+                judged += 1
+        record_judge_route("rule", len(rule_excluded))
+        record_judge_route("llm", judged)
+        all_agent_recommendations = "\n".join(lines)
+    
     # dict를 JSON string으로 변환
     if isinstance(all_agent_recommendations, dict):
         all_agent_recommendations = json.dumps(all_agent_recommendations, ensure_ascii=False, indent=2)
@@ -205,6 +798,8 @@ def judge_restaurant_recommendations(
 **사용자 페르소나:**
 {user_persona_info}
 
+{f"**규칙 판정으로 제외된 메뉴 {len(rule_excluded)}개** (⛔ 표시 - 다시 판단하지 말고 후보에서 제외)" if rule_excluded else ""}
+
 **판단 기준:**
 1. **개인화 필터링 (최우선)**
    - 채식주의자에게 고기집 추천 → 즉시 제외
@@ -235,3 +830,187 @@ def judge_restaurant_recommendations(
     
     return judgment_prompt
 
+
+
+# ============================================================
+# 일괄 판정 (메뉴 여러 개 -> LLM 1회 호출)
+# ============================================================
+BATCH_JUDGE_MODEL = "gpt-4o-mini"
+BATCH_JUDGE_SYSTEM = "당신은 식단 개인화 심사관입니다. 메뉴마다 적합 여부를 JSON 형식으로만 답변합니다."
+
+
+def build_batch_prompt(menus: List[str], user_persona_info: Union[str, dict]) -> str:
+    """메뉴 목록 + 페르소나 1개 -> 간결한 일괄 판정 프롬프트 (few-shot 없음)"""
+    if isinstance(user_persona_info, dict):
+        user_persona_info = json.dumps(user_persona_info, ensure_ascii=False)
+    numbered = "\n".join(f"{k}. {menu}" for k, menu in enumerate(menus, 1))
+    return f"""사용자 페르소나에 맞는지 메뉴마다 판정하세요.
+
+**사용자 페르소나:**
+{user_persona_info}
+
+**메뉴:**
+{numbered}
+
+**기준:** 알레르기 식재료·식이 제한(채식/락토오보/페스코) 위반과 싫어하는 음식은 부적합, 당뇨는 고당·고혈압은 고염 금지, 다이어트는 고칼로리 주의
+
+**다음 JSON 형식으로만 답변:**
+{{"verdicts": [{{"index": 1, "suitable": true, "reason": "한 줄 이유", "alternative": "부적합이면 대안 메뉴, 적합이면 빈 문자열"}}]}}"""
+
+
+def _as_suitable(value) -> Optional[bool]:
+    """true/false, "적합"/"부적합" 등 -> bool (알 수 없으면 None)"""
+    if isinstance(value, bool):
+        return value
+    text = str(value or "").strip().lower()
+    if text in ("false", "no", "n", "0") or "부적합" in text:
+        return False
+    if text in ("true", "yes", "y", "1") or "적합" in text:
+        return True
+    return None
+
+
+def parse_batch_verdicts(response: str, menus: List[str]) -> List[MenuVerdict]:
+    """
+    일괄 판정 응답(JSON) -> 메뉴 순서대로 MenuVerdict 목록
+
+    코드 블록(```json)이나 앞뒤 설명이 붙어도 JSON 부분만 읽고,
+    index가 없으면 메뉴명 -> 응답 순서로 짝을 맞춥니다. 빠진 메뉴는 suitable=None.
+    """
+    text = (response or "").strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        data = json.loads(text)
+    except ValueError:
+        match = re.search(r"[\[{].*[\]}]", text, re.DOTALL)
+        try:
+            data = json.loads(match.group()) if match else []
+        except ValueError:
+            data = []
+    items = data.get("verdicts", []) if isinstance(data, dict) else data
+
+    verdicts: Dict[int, MenuVerdict] = {}
+    for position, item in enumerate(items if isinstance(items, list) else [], 1):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index")
+        if not isinstance(index, int) or not 1 <= index <= len(menus):
+            named = str(item.get("menu") or "")
+            index = next((k for k, menu in enumerate(menus, 1) if named and named in menu), position)
+        if not 1 <= index <= len(menus) or index in verdicts:
+            continue
+        verdicts[index] = MenuVerdict(
+            menus[index - 1],
+            _as_suitable(item.get("suitable")),
+            str(item.get("reason") or "").strip(),
+            str(item.get("alternative") or "").strip(),
+            "llm"
+        )
+    return [verdicts.get(k, MenuVerdict(menu, None, "판정 결과 누락", "", "llm")) for k, menu in enumerate(menus, 1)]
+
+
+def _call_batch_judge(prompt: str, menu_count: int) -> Optional[str]:
+    """일괄 판정 LLM 호출 (실패하면 None)"""
+    try:
+        response = chat_completion(
+            model=BATCH_JUDGE_MODEL,
+            messages=[
+                {"role": "system", "content": BATCH_JUDGE_SYSTEM},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0,
+            max_tokens=120 + 80 * menu_count,
+            response_format={"type": "json_object"}
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        print(f"⚠️ 일괄 판정 LLM 호출 실패: {e}")
+        return None
+
+
+def judge_menus(menus: Union[str, list, dict], user_persona_info: Union[str, dict]) -> List[MenuVerdict]:
+    """
+    메뉴 여러 개를 한 번에 판정 (규칙 사전 판정 -> 남은 메뉴만 LLM 1회)
+
+    Returns:
+        입력 순서대로 MenuVerdict 목록 (LLM 호출이 실패한 메뉴는 suitable=None)
+    """
+    rules = parse_persona_rules(user_persona_info)
+    verdicts = [rule_judge_menu(item, rules) for item in _menu_items(menus)]
+    pending = [k for k, verdict in enumerate(verdicts) if verdict.suitable is None]
+    record_judge_route("rule", len(verdicts) - len(pending))
+
+    cached = _cached_verdicts([verdicts[k].menu for k in pending], user_persona_info)
+    for k in pending:
+        if verdicts[k].menu in cached:
+            verdicts[k] = cached[verdicts[k].menu]
+    pending = [k for k in pending if verdicts[k].suitable is None]
+    record_judge_route("cache", len(cached))
+    record_judge_route("llm", len(pending))
+    if not pending:
+        return verdicts
+
+    pending_menus = [verdicts[k].menu for k in pending]
+    response = _call_batch_judge(build_batch_prompt(pending_menus, user_persona_info), len(pending_menus))
+    if response is None:
+        return verdicts
+    judged = parse_batch_verdicts(response, pending_menus)
+    for k, verdict in zip(pending, judged):
+        verdicts[k] = verdict
+    _store_verdicts(judged, user_persona_info)
+    return verdicts
+
+
+@tool("메뉴 일괄 적합성 판단")
+def judge_menus_batch(
+    menus: Annotated[Union[str, list, dict], Field(default="")] = "",
+    user_persona_info: Annotated[Union[str, dict], Field(default="")] = ""
+) -> str:
+    """
+    후보 메뉴 여러 개가 사용자 페르소나에 적합한지 한 번에 판단합니다.
+    후보가 2개 이상이면 '메뉴 개인화 적합성 판단'을 여러 번 호출하지 말고 이 도구를 1회 사용하세요.
+    
+    Args:
+        menus: 후보 메뉴 목록 (리스트 또는 줄바꿈으로 구분한 문자열, "레스토랑 - 메뉴" 형식 권장)
+        user_persona_info: 사용자 페르소나 정보 (str 또는 dict)
+    
+    Returns:
+        메뉴별 판정 (적합/부적합, 이유, 대안)
+    
+    Example:
+        메뉴 일괄 적합성 판단(
+            menus=["원조장충왕족발 - 족발", "시골식당 - 매운탕", "썬한식 - 손두부"],
+            user_persona_info="갑각류 알레르기, 평일 락토오보"
+        )
+    """
+    if menus is None:
+        menus = ""
+    if user_persona_info is None:
+        user_persona_info = ""
+    if not menus or not user_persona_info:
+        return "❌ 후보 메뉴 목록과 사용자 페르소나 정보가 모두 필요합니다."
+    
+    verdicts = judge_menus(menus, user_persona_info)
+    if not verdicts:
+        return "❌ 판단할 메뉴를 찾지 못했습니다. 메뉴를 줄바꿈이나 리스트로 전달하세요."
+    
+    rule_count = sum(1 for v in verdicts if v.source == "rule" and v.suitable is not None)
+    cache_count = sum(1 for v in verdicts if v.source == "cache")
+    counts = f"규칙 {rule_count} · " + (f"캐시 {cache_count} · " if cache_count else "")
+    result = f"=== 메뉴 일괄 판정 ({len(verdicts)}개 | {counts}LLM {len(verdicts) - rule_count - cache_count}) ===\n\n"
+    for k, verdict in enumerate(verdicts, 1):
+        if verdict.suitable is None:
+            continue
+        line = f"{k}. {'✅ 적합' if verdict.suitable else '❌ 부적합'} | {verdict.menu} | {verdict.reason}"
+        if not verdict.suitable and verdict.alternative:
+            line += f" → 대안: {verdict.alternative}"
+        result += line + "\n"
+    
+    # LLM 판정을 받지 못한 메뉴는 간결한 프롬프트로 직접 판단
+    unresolved = [v.menu for v in verdicts if v.suitable is None]
+    if unresolved:
+        result += "\n⚠️ 아래 메뉴는 직접 판단하세요:\n\n" + build_batch_prompt(unresolved, user_persona_info)
+    return result
@@ -3,13 +3,14 @@
 """
 import json
 import os
-import asyncio
 from pathlib import Path
 from crewai.tools import tool
 from typing import Optional, Annotated
 from pydantic import Field
 from dotenv import load_dotenv
 
+from mcp_servers.notion_server import USER_CONTEXT_FIELDS, build_user_context
+
 load_dotenv()
 
 # USE_NOTION_MCP 설정 확인
@@ -42,67 +43,116 @@ def load_notion_data():
 
 
 # MCP 클라이언트 함수들 (지연 import)
-def run_async(coro):
-    """비동기 함수를 동기적으로 실행"""
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(coro)
-
-
-async def _get_meal_history_async(days: int = 7) -> str:
-    """비동기 식단 기록 조회"""
+def _call_mcp_tool(tool_name: str, arguments: dict = None) -> str:
+    """공유 MCP 세션 풀을 통해 도구 호출 (서버 프로세스 재사용)"""
     import sys
     sys.path.append(str(Path(__file__).parent.parent))
-    from mcp_client.notion_mcp_client import get_mcp_client
-    
-    client = get_mcp_client()
+    from mcp_client.notion_mcp_client import get_mcp_pool
     
-    async with client.connect():
-        result = await client.call_tool("get_meal_history", {"days": days})
-        return result
+    return get_mcp_pool().call_tool(tool_name, arguments or {})
 
 
-async def _get_user_preferences_async() -> str:
-    """비동기 사용자 선호도 조회"""
-    import sys
-    sys.path.append(str(Path(__file__).parent.parent))
-    from mcp_client.notion_mcp_client import get_mcp_client
-    
-    client = get_mcp_client()
-    
-    async with client.connect():
-        result = await client.call_tool("get_user_preferences", {})
-        return result
+def _get_meal_history_mcp(days: int = 7) -> str:
+    """MCP 식단 기록 조회"""
+    return _call_mcp_tool("get_meal_history", {"days": days})
 
 
-async def _get_user_schedule_async() -> str:
-    """비동기 사용자 일정 조회"""
-    import sys
-    sys.path.append(str(Path(__file__).parent.parent))
-    from mcp_client.notion_mcp_client import get_mcp_client
+def _get_user_preferences_mcp() -> str:
+    """MCP 사용자 선호도 조회"""
+    return _call_mcp_tool("get_user_preferences")
+
+
+def _get_user_schedule_mcp() -> str:
+    """MCP 사용자 일정 조회"""
+    return _call_mcp_tool("get_available_time")
+
+
+def _get_budget_status_mcp() -> str:
+    """MCP 예산 현황 조회"""
+    return _call_mcp_tool("get_budget_status")
+
+
+# ============================================================
+# 사용자 컨텍스트 (선호도·일정·예산·식단 기록 일괄 조회)
+# ============================================================
+def _parse_context_fields(fields) -> list:
+    """"preferences,budget" 또는 리스트 형태의 섹션 선택값 정규화"""
+    if not fields:
+        return list(USER_CONTEXT_FIELDS)
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    selected = [f.strip() for f in fields if f and f.strip() in USER_CONTEXT_FIELDS]
+    return selected or list(USER_CONTEXT_FIELDS)
+
+
+def fetch_user_context(fields=None, days: int = 7) -> dict:
+    """사용자 컨텍스트를 한 번에 조회
+
+    MCP 모드에서는 get_user_context 도구 1회 호출, Mock 모드에서는 로컬 파일을
+    Mock 서버의 build_user_context로 구성합니다.
+    
+    Returns:
+        {"user", "preferences", "schedule", "budget", "meal_history"} 중 선택된 섹션
+    """
+    selected = _parse_context_fields(fields)
     
-    client = get_mcp_client()
+    if USE_NOTION_MCP:
+        return json.loads(_call_mcp_tool("get_user_context", {"fields": selected, "days": days}))
     
-    async with client.connect():
-        result = await client.call_tool("get_available_time", {})
-        return result
+    # Mock 서버와 같은 구성 함수 사용 (모드에 관계없이 같은 형태)
+    return build_user_context(load_notion_data(), selected, days)
 
 
-async def _get_budget_status_async() -> str:
-    """비동기 예산 현황 조회"""
-    import sys
-    sys.path.append(str(Path(__file__).parent.parent))
-    from mcp_client.notion_mcp_client import get_mcp_client
+def format_user_context(context: dict) -> str:
+    """사용자 컨텍스트를 프롬프트에 넣기 좋은 간결한 텍스트로 변환"""
+    lines = [f"=== 사용자 컨텍스트 ({context.get('user', '')}) ==="]
     
-    client = get_mcp_client()
+    prefs = context.get("preferences")
+    if prefs:
+        restrictions = prefs.get("dietary_restrictions") or {}
+        lines.append("[선호도]")
+        lines.append(f"- 알레르기: {', '.join(prefs.get('allergies') or []) or '없음'}")
+        if prefs.get("health_conditions"):
+            lines.append(f"- 건강 상태: {', '.join(prefs['health_conditions'])}")
+        if restrictions.get("raw"):
+            lines.append(f"- 식이 제한: {restrictions['raw']}")
+        if prefs.get("dislikes"):
+            lines.append(f"- 싫어하는 음식: {', '.join(prefs['dislikes'])}")
+        if prefs.get("favorite_cuisines"):
+            lines.append(f"- 선호 음식: {', '.join(prefs['favorite_cuisines'])}")
+        if prefs.get("diet_goal"):
+            lines.append(f"- 다이어트 목표: {prefs['diet_goal']}")
+        lines.append(f"- 매운맛: {prefs.get('spicy_level', '보통')} | 요리 실력: {prefs.get('cooking_skill') or '중급'}")
     
-    async with client.connect():
-        result = await client.call_tool("get_budget_status", {})
-        return result
+    schedule = context.get("schedule")
+    if schedule:
+        lines.append("[일정]")
+        line = f"- {schedule.get('meal_time', '점심')} | 가용 시간: {schedule.get('available_time', 30)}분"
+        if schedule.get("meal_window"):
+            line += f" | 식사 시간대: {schedule['meal_window']}"
+        lines.append(line)
+    
+    budget = context.get("budget")
+    if budget:
+        pref_range = budget.get("preferred_range") or [8000, 15000]
+        remaining = budget.get("remaining", budget.get("daily_limit", 0) - budget.get("today_spent", 0))
+        lines.append("[예산]")
+        lines.append(
+            f"- 일일 {budget.get('daily_limit', 0):,}원 | 오늘 지출 {budget.get('today_spent', 0):,}원 | "
+            f"남은 예산 {remaining:,}원 | 선호 가격대 {pref_range[0]:,}~{pref_range[1]:,}원"
+        )
+    
+    meal_history = context.get("meal_history")
+    if meal_history:
+        meals = meal_history.get("recent_meals", [])
+        lines.append(f"[최근 식단] {len(meals)}끼, 평균 {meal_history.get('average_calories', 0):.0f}kcal")
+        for meal in meals:
+            lines.append(
+                f"- {meal.get('date', '')} {meal.get('type', '')}: {meal.get('meal', '')} "
+                f"({meal.get('calories', 0)}kcal, {meal.get('cost', 0):,}원)"
+            )
+    
+    return "\n".join(lines)
 
 
 @tool("식단 기록 조회")
@@ -119,7 +169,7 @@ def get_meal_history(days: Annotated[int, Field(description="조회할 일수",
     """
     if USE_NOTION_MCP:
         # MCP 모드: JSON 데이터를 사람이 읽기 쉬운 형태로 변환
-        json_result = run_async(_get_meal_history_async(days))
+        json_result = _get_meal_history_mcp(days)
         import json
         try:
             meals = json.loads(json_result)
@@ -210,7 +260,7 @@ def get_user_preferences() -> str:
     """
     if USE_NOTION_MCP:
         # MCP 모드: JSON 데이터를 사람이 읽기 쉬운 형태로 변환
-        json_result = run_async(_get_user_preferences_async())
+        json_result = _get_user_preferences_mcp()
         import json
         try:
             prefs = json.loads(json_result)
@@ -316,7 +366,7 @@ def get_user_schedule() -> str:
     """
     if USE_NOTION_MCP:
         # MCP 모드: JSON 데이터를 사람이 읽기 쉬운 형태로 변환
-        json_result = run_async(_get_user_schedule_async())
+        json_result = _get_user_schedule_mcp()
         import json
         try:
             schedule = json.loads(json_result)
@@ -370,7 +420,7 @@ def get_budget_status() -> str:
     """
     if USE_NOTION_MCP:
         # MCP 모드: JSON 데이터를 사람이 읽기 쉬운 형태로 변환
-        json_result = run_async(_get_budget_status_async())
+        json_result = _get_budget_status_mcp()
         import json
         try:
             result_data = json.loads(json_result)
@@ -426,3 +476,28 @@ def get_budget_status() -> str:
         
         return result
 
+
+
+@tool("사용자 컨텍스트 조회")
+def get_user_context(
+    fields: Annotated[str, Field(description="조회할 섹션 (쉼표 구분, 생략 시 전체)", default="")] = "",
+    days: Annotated[int, Field(description="식단 기록 조회 일수", default=7)] = 7
+) -> str:
+    """
+    사용자의 선호도(알레르기·건강 상태), 일정, 예산, 최근 식단 기록을 한 번에 조회합니다.
+    여러 정보가 필요할 때 개별 조회 도구 대신 이 도구를 1회만 사용하세요.
+    
+    Args:
+        fields: 조회할 섹션 (preferences, schedule, budget, meal_history 중 쉼표로 구분). 생략 시 전체
+        days: 식단 기록 조회 일수 (기본값: 7일)
+    
+    Returns:
+        사용자 컨텍스트 요약
+    
+    Example:
+        사용자 컨텍스트 조회(fields="preferences,budget")
+    """
+    try:
+        return format_user_context(fetch_user_context(fields, days))
+    except Exception as e:
+        return f"⚠️ 사용자 컨텍스트 조회 실패: {str(e)}"
@@ -2,39 +2,19 @@
 노션 MCP 클라이언트를 통한 CrewAI 도구
 실제 MCP 서버와 통신하여 데이터 가져오기
 """
-import asyncio
 from crewai.tools import tool
 import sys
 from pathlib import Path
 
 # MCP 클라이언트 import
 sys.path.append(str(Path(__file__).parent.parent))
-from mcp_client.notion_mcp_client import get_mcp_client
+from mcp_client.notion_mcp_client import get_mcp_pool
 
 
-def run_async(coro):
-    """비동기 함수를 동기적으로 실행"""
+def _call_mcp_tool(tool_name: str, arguments: dict = None) -> str:
+    """공유 MCP 세션 풀을 통해 도구 호출 (서버 프로세스 재사용)"""
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # 이미 실행 중인 이벤트 루프가 있으면 새 루프 생성
-            import nest_asyncio
-            nest_asyncio.apply()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(coro)
-
-
-async def _get_meal_history_async(days: int = 7) -> str:
-    """비동기 식단 기록 조회"""
-    client = get_mcp_client()
-    
-    try:
-        async with client.connect():
-            result = await client.call_tool("get_meal_history", {"days": days})
-            return result
+        return get_mcp_pool().call_tool(tool_name, arguments or {})
     except Exception as e:
         return f"MCP 연결 오류: {str(e)}"
 
@@ -51,19 +31,7 @@ def get_meal_history(days: int = 7) -> str:
     Returns:
         식단 기록 정보
     """
-    return run_async(_get_meal_history_async(days))
-
-
-async def _get_user_preferences_async() -> str:
-    """비동기 사용자 선호도 조회"""
-    client = get_mcp_client()
-    
-    try:
-        async with client.connect():
-            result = await client.call_tool("get_user_preferences", {})
-            return result
-    except Exception as e:
-        return f"MCP 연결 오류: {str(e)}"
+    return _call_mcp_tool("get_meal_history", {"days": days})
 
 
 @tool("사용자 선호도 조회")
@@ -75,19 +43,7 @@ def get_user_preferences() -> str:
     Returns:
         사용자 선호도 정보
     """
-    return run_async(_get_user_preferences_async())
-
-
-async def _get_user_schedule_async() -> str:
-    """비동기 사용자 일정 조회"""
-    client = get_mcp_client()
-    
-    try:
-        async with client.connect():
-            result = await client.call_tool("get_available_time", {})
-            return result
-    except Exception as e:
-        return f"MCP 연결 오류: {str(e)}"
+    return _call_mcp_tool("get_user_preferences")
 
 
 @tool("사용자 일정 조회")
@@ -99,19 +55,7 @@ def get_user_schedule() -> str:
     Returns:
         사용자 일정 정보
     """
-    return run_async(_get_user_schedule_async())
-
-
-async def _get_budget_status_async() -> str:
-    """비동기 예산 현황 조회"""
-    client = get_mcp_client()
-    
-    try:
-        async with client.connect():
-            result = await client.call_tool("get_budget_status", {})
-            return result
-    except Exception as e:
-        return f"MCP 연결 오류: {str(e)}"
+    return _call_mcp_tool("get_available_time")
 
 
 @tool("예산 현황 조회")
@@ -123,5 +67,24 @@ def get_budget_status() -> str:
     Returns:
         예산 현황 정보
     """
-    return run_async(_get_budget_status_async())
+    return _call_mcp_tool("get_budget_status")
+
 
+
+@tool("사용자 컨텍스트 조회")
+def get_user_context(fields: str = "", days: int = 7) -> str:
+    """
+    사용자의 선호도, 일정, 예산, 최근 식단 기록을 한 번에 조회합니다.
+    여러 정보가 필요할 때 개별 조회 도구 대신 이 도구를 1회만 사용하세요.
+    
+    Args:
+        fields: 조회할 섹션 (preferences, schedule, budget, meal_history 중 쉼표로 구분). 생략 시 전체
+        days: 식단 기록 조회 일수 (기본값: 7일)
+    
+    Returns:
+        사용자 컨텍스트 정보
+    """
+    arguments = {"days": days}
+    if fields:
+        arguments["fields"] = [f.strip() for f in fields.split(",") if f.strip()]
+    return _call_mcp_tool("get_user_context", arguments)
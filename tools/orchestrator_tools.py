@@ -1,12 +1,99 @@
 """
 오케스트레이터 전용 도구
 """
-import os
 from crewai.tools import tool
 from typing import Optional, Annotated
 from pydantic import Field
-from openai import OpenAI
-from agent_cards import get_agent_summary
+from llm_cache import INTENT_WORKFLOW
+from llm_client import chat_completion
+from agent_cards import get_agent_summary, AGENT_CARDS, WORKFLOW_CARDS, AGENT_HOME_WORKFLOWS
+
+
+# ============================================================
+# 규칙 기반 의도 분류 (LLM 호출 전 fast path)
+# ============================================================
+STRONG_TRIGGER_WEIGHT = 3  # 워크플로우 트리거 (오케스트레이터 판단 규칙)
+WEAK_KEYWORD_WEIGHT = 1    # 에이전트 카드 키워드
+
+# 이전 대화에 의존하는 표현 - 대화 맥락이 있으면 LLM 판단에 맡김
+FOLLOW_UP_MARKERS = ["말고", "다른 거", "다른거", "그거", "아까", "방금", "이거"]
+
+# fast path / LLM 경로 사용 통계
+_intent_stats = {"fast_path": 0, "llm": 0}
+
+
+def classify_intent_fast(user_message: str, conversation_history: str = "") -> dict:
+    """
+    키워드 규칙으로 사용자 의도를 분류합니다 (LLM 호출 없음).
+    
+    Returns:
+        analyze_user_intent와 같은 형식의 의도 dict + confidence (0.0 ~ 1.0)
+    """
+    message = (user_message or "").lower()
+    scores = {workflow: 0 for workflow in WORKFLOW_CARDS}
+    matched = {workflow: [] for workflow in WORKFLOW_CARDS}
+    
+    for workflow, card in WORKFLOW_CARDS.items():
+        for trigger in card["triggers"]:
+            if trigger in message:
+                scores[workflow] += STRONG_TRIGGER_WEIGHT
+                matched[workflow].append(trigger)
+    
+    for agent_type, card in AGENT_CARDS.items():
+        workflow = AGENT_HOME_WORKFLOWS.get(agent_type)
+        for keyword in card["keywords"]:
+            if keyword in message and keyword not in matched[workflow]:
+                scores[workflow] += WEAK_KEYWORD_WEIGHT
+                matched[workflow].append(keyword)
+    
+    # 판단 규칙: '외식', '배달' 등이 있으면 전체 추천보다 우선
+    for workflow, card in WORKFLOW_CARDS.items():
+        if any(trigger in message for trigger in card["triggers"]):
+            for overridden in card["overrides"]:
+                scores[overridden] = 0
+    
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (top_workflow, top_score), (_, second_score) = ranked[0], ranked[1]
+    
+    if top_score == 0:
+        confidence = 0.0
+        top_workflow = "FULL_RECOMMENDATION"
+    else:
+        # 경쟁 워크플로우와의 격차 × 강한 트리거 존재 여부
+        margin = top_score / (top_score + second_score)
+        strength = min(1.0, top_score / STRONG_TRIGGER_WEIGHT)
+        confidence = margin * strength
+    
+    if conversation_history and any(marker in message for marker in FOLLOW_UP_MARKERS):
+        confidence *= 0.5
+    
+    card = WORKFLOW_CARDS[top_workflow]
+    return {
+        "workflow_type": top_workflow,
+        "required_agents": list(card["required_agents"]),
+        "primary_agent": card["primary_agent"],
+        "reasoning": (
+            f"규칙 기반 분류 - 키워드: {', '.join(matched[top_workflow])}"
+            if matched[top_workflow] else "규칙 기반 분류 - 일치 키워드 없음"
+        ),
+        "user_intent": card["user_intent"],
+        "confidence": round(confidence, 2)
+    }
+
+
+def record_intent_route(route: str):
+    """의도 분석 경로 기록 ("fast_path" 또는 "llm")"""
+    _intent_stats[route] = _intent_stats.get(route, 0) + 1
+
+
+def get_intent_stats() -> dict:
+    """의도 분석 경로 통계 (fast path 비율 포함)"""
+    total = _intent_stats["fast_path"] + _intent_stats["llm"]
+    return {
+        **_intent_stats,
+        "total": total,
+        "fast_path_ratio": _intent_stats["fast_path"] / total if total else 0.0
+    }
 
 
 @tool("사용자 의도 분석")
@@ -26,8 +113,6 @@ def analyze_user_intent(
         필요한 에이전트 목록과 워크플로우 타입을 JSON 형식으로 반환
     """
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
         agent_info = get_agent_summary()
         
         prompt = f"""당신은 멀티 에이전트 시스템의 오케스트레이터입니다.
@@ -95,7 +180,8 @@ def analyze_user_intent(
 
 JSON만 출력하고 다른 텍스트는 포함하지 마세요."""
 
-        response = client.chat.completions.create(
+        response = chat_completion(
+            cache_workflow=INTENT_WORKFLOW,
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": "당신은 사용자 의도를 정확히 파악하는 AI 오케스트레이터입니다. JSON 형식으로만 답변합니다."},
@@ -1,11 +1,209 @@
 """
 레시피 생성 도구 - AI 기반
 """
-import os
 from crewai.tools import tool
-from openai import OpenAI
-from typing import Optional, Annotated
+from llm_client import chat_completion
+from typing import Optional, Annotated, Tuple, Union
 from pydantic import Field
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from tools.restaurant_menu_tags import diet_terms
+
+
+# ============================================================
+# 레시피 캐시 (같은 요리 + 건강 정보면 LLM 호출 없이 재사용)
+# ============================================================
+# 경로를 빈 문자열로 두면 캐시 사용 안 함
+RECIPE_CACHE_PATH = os.getenv("RECIPE_CACHE_PATH", str(Path(__file__).parent.parent / "data" / "recipe_cache.sqlite"))
+RECIPE_CACHE_TTL_HOURS = float(os.getenv("RECIPE_CACHE_TTL_HOURS", "720"))
+RECIPE_CACHE_MAX_ENTRIES = int(os.getenv("RECIPE_CACHE_MAX_ENTRIES", "500"))
+
+RECIPE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recipes (
+    dish_key TEXT,                    -- recipe_cache_key()[0]
+    health_key TEXT,                  -- recipe_cache_key()[1]
+    dish_name TEXT,
+    user_health_info TEXT,
+    recipe TEXT,
+    created_at REAL,
+    last_used REAL,
+    PRIMARY KEY (dish_key, health_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS recipes_last_used ON recipes (last_used);
+"""
+
+_DISH_SUFFIX = re.compile(r"(레시피|만드는법|만들기|조리법|요리법)+$")
+_HEALTH_SEPARATOR = re.compile(r"[,·/+()\[\]\s]+")
+_NO_HEALTH_INFO = {"", "없음", "없음.", "해당없음", "none"}
+
+# "된장찌개 만드는 법 알려줘" -> "된장찌개"
+_RECIPE_REQUEST = re.compile(
+    r"^\s*(?P<dish>.+?)\s*(?:의\s*)?(?:레시피|만드는\s*(?:법|방법)|조리\s*법|요리\s*법|만들기)"
+    r"\s*(?:좀|을|를)?\s*(?:알려\s*줘|알려\s*주세요|알려\s*줄래|가르쳐\s*줘|가르쳐\s*주세요|부탁해|궁금해)?[\s.!?~]*$"
+)
+MAX_DISH_NAME_LENGTH = 20
+
+_recipe_cache_stats = {"hits": 0, "misses": 0}
+
+
+def recipe_cache_key(dish_name: str, user_health_info: str = "") -> Tuple[str, str]:
+    """
+    (요리명, 건강 정보) 정규화
+    "된장 찌개 레시피", "고혈압·당뇨" -> ("된장찌개", "고혈압|당뇨")
+    """
+    dish = _DISH_SUFFIX.sub("", re.sub(r"\s+", "", str(dish_name or "").lower()))
+    terms = {term for term in _HEALTH_SEPARATOR.split(str(user_health_info or "").lower()) if term not in _NO_HEALTH_INFO}
+    return dish, "|".join(sorted(terms))
+
+
+class RecipeCache:
+    """
+    SQLite 레시피 캐시 - (요리명, 건강 정보) -> 생성된 레시피
+    - 스레드마다 연결을 따로 열고 WAL 모드로 여러 프로세스/세션이 같은 파일을 공유
+    - TTL이 지난 레시피는 조회하지 않고, 프로세스에서 처음 열 때 삭제
+    - max_entries를 넘으면 가장 오래 사용하지 않은 레시피부터 삭제 (LRU)
+    """
+
+    def __init__(self, path: Union[str, Path], ttl_hours: float = RECIPE_CACHE_TTL_HOURS,
+                 max_entries: int = RECIPE_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._purged = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(RECIPE_CACHE_SCHEMA)
+            self._local.conn = conn
+            if not self._purged:
+                self._purged = True
+                conn.execute("DELETE FROM recipes WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        return conn
+
+    def get(self, dish_name: str, user_health_info: str = "") -> Optional[str]:
+        """캐시된 레시피 (없거나 TTL이 지났으면 None), 조회 시각 갱신"""
+        key = recipe_cache_key(dish_name, user_health_info)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT recipe FROM recipes WHERE dish_key = ? AND health_key = ? AND created_at >= ?",
+            (*key, time.time() - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE recipes SET last_used = ? WHERE dish_key = ? AND health_key = ?", (time.time(), *key))
+        return row[0]
+
+    def put(self, dish_name: str, user_health_info: str, recipe: str):
+        """레시피 저장 후 max_entries를 넘은 만큼 LRU 삭제"""
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO recipes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*recipe_cache_key(dish_name, user_health_info), dish_name, user_health_info or "", recipe, now, now)
+        )
+        conn.execute(
+            "DELETE FROM recipes WHERE (dish_key, health_key) IN "
+            "(SELECT dish_key, health_key FROM recipes ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (max(0, self.max_entries),)
+        )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def clear(self):
+        """모든 레시피 삭제"""
+        self._conn().execute("DELETE FROM recipes")
+
+
+_recipe_cache: Optional[RecipeCache] = None
+_recipe_cache_lock = threading.Lock()
+
+
+def get_recipe_cache() -> Optional[RecipeCache]:
+    """공유 레시피 캐시 (RECIPE_CACHE_PATH가 비어 있으면 None)"""
+    global _recipe_cache
+    if not RECIPE_CACHE_PATH:
+        return None
+    with _recipe_cache_lock:
+        if _recipe_cache is None:
+            _recipe_cache = RecipeCache(RECIPE_CACHE_PATH)
+        return _recipe_cache
+
+
+def get_recipe_cache_stats() -> dict:
+    """레시피 캐시 적중 통계"""
+    total = _recipe_cache_stats["hits"] + _recipe_cache_stats["misses"]
+    return {
+        **_recipe_cache_stats,
+        "total": total,
+        "hit_ratio": _recipe_cache_stats["hits"] / total if total else 0.0,
+    }
+
+
+def cached_recipe(dish_name: str, user_health_info: str = "") -> Optional[str]:
+    """캐시에서 찾은 레시피 (캐시를 쓸 수 없거나 없으면 None)"""
+    cache = get_recipe_cache()
+    if cache is None or not dish_name:
+        return None
+    try:
+        recipe = cache.get(dish_name, user_health_info)
+    except sqlite3.Error as e:
+        print(f"⚠️ 레시피 캐시 조회 실패: {e}")
+        return None
+    _recipe_cache_stats["hits" if recipe is not None else "misses"] += 1
+    return recipe
+
+
+def _store_recipe(dish_name: str, user_health_info: str, recipe: str):
+    cache = get_recipe_cache()
+    if cache is None or not recipe:
+        return
+    try:
+        cache.put(dish_name, user_health_info, recipe)
+    except sqlite3.Error as e:
+        print(f"⚠️ 레시피 캐시 저장 실패: {e}")
+
+
+def parse_recipe_request(user_request: str) -> Optional[str]:
+    """레시피 요청 문장에서 요리명 추출 (요리명만 있는 단순 요청이 아니면 None)"""
+    match = _RECIPE_REQUEST.match(str(user_request or ""))
+    if not match:
+        return None
+    dish = match.group("dish").strip()
+    return dish if 0 < len(dish) <= MAX_DISH_NAME_LENGTH else None
+
+
+def recipe_health_info(preferences: dict) -> str:
+    """
+    Notion 선호도 -> user_health_info 문자열
+    {"health_conditions": ["당뇨"], "allergies": ["갑각류"]} -> "당뇨, 갑각류 알레르기"
+    """
+    if not isinstance(preferences, dict):
+        return ""
+    parts = [str(c) for c in preferences.get("health_conditions") or []]
+    parts += [f"{a} 알레르기" for a in preferences.get("allergies") or [] if a and a != "없음"]
+    restrictions = preferences.get("dietary_restrictions") or preferences.get("diet_type") or ""
+    if isinstance(restrictions, dict):
+        restrictions = " ".join(str(value) for value in restrictions.values())
+    parts += diet_terms(str(restrictions))
+    if preferences.get("diet_goal"):
+        parts.append(str(preferences["diet_goal"]))
+    return ", ".join(parts)
+
+
+def format_recipe(recipe: str, user_health_info: str = "") -> str:
+    """도구 출력 형식 (새로 생성한 레시피와 캐시된 레시피 동일)"""
+    return f"🍳 AI 생성 레시피{f' ({user_health_info} 고려)' if user_health_info else ''}\n\n{recipe}"
 
 
 @tool("AI 레시피 생성")
@@ -31,10 +229,14 @@ def generate_recipe_with_ai(
     if user_health_info is None:
         user_health_info = ""
     
+    # 같은 요리 + 건강 정보로 만든 레시피가 있으면 LLM 호출 생략
+    recipe = cached_recipe(dish_name, user_health_info)
+    if recipe is not None:
+        print(f"⚡ '{dish_name}' 레시피 캐시 사용 (건강 정보: {user_health_info or '없음'})")
+        return format_recipe(recipe, user_health_info)
+    
     try:
         print(f"🔄 '{dish_name}' 레시피 생성 중 (건강 정보: {user_health_info or '없음'})...")
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        
         # 건강 정보 반영
         health_consideration = ""
         if user_health_info:
@@ -98,7 +300,7 @@ def generate_recipe_with_ai(
         
         prompt += "\n실용적이고 초보자도 따라할 수 있도록 구체적으로 작성해주세요."
 
-        response = client.chat.completions.create(
+        response = chat_completion(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -117,8 +319,9 @@ def generate_recipe_with_ai(
         recipe = response.choices[0].message.content
         
         print(f"✅ '{dish_name}' 레시피 생성 완료!")
+        _store_recipe(dish_name, user_health_info, recipe)
         
-        return f"🍳 AI 생성 레시피{f' ({user_health_info} 고려)' if user_health_info else ''}\n\n{recipe}"
+        return format_recipe(recipe, user_health_info)
         
     except Exception as e:
         return f"레시피 생성 중 오류가 발생했습니다: {str(e)}\n\n요청하신 '{dish_name}' 레시피를 생성할 수 없습니다."
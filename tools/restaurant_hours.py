@@ -0,0 +1,254 @@
+"""
+식당 영업시간/휴무일 파서
+식당_DB.json의 hours / holidays 문자열을 요일별 분 단위 비트맵으로 변환하고,
+사용자 식사 시간대(schedule.meal_window)에 영업 중인지 비트 연산으로 확인
+
+비트맵: 월요일 00:00을 0번 비트로 하는 주간 10080비트 정수
+    (요일 d, 분 m) -> 비트 d * 1440 + m   (일요일 밤 -> 월요일 새벽은 0번으로 이어짐)
+
+지원 형식:
+    영업시간  "영업시간:주중 09:00 ~ 18:00", "매일 11:00 ~ 03:00", "월,화,수 11:30 ~ 21:00", "월~금 ..."
+    휴무일    "연중무휴", "매주 월요일 휴무", "정기휴무-매주(일,토)", "정기휴무-매월 둘째주(일)"
+    (명절/연휴 휴무는 음력 날짜가 필요해 반영하지 않음)
+
+"주중"은 휴무일 정보가 없을 때만 월~금입니다. DB의 "주중"은 대개 요일 구분 없는 영업시간 표기이고
+쉬는 날은 휴무일 항목에 따로 적혀 있어서, 휴무일 정보가 있으면 나머지 요일도 같은 시간으로 봅니다.
+    "주중 11:00 ~ 22:00" + "매주 월요일 휴무"  -> 화~일 영업
+    "주중 11:00 ~ 22:00" (휴무일 정보 없음)     -> 월~금 영업
+"""
+import calendar
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+WEEKDAYS = "월화수목금토일"  # datetime.weekday() 순서
+MINUTES_PER_DAY = 24 * 60
+WEEK_MINUTES = 7 * MINUTES_PER_DAY
+WEEK_MASK = (1 << WEEK_MINUTES) - 1
+
+# 요일 묶음 표현 -> 요일 번호
+DAY_GROUPS = {
+    "매일": tuple(range(7)),
+    "주중": tuple(range(5)),
+    "평일": tuple(range(5)),
+    "주말": (5, 6),
+}
+
+# 매월 n째주 표현 -> n (-1: 마지막 주)
+WEEK_ORDINALS = {"첫째": 1, "둘째": 2, "셋째": 3, "넷째": 4, "다섯째": 5, "마지막": -1}
+
+_TIME = r"(\d{1,2}):(\d{2})"
+_RANGE_SEPARATOR = r"\s*[~\-–—]\s*"
+_HOURS_SEGMENT = re.compile(
+    r"(?P<days>매일|주중|평일|주말|[월화수목금토일](?:요일)?(?:\s*[,~\-]\s*[월화수목금토일](?:요일)?)*)?\s*"
+    + _TIME + _RANGE_SEPARATOR + _TIME
+)
+_WINDOW = re.compile(_TIME + r"(?:" + _RANGE_SEPARATOR + _TIME + r")?")
+_WEEKLY_CLOSURE = re.compile(r"매주\s*(?:\(([^)]*)\)|([월화수목금토일])요일)")
+_MONTHLY_CLOSURE = re.compile(r"매월\s*(" + "|".join(WEEK_ORDINALS) + r")\s*주\s*\(([^)]*)\)")
+_DATE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_WEEKDAY_PREFIX = re.compile(r"^\s*([월화수목금토일])(?:요일)?(?=[\s\d]|$)")
+_CLOSURE_INFO = re.compile(r"무휴|휴무|연휴")   # 휴무일 항목이 쉬는 날을 적고 있는지
+
+
+class Schedule(NamedTuple):
+    """식당 1곳의 영업 일정 (bitmap이 None이면 영업시간 정보 없음)"""
+    bitmap: Optional[int]
+    monthly_closures: Tuple[Tuple[int, int], ...] = ()  # ((n째주, 요일), ...)
+
+
+class OpenAt(NamedTuple):
+    """영업 확인 조건 - masks 중 하나의 시간대 전체가 영업 중이면 통과 (검색 캐시 키로 사용)"""
+    weekday: int
+    week_of_month: Optional[int]  # 날짜를 모르면 None (매월 정기휴무 무시)
+    last_week: bool
+    windows: Tuple[Tuple[int, int], ...]  # ((시작 분, 종료 분), ...) - 표시용
+    masks: Tuple[int, ...]
+
+
+def _minutes(hour: str, minute: str) -> int:
+    return int(hour) * 60 + int(minute)
+
+
+def _span_mask(weekday: int, start: int, end: int) -> int:
+    """weekday의 start분 ~ end분(다음날로 넘어갈 수 있음) 구간 비트"""
+    offset = weekday * MINUTES_PER_DAY + start
+    mask = ((1 << (end - start)) - 1) << offset
+    return (mask & WEEK_MASK) | (mask >> WEEK_MINUTES)
+
+
+def _parse_days(text: Optional[str]) -> Tuple[int, ...]:
+    """요일 표현 -> 요일 번호 (없으면 매일)"""
+    if not text:
+        return DAY_GROUPS["매일"]
+    if text in DAY_GROUPS:
+        return DAY_GROUPS[text]
+    days = []
+    text = text.replace("요일", "")
+    for part in re.split(r"\s*,\s*", text):
+        bounds = re.split(r"\s*[~\-]\s*", part)
+        first, last = WEEKDAYS.index(bounds[0]), WEEKDAYS.index(bounds[-1])
+        days.extend(WEEKDAYS[(first + k) % 7] for k in range((last - first) % 7 + 1))
+    return tuple(sorted({WEEKDAYS.index(day) for day in days}))
+
+
+def _day_list(text: str) -> Tuple[int, ...]:
+    """"일,토" -> (6, 5)"""
+    return tuple(WEEKDAYS.index(ch) for ch in text if ch in WEEKDAYS)
+
+
+@lru_cache(maxsize=4096)
+def compile_schedule(hours: Optional[str], holidays: Optional[str] = None) -> Schedule:
+    """
+    hours / holidays 문자열 -> Schedule (같은 문자열은 결과 공유)
+
+    - 종료 시각이 시작 시각보다 이르거나 같으면 다음날까지 영업 ("18:00 ~ 06:00", "00:00 ~ 00:00"은 24시간)
+    - 영업시간이 요일 묶음(매일/주중/평일/주말)으로만 적혀 있고 휴무일 정보(연중무휴, 매주/매월 휴무,
+      명절 휴무)가 있으면 영업시간에 없는 요일도 같은 시간으로 영업 ("월,화,수"처럼 요일을 직접 적으면 그대로)
+    - 매주 휴무 요일은 그 날 시작하는 영업 구간을 제외
+    """
+    segments = []
+    explicit_days = False
+    for match in _HOURS_SEGMENT.finditer(hours or ""):
+        start = _minutes(match.group(2), match.group(3))
+        end = _minutes(match.group(4), match.group(5))
+        if start >= MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            continue
+        if end <= start:
+            end += MINUTES_PER_DAY
+        segments.append((_parse_days(match.group("days")), start, end))
+        explicit_days = explicit_days or match.group("days") not in (None, *DAY_GROUPS)
+    if not segments:
+        return Schedule(None)
+
+    holidays = holidays or ""
+    closed_weekdays = set()
+    for match in _WEEKLY_CLOSURE.finditer(holidays):
+        closed_weekdays.update(_day_list(match.group(1) or match.group(2)))
+    monthly_closures = tuple(
+        (WEEK_ORDINALS[match.group(1)], weekday)
+        for match in _MONTHLY_CLOSURE.finditer(holidays)
+        for weekday in _day_list(match.group(2))
+    )
+
+    if not explicit_days and _CLOSURE_INFO.search(holidays):
+        covered = {day for days, _, _ in segments for day in days}
+        uncovered = tuple(day for day in range(7) if day not in covered)
+        if uncovered:
+            _, start, end = segments[0]
+            segments.append((uncovered, start, end))
+
+    bitmap = 0
+    for days, start, end in segments:
+        for day in days:
+            if day not in closed_weekdays:
+                bitmap |= _span_mask(day, start, end)
+    return Schedule(bitmap, monthly_closures)
+
+
+def open_spans(schedule: Schedule) -> Tuple[Tuple[int, int], ...]:
+    """
+    영업 구간 목록 ((시작, 끝), ...) - 주간 분 단위, SQL 저장용
+
+    일요일 밤 -> 월요일 새벽 구간이 끊기지 않도록 비트맵을 2주 연속으로 펼쳐 구간을 나눕니다.
+    (open_at_spans의 시간대가 구간 하나에 포함되면 영업 중)
+    """
+    if schedule.bitmap is None:
+        return ()
+    bits = schedule.bitmap | (schedule.bitmap << WEEK_MINUTES)
+    spans = []
+    position = 0
+    while bits:
+        zeros = (bits & -bits).bit_length() - 1
+        bits >>= zeros
+        position += zeros
+        ones = (bits ^ (bits + 1)).bit_length() - 1
+        spans.append((position, position + ones))
+        bits >>= ones
+        position += ones
+    return tuple(spans)
+
+
+def open_at_spans(open_at: OpenAt) -> Tuple[Tuple[int, int], ...]:
+    """open_at 시간대 -> 주간 분 단위 (시작, 끝) (open_spans와 비교용, 끝은 다음 주로 넘어갈 수 있음)"""
+    offset = open_at.weekday * MINUTES_PER_DAY
+    return tuple((offset + start, offset + end) for start, end in open_at.windows)
+
+
+def parse_open_at(text: Optional[str], now: Optional[datetime] = None) -> Optional[OpenAt]:
+    """
+    영업 확인 조건 문자열 -> OpenAt (시간을 찾지 못하면 None)
+
+    예: "23:00–23:15, 03:00–03:15" (meal_window 그대로), "12:30", "토 12:00~13:00",
+        "2026-10-18 12:00-13:00", "지금"
+    날짜/요일이 없으면 오늘(now) 기준입니다.
+    """
+    if not text or not isinstance(text, str):
+        return None
+    now = now or datetime.now()
+    text = text.strip()
+
+    if text in ("지금", "now"):
+        text = now.strftime("%H:%M")
+
+    date = now.date()
+    weekday = now.weekday()
+    date_known = True
+    date_match = _DATE.search(text)
+    if date_match:
+        try:
+            date = datetime(*map(int, date_match.groups())).date()
+        except ValueError:
+            return None
+        weekday = date.weekday()
+        text = text[:date_match.start()] + text[date_match.end():]
+    else:
+        weekday_match = _WEEKDAY_PREFIX.match(text)
+        if weekday_match:
+            weekday = WEEKDAYS.index(weekday_match.group(1))
+            date_known = False
+            text = text[weekday_match.end():]
+
+    windows = []
+    for match in _WINDOW.finditer(text):
+        start = _minutes(match.group(1), match.group(2))
+        end = _minutes(match.group(3), match.group(4)) if match.group(3) else start + 1
+        if start >= MINUTES_PER_DAY or end > MINUTES_PER_DAY:
+            continue
+        if end <= start:
+            end += MINUTES_PER_DAY
+        windows.append((start, end))
+    if not windows:
+        return None
+
+    masks = tuple(_span_mask(weekday, start, end) for start, end in windows)
+    if not date_known:
+        return OpenAt(weekday, None, False, tuple(windows), masks)
+    days_in_month = calendar.monthrange(date.year, date.month)[1]
+    return OpenAt(weekday, (date.day - 1) // 7 + 1, date.day + 7 > days_in_month, tuple(windows), masks)
+
+
+def is_open(schedule: Schedule, open_at: OpenAt) -> bool:
+    """
+    open_at 시간대 중 하나를 처음부터 끝까지 영업하는지
+    (영업시간 정보가 없는 식당은 판단할 수 없으므로 통과)
+    """
+    if schedule.bitmap is None:
+        return True
+    for week, weekday in schedule.monthly_closures:
+        if weekday == open_at.weekday and (
+            week == open_at.week_of_month or (week == -1 and open_at.last_week)
+        ):
+            return False
+    bitmap = schedule.bitmap
+    return any(bitmap & mask == mask for mask in open_at.masks)
+
+
+def describe_open_at(open_at: OpenAt) -> str:
+    """검색 결과 표시용 - "토요일 23:00~23:15, 03:00~03:15\""""
+    windows = ", ".join(
+        f"{start // 60 % 24:02d}:{start % 60:02d}~{end // 60 % 24:02d}:{end % 60:02d}"
+        for start, end in open_at.windows
+    )
+    return f"{WEEKDAYS[open_at.weekday]}요일 {windows}"
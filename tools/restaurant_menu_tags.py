@@ -0,0 +1,272 @@
+"""
+식당 메뉴 알레르기/식단 태그
+식당_DB.json 메뉴명을 사전(LEXICON)으로 태깅해 비트마스크로 저장하고,
+search_restaurants의 exclude_allergens / diet 필터에 사용 (LLM 호출 없이 명백히 위험한 메뉴 제외)
+
+태그 규칙:
+    - 메뉴명에서 사전 단어를 찾아 태그를 붙임 (긴 단어 우선 - "복수육"은 돼지고기가 아닌 생선)
+    - "회", "면" 같은 한 글자 단어는 단독으로 쓰였을 때만 태그 ("면세", "협회"는 무관)
+    - 세부 태그는 상위 태그도 함께 붙음 (새우 -> 갑각류 + 해산물, 족발 -> 돼지고기 + 육류)
+    - "비건/콩단백", "GF/글루텐프리", "저염", "저당" 표시는 해당 태그를 지움
+    - "정식", "4인" 처럼 재료를 알 수 없는 메뉴는 식당 이름/설명의 재료 태그를 물려받음 (음료 제외)
+    - 사전에 없는 재료는 알 수 없으므로 필터를 통과 (최종 판단은 LLM 심사)
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# 태그 순서 = 비트 번호 (순서를 바꾸면 저장된 마스크와 맞지 않으므로 뒤에만 추가)
+MENU_TAGS = (
+    "갑각류", "조개류", "생선", "연체류", "해산물",
+    "유제품", "계란", "밀", "대두", "견과류", "메밀",
+    "돼지고기", "소고기", "닭고기", "육류",
+    "고당", "고염",
+)
+TAG_BITS = {tag: 1 << k for k, tag in enumerate(MENU_TAGS)}
+
+# 세부 태그 -> 상위 태그
+PARENT_TAGS = {
+    "갑각류": "해산물", "조개류": "해산물", "생선": "해산물", "연체류": "해산물",
+    "돼지고기": "육류", "소고기": "육류", "닭고기": "육류",
+}
+
+# 재료 태그 (고당/고염 제외) - 식당 정보에서 물려받는 대상
+INGREDIENT_MASK = sum(bit for tag, bit in TAG_BITS.items() if tag not in ("고당", "고염"))
+
+# 태그 -> 메뉴명 단어 (공백 제거, 소문자 기준)
+LEXICON = {
+    "갑각류": ("새우", "대하", "랍스터", "랍스타", "가재", "꽃게", "대게", "홍게", "털게", "킹크랩", "크랩",
+            "게장", "게살", "게찜", "게탕", "쉬림프", "에비", "해물", "짬뽕"),
+    "조개류": ("조개", "홍합", "생굴", "굴전", "굴국", "굴찜", "굴보쌈", "전복", "꼬막", "가리비", "바지락", "키조개", "소라", "보말", "재첩",
+            "관자", "백합", "대합", "해물", "짬뽕"),
+    "생선": ("생선", "물회", "모듬회", "모둠회", "회덮밥", "회무침", "회정식", "활어", "세꼬시", "연어", "참치", "장어", "복어", "복국", "복매운탕", "복튀김", "복껍질", "복지리", "황복", "매운탕",
+           "우럭", "광어", "방어", "삼치", "고등어", "갈치", "대구", "명태", "황태", "북어", "코다리",
+           "동태", "아구", "아귀", "조기", "도미", "농어", "민어", "멸치", "물메기", "꽁치", "전어", "숭어",
+           "가자미", "임연수", "초밥", "스시", "사시미", "어묵", "오뎅", "피쉬", "명란"),
+    "연체류": ("오징어", "낙지", "낚지", "문어", "연포탕", "물꾸럭", "쭈꾸미", "주꾸미", "한치", "꼴뚜기", "해삼", "해물", "짬뽕"),
+    "해산물": ("해산물", "씨푸드", "멍게"),
+    "유제품": ("치즈", "크림", "우유", "밀크", "버터", "요거트", "요구르트", "라떼", "피자", "리소토", "알프레도",
+            "까르보나라", "카르보나라", "파르페", "그라탕", "라자냐", "케이크", "크루아상", "파운드", "카프레제"),
+    "계란": ("계란", "달걀", "에그", "오믈렛", "오므라이스", "마요", "지단", "스크램블", "카스테라",
+           "까스", "가스", "커틀릿", "텐더"),
+    "밀": ("밀면", "소면", "쫄면", "냉면", "비빔면", "볶음면", "탕면", "면발", "면옥", "탄탄멘", "국수", "수제비", "라면", "라멘", "우동", "짬뽕", "짜장", "자장", "파스타", "알리오올리오", "알리오에올리오", "스파게티", "라자냐",
+          "볼로네제", "피자", "빵", "크루아상", "파운드", "케이크", "버거", "샌드위치", "토스트", "튀김",
+          "까스", "가스", "만두", "파전", "부침", "포카치아", "와플", "크로플", "도넛", "텐더", "쿠키",
+          "베이글", "누들", "통밀"),
+    "대두": ("두부", "콩나물", "콩물", "콩국", "콩단백", "된장", "청국장", "유부", "두유", "비지", "낫토", "에다마메"),
+    "견과류": ("땅콩", "아몬드", "호두", "잣죽", "잣국수", "캐슈", "피스타치오", "마카다미아", "헤이즐넛", "견과", "피칸"),
+    "메밀": ("메밀", "막국수", "소바", "냉면"),
+    "돼지고기": ("돼지", "삼겹", "오겹", "목살", "항정", "족발", "족뱅이", "보쌈", "수육", "제육", "순대", "암뽕",
+             "감자탕", "뼈해장", "돈가스", "돈까스", "베이컨", "소시지", "불백", "동파육", "홍소육", "육슬",
+             "편육", "차슈", "돈코츠", "두루치기", "갈매기살", "오돌"),
+    "소고기": ("소고기", "쇠고기", "한우", "우삼겹", "차돌", "등심", "안심", "부채살", "소갈비", "육회", "불고기",
+            "양지", "사태", "곰탕", "설렁탕", "꼬리", "도가니", "육개장", "떡갈비", "갈비찜", "비프", "규동",
+            "샤브", "미트"),
+    "닭고기": ("닭", "꼬꼬", "치킨", "삼계탕", "옻닭", "너겟", "윙봉"),
+    "육류": ("고기", "갈비", "육류", "육전", "육포", "육국수", "육즙", "오리", "백숙", "스테이크", "바비큐", "양꼬치", "양갈비", "곱창", "막창", "대창", "햄"),
+    "고당": ("케이크", "빵", "파운드", "아이스크림", "파르페", "요거트", "빙수", "에이드", "주스", "스무디",
+           "음료", "콜라", "사이다", "시럽", "꿀", "초코", "초콜릿", "와플", "크로플", "마카롱", "도넛",
+           "호떡", "약과", "양념치킨", "강정", "떡볶이", "디저트", "쿠키", "푸딩", "타르트", "짜장", "자장"),
+    "고염": ("찌개", "탕", "전골", "국밥", "복국", "해장국", "순대국", "미역국", "짬뽕", "짜장", "라면", "라멘", "우동",
+           "칼국수", "수제비", "자장", "젓갈", "장아찌", "게장", "김치", "조림", "부대", "떡볶이", "족발", "햄",
+           "소시지", "베이컨", "청국장", "된장", "소금구이", "훈제", "자반", "명란", "어묵", "짜글이", "피자"),
+}
+
+# 단독 토큰일 때만 태그하는 한 글자 단어 (다른 단어 안에서는 무관한 경우가 많음: "면세", "협회", "렌틸콩")
+# 이 단어가 들어간 메뉴명은 LEXICON에 합성어로 등록 ("물회", "밀면", "콩나물")
+TOKEN_LEXICON = {
+    "생선": ("회",),
+    "조개류": ("굴",),
+    "밀": ("면",),
+    "대두": ("콩",),
+    "견과류": ("잣",),
+    "닭고기": ("윙",),
+    "육류": ("육",),
+}
+
+# 예외 표현 -> 태그 (사전 단어보다 먼저 찾고, 찾은 부분은 다른 단어로 다시 해석하지 않음)
+EXCEPTIONS = {
+    "고갈비": ("생선",),               # 고등어 구이
+    "고갈비살": ("육류",),
+    "복수육": ("생선",),
+    "탕수육": ("돼지고기", "밀", "고당"),
+    "맛탕": ("고당",),
+    "사탕": ("고당",),
+    "크림생맥주": (),
+    "돈부리": (),
+    "오리지널": (),
+    "햄버거": ("밀",),
+    "굴비": ("생선", "고염"),
+    "복숭아": ("고당",),
+    "오리불고기": ("육류",),
+    "닭불고기": ("닭고기",),
+    "고추장불고기": ("돼지고기",),
+    "염소불고기": ("육류",),
+    "쭈삼불고기": ("연체류", "돼지고기"),   # 쭈꾸미 + 삼겹살
+    "두부스테이크": ("대두",),
+    "연어스테이크": ("생선",),
+    "콜리플라워": (),
+    "가스파초": (),
+    "회오리": (),
+}
+
+# 표시가 있으면 지우는 태그
+TAG_REMOVERS = {
+    ("비건", "콩단백", "식물성", "채식"): ("갑각류", "조개류", "생선", "연체류", "해산물",
+                                  "유제품", "계란", "돼지고기", "소고기", "닭고기", "육류"),
+    ("gf", "글루텐프리"): ("밀",),
+    ("저염",): ("고염",),
+    ("저당", "무가당", "슈가프리"): ("고당",),
+}
+
+# 식당 정보에서 재료를 물려받지 않는 메뉴 (음료)
+DRINK_WORDS = ("음료", "커피", "아메리카노", "라떼", "에스프레소", "주스", "에이드", "맥주", "소주", "막걸리",
+               "와인", "콜라", "사이다", "녹차", "홍차", "밀크티", "아이스티", "모과차", "유자차", "대추차",
+               "생강차", "쌍화차", "식혜", "수정과")
+
+# 필터 입력 표현 -> 제외 태그
+ALLERGEN_ALIASES = {
+    **{tag: (tag,) for tag in MENU_TAGS},
+    "새우": ("갑각류",), "게": ("갑각류",), "랍스터": ("갑각류",),
+    "조개": ("조개류",), "굴": ("조개류",), "패류": ("조개류",),
+    "생선": ("생선",), "어류": ("생선",),
+    "오징어": ("연체류",), "낙지": ("연체류",), "문어": ("연체류",),
+    "해물": ("해산물",),
+    "우유": ("유제품",), "유당": ("유제품",), "치즈": ("유제품",), "크림": ("유제품",), "버터": ("유제품",), "락토스": ("유제품",),
+    "달걀": ("계란",), "난류": ("계란",),
+    "밀가루": ("밀",), "글루텐": ("밀",),
+    "콩": ("대두",), "두부": ("대두",),
+    "땅콩": ("견과류",), "견과": ("견과류",), "호두": ("견과류",), "아몬드": ("견과류",),
+    "돼지": ("돼지고기",), "닭": ("닭고기",), "고기": ("육류",),
+}
+
+# 식단 -> 제외 태그
+DIET_EXCLUDES = {
+    "비건": ("육류", "해산물", "유제품", "계란"),
+    "락토오보": ("육류", "해산물"),
+    "락토": ("육류", "해산물", "계란"),
+    "오보": ("육류", "해산물", "유제품"),
+    "채식": ("육류", "해산물"),
+    "베지테리언": ("육류", "해산물"),
+    "페스코": ("육류",),
+    "저염": ("고염",),
+    "저나트륨": ("고염",),
+    "고혈압": ("고염",),
+    "저당": ("고당",),
+    "당뇨": ("고당",),
+    "글루텐프리": ("밀",),
+    "키토": ("밀", "고당"),
+    "저탄수": ("밀", "고당"),
+    "할랄": ("돼지고기",),
+}
+# 구체적인 식단 이름과 함께 쓰이면 무시하는 일반 표현 ("페스코 채식주의자"는 페스코)
+GENERIC_DIETS = ("채식", "베지테리언")
+SPECIFIC_DIETS = ("비건", "락토오보", "락토", "오보", "페스코")
+
+
+def _alternation(words) -> str:
+    # 긴 단어 우선 (정규식 대안은 앞에서부터 시도)
+    return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+
+
+_WORD_TAGS: Dict[str, int] = {}
+for _tag, _words in LEXICON.items():
+    for _word in _words:
+        _WORD_TAGS[_word] = _WORD_TAGS.get(_word, 0) | TAG_BITS[_tag]
+# 긴 단어가 짧은 단어를 가리므로 포함된 단어의 태그도 합침 ("칼국수" = 칼국수 + 국수)
+_WORD_TAGS = {
+    word: mask | sum(other_mask for other, other_mask in _WORD_TAGS.items() if other != word and other in word)
+    for word, mask in _WORD_TAGS.items()
+}
+for _word, _tags in EXCEPTIONS.items():
+    _WORD_TAGS[_word] = sum(TAG_BITS[tag] for tag in _tags)
+_WORD_PATTERN = re.compile(_alternation(_WORD_TAGS))
+_TOKEN_TAGS = {word: TAG_BITS[tag] for tag, words in TOKEN_LEXICON.items() for word in words}
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]+")   # 공백/기호/숫자로 나눈 단어
+_DRINK_PATTERN = re.compile(_alternation(DRINK_WORDS))
+_ALLERGEN_PATTERN = re.compile(_alternation(ALLERGEN_ALIASES))
+_DIET_PATTERN = re.compile(_alternation(DIET_EXCLUDES))
+
+
+def _with_parents(mask: int) -> int:
+    for child, parent in PARENT_TAGS.items():
+        if mask & TAG_BITS[child]:
+            mask |= TAG_BITS[parent]
+    return mask
+
+
+def _tags_mask(tags) -> int:
+    return sum(TAG_BITS[tag] for tag in set(tags))
+
+
+def _normalize(text: Optional[str]) -> str:
+    return re.sub(r"\s+", "", text or "").lower()
+
+
+@lru_cache(maxsize=16384)
+def tag_text(text: Optional[str]) -> int:
+    """문자열 -> 태그 비트마스크 (사전 단어 + 단독 한 글자 단어 + 예외 표현 + 제거 표시)"""
+    compact = _normalize(text)
+    mask = 0
+    for match in _WORD_PATTERN.finditer(compact):
+        mask |= _WORD_TAGS[match.group()]
+    for token in _TOKEN_PATTERN.findall((text or "").lower()):
+        mask |= _TOKEN_TAGS.get(token, 0)
+    mask = _with_parents(mask)
+    for markers, removed in TAG_REMOVERS.items():
+        if any(marker in compact for marker in markers):
+            mask &= ~_tags_mask(removed)
+    return mask
+
+
+def menu_tag_mask(
+    menu_name: Optional[str],
+    restaurant_name: Optional[str] = None,
+    restaurant_desc: Optional[str] = None
+) -> int:
+    """
+    메뉴 태그 - 메뉴명에서 재료를 알 수 없으면 식당 이름/설명의 재료 태그를 물려받음
+
+    Args:
+        menu_name: 메뉴명
+        restaurant_name: 식당 이름 (선택)
+        restaurant_desc: 식당 설명 (선택)
+    """
+    mask = tag_text(menu_name)
+    if mask & INGREDIENT_MASK or not (restaurant_name or restaurant_desc):
+        return mask
+    if _DRINK_PATTERN.search(_normalize(menu_name)):
+        return mask
+    return mask | (tag_text(restaurant_name) & INGREDIENT_MASK) | (tag_text(restaurant_desc) & INGREDIENT_MASK)
+
+
+def tag_names(mask: int) -> List[str]:
+    """비트마스크 -> 태그 이름 목록 (MENU_TAGS 순서)"""
+    return [tag for tag in MENU_TAGS if mask & TAG_BITS[tag]]
+
+
+def parse_exclusions(exclude_allergens: Optional[str] = "", diet: Optional[str] = "") -> Tuple[int, List[str]]:
+    """
+    필터 입력 -> (제외 태그 마스크, 적용한 제외 태그 이름 목록)
+
+    사용자 정보 문자열을 그대로 받아도 되도록 알려진 표현만 골라냅니다.
+    예: "유당불내증(우유·치즈·크림 주의)" -> 유제품, "락토오보 (유제품과 계란은 가능...)" -> 육류, 해산물
+    """
+    mask = 0
+    for match in _ALLERGEN_PATTERN.finditer(_normalize(exclude_allergens if isinstance(exclude_allergens, str) else "")):
+        mask |= _tags_mask(ALLERGEN_ALIASES[match.group()])
+    # 식단은 이름만 찾고, 설명에 나온 재료 단어는 무시
+    for term in diet_terms(diet):
+        mask |= _tags_mask(DIET_EXCLUDES[term])
+    return mask, tag_names(mask)
+
+
+def diet_terms(text: Optional[str]) -> List[str]:
+    """문자열에 나온 식단/건강 제한 이름 (DIET_EXCLUDES 키, 등장 순서, 중복 제거)"""
+    terms = []
+    for match in _DIET_PATTERN.finditer(_normalize(text if isinstance(text, str) else "")):
+        if match.group() not in terms:
+            terms.append(match.group())
+    if any(term in SPECIFIC_DIETS for term in terms):
+        terms = [term for term in terms if term not in GENERIC_DIETS]
+    return terms
@@ -0,0 +1,327 @@
+"""
+식당 DB 바이너리 스냅샷
+식당_DB.json을 문자열 테이블 + 고정 폭 컬럼 파일로 변환하고, mmap으로 열어 필요한 값만 읽음
+
+빌드:
+    python -m tools.restaurant_snapshot
+
+파일 구조 (리틀 엔디언):
+    헤더      magic(8) | version(u32) | 섹션 수(u32) | 원본 JSON mtime_ns(i64) | 원본 JSON 크기(i64)
+    섹션 목록  이름(16) | array typecode(4) | 오프셋(i64) | 원소 수(i64)
+    섹션 본문  8바이트 정렬된 array 데이터
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.restaurant_hours import compile_schedule
+from tools.restaurant_tools import (
+    DB_PATH,
+    SNAPSHOT_PATH,
+    TIME_KEYS,
+    RestaurantIndex,
+)
+
+MAGIC = b"RSTSNAP\x00"
+VERSION = 2  # 2: 메뉴 태그 컬럼 (m_tags) 추가
+HEADER = struct.Struct("<8sIIqq")
+SECTION = struct.Struct("<16s4sqq")
+
+NULL_STRING = 0xFFFFFFFF  # 문자열 id 자리의 None
+NULL_INT = -(2 ** 63)      # 정수 컬럼 자리의 None
+
+# 식당 문자열 필드 (원본 JSON 키 순서 유지)
+RESTAURANT_STRING_FIELDS = {
+    "r_name": "name",
+    "r_desc": "desc",
+    "r_hours": "hours",
+    "r_holidays": "holidays",
+    "r_delivery_text": TIME_KEYS["배달"],
+    "r_dine_in_text": TIME_KEYS["매장"],
+}
+
+
+class _StringTable:
+    """중복 제거 문자열 테이블 (빌드용)"""
+
+    def __init__(self):
+        self.ids = {}
+        self.offsets = array("Q", [0])
+        self.blob = bytearray()
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return NULL_STRING
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.offsets) - 1
+            self.ids[value] = string_id
+            self.blob += value.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def write_snapshot(index: RestaurantIndex, path: Path, source_signature: Optional[tuple] = None) -> Path:
+    """
+    RestaurantIndex를 바이너리 스냅샷으로 저장
+
+    Args:
+        index: JSON에서 구축한 인덱스
+        path: 저장 경로
+        source_signature: 원본 JSON의 (mtime_ns, size) - 스냅샷 최신 여부 확인용
+    """
+    strings = _StringTable()
+    columns = {name: array("I") for name in RESTAURANT_STRING_FIELDS}
+    columns.update({
+        "r_id": array("q"),
+        "r_search_text": array("I"),
+        "r_menu_start": array("I", [0]),
+        "r_delivery_min": index.delivery_minutes,
+        "r_dine_in_min": index.dine_in_minutes,
+        "r_min_price": index.min_price,
+        "r_avg_price": index.avg_price,
+        "m_name": array("I"),
+        "m_price_krw": array("I"),
+        "m_price": array("q"),
+        "m_parsed_price": array("q"),
+        "m_prefix": array("q", [0]),
+        "m_tags": array("I"),
+        "g_gram": array("I"),
+        "g_start": array("I", [0]),
+        "g_ids": array("i"),
+        "d_prices": index.distinct_prices,
+        "d_delivery_min": index.distinct_delivery_minutes,
+        "d_dine_in_min": index.distinct_dine_in_minutes,
+    })
+
+    for i, restaurant in enumerate(index.restaurants):
+        restaurant_id = restaurant.get("id")
+        columns["r_id"].append(restaurant_id if isinstance(restaurant_id, int) else NULL_INT)
+        for column, key in RESTAURANT_STRING_FIELDS.items():
+            columns[column].append(strings.add(restaurant.get(key)))
+        columns["r_search_text"].append(strings.add(index.search_texts[i]))
+
+        # 메뉴는 가격순으로 저장 (알레르기/식단 태그는 빌드 시 계산한 값)
+        columns["m_tags"].extend(index.menu_tags[i])
+        for menu, parsed_price in zip(index.sorted_menus[i], index.sorted_prices[i]):
+            price = menu.get("price")
+            columns["m_name"].append(strings.add(menu.get("name")))
+            columns["m_price_krw"].append(strings.add(menu.get("price_krw")))
+            columns["m_price"].append(price if isinstance(price, int) else NULL_INT)
+            columns["m_parsed_price"].append(parsed_price)
+            columns["m_prefix"].append(columns["m_prefix"][-1] + parsed_price)
+        columns["r_menu_start"].append(len(columns["m_name"]))
+
+    for gram, ids in index.keyword_postings.items():
+        columns["g_gram"].append(strings.add(gram))
+        columns["g_ids"].extend(ids)
+        columns["g_start"].append(len(columns["g_ids"]))
+
+    columns["s_offsets"] = strings.offsets
+    columns["s_blob"] = array("B", bytes(strings.blob))
+
+    # 섹션 배치 (8바이트 정렬)
+    mtime_ns, size = source_signature or (0, -1)
+    offset = HEADER.size + SECTION.size * len(columns)
+    sections = []
+    for name, values in columns.items():
+        offset = (offset + 7) & ~7
+        sections.append((name, values, offset))
+        offset += len(values) * values.itemsize
+
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(sections), mtime_ns, size))
+        for name, values, section_offset in sections:
+            f.write(SECTION.pack(name.encode("ascii"), values.typecode.encode("ascii"), section_offset, len(values)))
+        for name, values, section_offset in sections:
+            f.write(b"\x00" * (section_offset - f.tell()))
+            values.tofile(f)
+    tmp_path.replace(path)  # 읽는 쪽이 쓰다 만 파일을 보지 않도록 교체
+    return path
+
+
+class _LazySequence:
+    """i번째 원소를 접근할 때 만드는 읽기 전용 시퀀스"""
+
+    def __init__(self, length: int, getter: Callable[[int], Any]):
+        self._length = length
+        self._getter = getter
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, i: int) -> Any:
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError(i)
+        return self._getter(i)
+
+    def __iter__(self):
+        return (self._getter(i) for i in range(self._length))
+
+
+class SnapshotRestaurantIndex(RestaurantIndex):
+    """
+    mmap 스냅샷 기반 RestaurantIndex
+
+    숫자 컬럼은 파일을 그대로 가리키는 memoryview이고,
+    식당/메뉴 dict와 문자열은 접근할 때만 만듭니다.
+    (메뉴 목록은 가격순 - 원본 JSON 순서는 보존하지 않음)
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, section_count, mtime_ns, size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식: {path}")
+        self.source_signature = (mtime_ns, size) if size >= 0 else None
+
+        buffer = memoryview(self._mmap)
+        columns = {}
+        for k in range(section_count):
+            name, typecode, offset, count = SECTION.unpack_from(self._mmap, HEADER.size + SECTION.size * k)
+            typecode = typecode.rstrip(b"\x00").decode("ascii")
+            itemsize = array(typecode).itemsize
+            columns[name.rstrip(b"\x00").decode("ascii")] = buffer[offset:offset + count * itemsize].cast(typecode)
+        self._columns = columns
+
+        self._string_offsets = columns["s_offsets"]
+        self._string_blob = columns["s_blob"]
+        self._menu_start = columns["r_menu_start"]
+        self._price_prefix = columns["m_prefix"]
+        self._parsed_prices = columns["m_parsed_price"]
+        count = len(columns["r_id"])
+
+        self.delivery_minutes = columns["r_delivery_min"]
+        self.dine_in_minutes = columns["r_dine_in_min"]
+        self.min_price = columns["r_min_price"]
+        self.avg_price = columns["r_avg_price"]
+        self.distinct_prices = columns["d_prices"]
+        self.distinct_delivery_minutes = columns["d_delivery_min"]
+        self.distinct_dine_in_minutes = columns["d_dine_in_min"]
+
+        self.restaurants = _LazySequence(count, self._restaurant)
+        self.sorted_menus = _LazySequence(count, self._menus)
+        self.sorted_prices = _LazySequence(count, self._prices)
+        self.search_texts = _LazySequence(count, lambda i: self._string(columns["r_search_text"][i]))
+        self.menu_tags = _LazySequence(count, self._menu_tags)
+        self.schedules = _LazySequence(
+            count,
+            lambda i: compile_schedule(self._string(columns["r_hours"][i]), self._string(columns["r_holidays"][i]))
+        )
+
+        # n-gram -> posting (파일을 가리키는 memoryview 슬라이스)
+        gram_start, gram_ids = columns["g_start"], columns["g_ids"]
+        self.keyword_postings = {
+            self._string(string_id): gram_ids[gram_start[k]:gram_start[k + 1]]
+            for k, string_id in enumerate(columns["g_gram"])
+        }
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == NULL_STRING:
+            return None
+        return str(self._string_blob[self._string_offsets[string_id]:self._string_offsets[string_id + 1]], "utf-8")
+
+    def _prices(self, i: int):
+        return self._parsed_prices[self._menu_start[i]:self._menu_start[i + 1]]
+
+    def _menus(self, i: int) -> List[Dict[str, Any]]:
+        columns = self._columns
+        menus = []
+        for k in range(self._menu_start[i], self._menu_start[i + 1]):
+            price = columns["m_price"][k]
+            menus.append({
+                "name": self._string(columns["m_name"][k]),
+                "price": None if price == NULL_INT else price,
+                "price_krw": self._string(columns["m_price_krw"][k]),
+            })
+        return menus
+
+    def _menu_tags(self, i: int):
+        return self._columns["m_tags"][self._menu_start[i]:self._menu_start[i + 1]]
+
+    def _restaurant(self, i: int) -> Dict[str, Any]:
+        columns = self._columns
+        restaurant_id = columns["r_id"][i]
+        restaurant = {"id": None if restaurant_id == NULL_INT else restaurant_id}
+        for column, key in RESTAURANT_STRING_FIELDS.items():
+            restaurant[key] = self._string(columns[column][i])
+        restaurant["menu"] = self._menus(i)
+        return restaurant
+
+    def affordable_count(self, i: int, max_budget: int) -> int:
+        start = self._menu_start[i]
+        return bisect_right(self._parsed_prices, max_budget, start, self._menu_start[i + 1]) - start
+
+    def candidates(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        ids: Optional[List[int]] = None
+    ) -> List[tuple]:
+        # 식당별 슬라이스를 만들지 않고 컬럼을 직접 비교
+        minutes = self.minutes(meal_type)
+        menu_start, min_price = self._menu_start, self.min_price
+        result = []
+        for i in (range(len(minutes)) if ids is None else ids):
+            if menu_start[i] == menu_start[i + 1] or minutes[i] > max_time_minutes or min_price[i] > max_budget:
+                continue
+            result.append((i, minutes[i], self.affordable_count(i, max_budget)))
+        return result
+
+    def find_by_name(self, name_lower: str) -> Optional[int]:
+        # 식당 dict를 만들지 않고 이름 컬럼만 확인
+        for i, string_id in enumerate(self._columns["r_name"]):
+            if name_lower in (self._string(string_id) or "").lower():
+                return i
+        return None
+
+    def affordable_avg_price(self, i: int, count: int) -> float:
+        start = self._menu_start[i]
+        return (self._price_prefix[start + count] - self._price_prefix[start]) / count
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH, source_signature: Optional[tuple] = None) -> Optional[SnapshotRestaurantIndex]:
+    """
+    스냅샷 로드 - 없거나 원본 JSON보다 오래되었으면 None
+    (오래된 스냅샷은 restaurant_tools가 JSON 인덱스로 다시 저장)
+
+    Args:
+        source_signature: 현재 원본 JSON의 (mtime_ns, size). None이면 최신 여부 확인 생략
+    """
+    if not Path(path).exists():
+        return None
+    index = SnapshotRestaurantIndex(path)
+    if source_signature is not None and index.source_signature != source_signature:
+        print(f"⚠️ 레스토랑 DB 스냅샷이 식당_DB.json보다 오래됨 - JSON으로 다시 빌드 ({path})")
+        return None
+    return index
+
+
+def build_snapshot(json_path: Path = DB_PATH, snapshot_path: Path = SNAPSHOT_PATH) -> Path:
+    """식당_DB.json -> 바이너리 스냅샷 (오프라인 빌드)"""
+    stat = Path(json_path).stat()
+    with open(json_path, "r", encoding="utf-8") as f:
+        restaurants = json.load(f)
+    index = RestaurantIndex(restaurants)
+    return write_snapshot(index, snapshot_path, (stat.st_mtime_ns, stat.st_size))
+
+
+if __name__ == "__main__":
+    path = build_snapshot()
+    print(f"✅ 레스토랑 DB 스냅샷 생성: {path} ({path.stat().st_size:,} bytes)")
@@ -0,0 +1,402 @@
+"""
+식당 DB SQLite 저장소
+RESTAURANT_BACKEND=sqlite 일 때 사용 - 예산/시간/키워드 필터와 상위 k개 정렬을 SQL로 처리
+(DB 파일은 읽기 전용으로 열어 여러 워커 프로세스가 공유)
+
+빌드:
+    python -m tools.restaurant_sqlite
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 프로젝트 루트를 Python path에 추가
+sys.path.append(str(Path(__file__).parent.parent))
+
+from tools.restaurant_hours import OpenAt, open_at_spans, open_spans
+from tools.restaurant_tools import (
+    DB_PATH,
+    SQLITE_PATH,
+    TIME_KEYS,
+    FIELD_SEPARATOR,
+    RestaurantIndex,
+)
+
+# 저장 형식 버전 (다르면 다시 빌드) - 2: 메뉴 태그 컬럼 (menus.tag_mask), 3: 영업 구간 테이블 (open_spans)
+SCHEMA_VERSION = 3
+
+# FTS5 trigram은 3글자 이상 키워드만 색인으로 찾을 수 있음
+FTS_MIN_KEYWORD_LENGTH = 3
+
+# SQLite 문자열은 \x00에서 잘리므로 검색 텍스트 필드 구분자를 바꿔 저장
+SQLITE_FIELD_SEPARATOR = "\x1f"
+
+# meal_type -> 소요시간 컬럼
+MINUTES_COLUMNS = {True: "delivery_minutes", False: "dine_in_minutes"}
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE restaurants (
+    idx INTEGER PRIMARY KEY,          -- 식당_DB.json 내 순서
+    id INTEGER,
+    name TEXT,
+    desc TEXT,
+    hours TEXT,
+    holidays TEXT,
+    delivery_text TEXT,
+    dine_in_text TEXT,
+    name_lower TEXT,
+    search_text TEXT,                 -- 이름/설명/메뉴명 (소문자, 구분자 연결)
+    delivery_minutes INTEGER,
+    dine_in_minutes INTEGER,
+    menu_count INTEGER,
+    min_price INTEGER,
+    has_hours INTEGER                 -- 영업시간 정보 유무 (없으면 open_at 필터 통과)
+);
+CREATE TABLE menus (
+    restaurant_idx INTEGER,
+    position INTEGER,                 -- 가격순 순서
+    name TEXT,
+    price INTEGER,
+    price_krw TEXT,
+    parsed_price INTEGER,
+    tag_mask INTEGER,                 -- 알레르기/식단 태그 비트마스크 (빌드 시 계산)
+    PRIMARY KEY (restaurant_idx, position)
+) WITHOUT ROWID;
+CREATE TABLE open_spans (             -- 영업 구간 (주간 분 단위, 2주로 펼침 - restaurant_hours.open_spans)
+    restaurant_idx INTEGER,
+    start_minute INTEGER,
+    end_minute INTEGER,
+    PRIMARY KEY (restaurant_idx, start_minute)
+) WITHOUT ROWID;
+CREATE TABLE monthly_closures (       -- 매월 정기휴무 (n째주, 요일)
+    restaurant_idx INTEGER,
+    week INTEGER,
+    weekday INTEGER
+);
+CREATE INDEX idx_monthly_closures ON monthly_closures (restaurant_idx);
+CREATE INDEX idx_restaurants_delivery ON restaurants (delivery_minutes, min_price);
+CREATE INDEX idx_restaurants_dine_in ON restaurants (dine_in_minutes, min_price);
+CREATE INDEX idx_menus_price ON menus (restaurant_idx, parsed_price);
+CREATE VIRTUAL TABLE restaurant_fts USING fts5(
+    search_text, content='restaurants', content_rowid='idx', tokenize='trigram'
+);
+"""
+
+
+def build_sqlite_store(json_path: Path = DB_PATH, sqlite_path: Path = SQLITE_PATH) -> Path:
+    """식당_DB.json -> SQLite DB (임시 파일에 만든 뒤 교체)"""
+    stat = Path(json_path).stat()
+    with open(json_path, "r", encoding="utf-8") as f:
+        index = RestaurantIndex(json.load(f))
+
+    sqlite_path = Path(sqlite_path)
+    tmp_path = sqlite_path.with_name(f"{sqlite_path.name}.{os.getpid()}.tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("schema_version", str(SCHEMA_VERSION)),
+                ("source_mtime_ns", str(stat.st_mtime_ns)),
+                ("source_size", str(stat.st_size)),
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO restaurants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    r.get("id") if isinstance(r.get("id"), int) else None,
+                    r.get("name"),
+                    r.get("desc"),
+                    r.get("hours"),
+                    r.get("holidays"),
+                    r.get(TIME_KEYS["배달"]),
+                    r.get(TIME_KEYS["매장"]),
+                    (r.get("name") or "").lower(),
+                    index.search_texts[i].replace(FIELD_SEPARATOR, SQLITE_FIELD_SEPARATOR),
+                    index.delivery_minutes[i],
+                    index.dine_in_minutes[i],
+                    len(index.sorted_menus[i]),
+                    index.min_price[i],
+                    index.schedules[i].bitmap is not None,
+                )
+                for i, r in enumerate(index.restaurants)
+            )
+        )
+        # 영업 일정은 빌드 시 구간으로 저장 (검색은 SQL 비교만)
+        conn.executemany(
+            "INSERT INTO open_spans VALUES (?, ?, ?)",
+            ((i, start, end) for i in range(len(index)) for start, end in open_spans(index.schedules[i]))
+        )
+        conn.executemany(
+            "INSERT INTO monthly_closures VALUES (?, ?, ?)",
+            ((i, week, weekday) for i in range(len(index)) for week, weekday in index.schedules[i].monthly_closures)
+        )
+        conn.executemany(
+            "INSERT INTO menus VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    i,
+                    position,
+                    menu.get("name"),
+                    menu.get("price") if isinstance(menu.get("price"), int) else None,
+                    menu.get("price_krw"),
+                    parsed_price,
+                    tags,
+                )
+                for i in range(len(index))
+                for position, (menu, parsed_price, tags) in enumerate(
+                    zip(index.sorted_menus[i], index.sorted_prices[i], index.menu_tags[i])
+                )
+            )
+        )
+        conn.execute("INSERT INTO restaurant_fts (restaurant_fts) VALUES ('rebuild')")
+        conn.commit()
+    finally:
+        conn.close()
+
+    tmp_path.replace(sqlite_path)
+    return sqlite_path
+
+
+class _LazyRows:
+    """i번째 식당/메뉴를 접근할 때 조회하는 읽기 전용 시퀀스"""
+
+    def __init__(self, store: "SQLiteRestaurantStore", getter):
+        self._store = store
+        self._getter = getter
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, i: int):
+        if not 0 <= i < len(self._store):
+            raise IndexError(i)
+        return self._getter(i)
+
+    def __iter__(self):
+        return (self._getter(i) for i in range(len(self._store)))
+
+
+class SQLiteRestaurantStore:
+    """
+    SQLite 기반 식당 저장소 (RestaurantIndex와 같은 search / best_value / find_by_name 제공)
+
+    스레드마다 읽기 전용 연결을 따로 사용합니다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        meta = dict(self._conn().execute("SELECT key, value FROM meta").fetchall())
+        self.schema_version = int(meta.get("schema_version", 1))
+        self.source_signature = (int(meta["source_mtime_ns"]), int(meta["source_size"]))
+        self._count = self._conn().execute("SELECT COUNT(*) FROM restaurants").fetchone()[0]
+        self.restaurants = _LazyRows(self, self._restaurant)
+        self.sorted_menus = _LazyRows(self, self._menus)
+        self.menu_tags = _LazyRows(self, self._menu_tags)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _filters(
+        self,
+        meal_type: str,
+        keyword: str,
+        open_at: Optional[OpenAt] = None,
+        exclude_mask: int = 0
+    ) -> tuple:
+        """공통 WHERE 절 (소요시간 컬럼, 키워드/영업시간/메뉴 태그 조건, 파라미터)"""
+        minutes = MINUTES_COLUMNS[meal_type == "배달"]
+        keyword_lower = keyword.strip().lower()
+        where = f"r.menu_count > 0 AND r.{minutes} <= :max_time AND r.min_price <= :budget"
+        params = {}
+        if keyword_lower:
+            if len(keyword_lower) >= FTS_MIN_KEYWORD_LENGTH:
+                # trigram 색인으로 후보를 찾고 instr로 확인
+                where += " AND r.idx IN (SELECT rowid FROM restaurant_fts WHERE restaurant_fts MATCH :phrase)"
+                params["phrase"] = '"' + keyword_lower.replace('"', '""') + '"'
+            where += " AND instr(r.search_text, :keyword) > 0"
+            params["keyword"] = keyword_lower
+            if FIELD_SEPARATOR in keyword_lower or SQLITE_FIELD_SEPARATOR in keyword_lower:
+                where += " AND 0"
+        if open_at is not None:
+            # 시간대 중 하나가 영업 구간 하나에 포함되고, 그 날이 매월 정기휴무가 아니면 영업 중
+            windows = []
+            for k, (window_start, window_end) in enumerate(open_at_spans(open_at)):
+                windows.append(
+                    f"EXISTS (SELECT 1 FROM open_spans s WHERE s.restaurant_idx = r.idx"
+                    f" AND s.start_minute <= :open_start_{k} AND s.end_minute >= :open_end_{k})"
+                )
+                params[f"open_start_{k}"] = window_start
+                params[f"open_end_{k}"] = window_end
+            where += (
+                " AND (r.has_hours = 0 OR ("
+                "NOT EXISTS (SELECT 1 FROM monthly_closures c WHERE c.restaurant_idx = r.idx"
+                " AND c.weekday = :open_weekday AND (c.week = :open_week OR (c.week = -1 AND :open_last_week)))"
+                f" AND ({' OR '.join(windows)})))"
+            )
+            params.update(
+                open_weekday=open_at.weekday,
+                open_week=open_at.week_of_month,
+                open_last_week=int(open_at.last_week)
+            )
+        if exclude_mask:
+            # 예산 내 메뉴 중 제외 태그가 없는 메뉴가 하나는 있어야 함
+            where += (
+                " AND EXISTS (SELECT 1 FROM menus em WHERE em.restaurant_idx = r.idx AND em.parsed_price <= :budget"
+                " AND (em.tag_mask & :exclude_mask) = 0)"
+            )
+            params["exclude_mask"] = exclude_mask
+        return minutes, where, params
+
+    def search(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        keyword: str = "",
+        limit: int = 10,
+        offset: int = 0,
+        open_at: Optional[OpenAt] = None,
+        exclude_mask: int = 0
+    ) -> tuple:
+        minutes, where, params = self._filters(meal_type, keyword, open_at, exclude_mask)
+        rows = self._conn().execute(
+            f"""
+            SELECT r.idx, r.{minutes},
+                   (SELECT COUNT(*) FROM menus m
+                     WHERE m.restaurant_idx = r.idx AND m.parsed_price <= :budget),
+                   COUNT(*) OVER ()
+              FROM restaurants r
+             WHERE {where}
+             ORDER BY r.{minutes}, r.idx
+             LIMIT :limit OFFSET :offset
+            """,
+            {**params, "budget": max_budget, "max_time": max_time_minutes, "limit": limit, "offset": offset}
+        ).fetchall()
+        if rows:
+            return rows[0][3], [row[:3] for row in rows]
+        return self._total(where, params, max_budget, max_time_minutes, offset), []
+
+    def best_value(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        limit: int = 5,
+        offset: int = 0
+    ) -> tuple:
+        minutes, where, params = self._filters(meal_type, "")
+        rows = self._conn().execute(
+            f"""
+            WITH candidates AS (
+                SELECT r.idx, r.{minutes} AS minutes, COUNT(m.position) AS affordable_count,
+                       CAST(SUM(m.parsed_price) AS REAL) / COUNT(m.position) AS avg_price
+                  FROM restaurants r
+                  JOIN menus m ON m.restaurant_idx = r.idx AND m.parsed_price <= :budget
+                 WHERE {where}
+                 GROUP BY r.idx
+            )
+            SELECT idx, minutes, affordable_count, avg_price,
+                   (:budget - avg_price) / MAX(minutes, 1) AS value_score,
+                   COUNT(*) OVER ()
+              FROM candidates
+             ORDER BY value_score DESC, idx
+             LIMIT :limit OFFSET :offset
+            """,
+            {**params, "budget": max_budget, "max_time": max_time_minutes, "limit": limit, "offset": offset}
+        ).fetchall()
+        if rows:
+            return rows[0][5], [row[:5] for row in rows]
+        return self._total(where, params, max_budget, max_time_minutes, offset), []
+
+    def _total(self, where: str, params: dict, max_budget: int, max_time_minutes: int, offset: int) -> int:
+        """offset이 결과 수를 넘어 빈 페이지가 나왔을 때만 전체 개수를 따로 계산"""
+        if not offset:
+            return 0
+        return self._conn().execute(
+            f"SELECT COUNT(*) FROM restaurants r WHERE {where}",
+            {**params, "budget": max_budget, "max_time": max_time_minutes}
+        ).fetchone()[0]
+
+    def find_by_name(self, name_lower: str) -> Optional[int]:
+        row = self._conn().execute(
+            "SELECT idx FROM restaurants WHERE instr(name_lower, ?) > 0 ORDER BY idx LIMIT 1",
+            (name_lower,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _menus(self, i: int) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT name, price, price_krw FROM menus WHERE restaurant_idx = ? ORDER BY position",
+            (i,)
+        ).fetchall()
+        return [{"name": name, "price": price, "price_krw": price_krw} for name, price, price_krw in rows]
+
+    def _menu_tags(self, i: int) -> List[int]:
+        rows = self._conn().execute(
+            "SELECT tag_mask FROM menus WHERE restaurant_idx = ? ORDER BY position", (i,)
+        ).fetchall()
+        return [tag_mask for (tag_mask,) in rows]
+
+    def _restaurant(self, i: int) -> Dict[str, Any]:
+        row = self._conn().execute(
+            "SELECT id, name, desc, hours, holidays, delivery_text, dine_in_text FROM restaurants WHERE idx = ?",
+            (i,)
+        ).fetchone()
+        restaurant = dict(zip(("id", "name", "desc", "hours", "holidays", TIME_KEYS["배달"], TIME_KEYS["매장"]), row))
+        restaurant["menu"] = self._menus(i)
+        return restaurant
+
+
+def open_sqlite_store(
+    path: Path = SQLITE_PATH,
+    source_signature: Optional[tuple] = None,
+    json_path: Path = DB_PATH
+) -> SQLiteRestaurantStore:
+    """
+    SQLite 저장소 열기 - 파일이 없거나 원본 JSON보다 오래되었거나 저장 형식이 다르면 다시 빌드
+
+    Args:
+        source_signature: 현재 원본 JSON의 (mtime_ns, size). None이면 최신 여부 확인 생략
+        json_path: 다시 빌드할 때 사용할 원본 JSON
+    """
+    path = Path(path)
+    if path.exists():
+        store = SQLiteRestaurantStore(path)
+        if store.schema_version != SCHEMA_VERSION:
+            print(f"🔄 식당 SQLite DB 형식이 다름 (v{store.schema_version}) - 다시 빌드 ({path})")
+        elif source_signature is None or store.source_signature == source_signature:
+            return store
+        else:
+            print(f"🔄 식당 SQLite DB가 식당_DB.json보다 오래됨 - 다시 빌드 ({path})")
+    elif source_signature is None:
+        raise FileNotFoundError(f"식당 SQLite DB와 식당_DB.json이 모두 없습니다: {path}")
+
+    build_sqlite_store(json_path, path)
+    return SQLiteRestaurantStore(path)
+
+
+if __name__ == "__main__":
+    path = build_sqlite_store()
+    print(f"✅ 식당 SQLite DB 생성: {path} ({path.stat().st_size:,} bytes)")
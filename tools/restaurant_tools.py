@@ -1,34 +1,67 @@
 """
 레스토랑 추천 도구 - 식당_DB.json 활용
 """
+import heapq
 import json
 import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from bisect import bisect_right
 from pathlib import Path
 from crewai.tools import tool
 from typing import List, Dict, Any, Optional, Annotated
 from pydantic import Field
 
+from tools.restaurant_hours import OpenAt, compile_schedule, describe_open_at, parse_open_at
+from tools.restaurant_hours import is_open as schedule_is_open
+from tools.restaurant_menu_tags import menu_tag_mask, parse_exclusions
+
 # DB 경로
 DB_PATH = Path(__file__).parent.parent / "식당_DB.json"
 
-# 레스토랑 DB 캐시
-_restaurant_db = None
+# 바이너리 스냅샷 경로 (python -m tools.restaurant_snapshot 으로 생성, 없으면 JSON 사용)
+SNAPSHOT_PATH = Path(os.getenv("RESTAURANT_SNAPSHOT_PATH", str(DB_PATH.with_suffix(".snapshot"))))
 
+# 식당 데이터 백엔드: "memory" (JSON/스냅샷을 메모리 인덱스로) 또는 "sqlite" (필터/정렬을 SQL로 처리)
+RESTAURANT_BACKEND = os.getenv("RESTAURANT_BACKEND", "memory").lower()
+SQLITE_PATH = Path(os.getenv("RESTAURANT_SQLITE_PATH", str(DB_PATH.with_suffix(".sqlite"))))
 
-def _load_restaurant_db() -> List[Dict[str, Any]]:
-    """레스토랑 DB 로드 (캐싱)"""
-    global _restaurant_db
-    
-    if _restaurant_db is None:
-        try:
-            with open(DB_PATH, 'r', encoding='utf-8') as f:
-                _restaurant_db = json.load(f)
-            print(f"✅ 레스토랑 DB 로드 완료: {len(_restaurant_db)}개 식당")
-        except Exception as e:
-            print(f"❌ 레스토랑 DB 로드 실패: {e}")
-            _restaurant_db = []
-    
-    return _restaurant_db
+# meal_type별 소요시간 필드
+TIME_KEYS = {
+    "배달": "배달 예상 소요시간",
+    "매장": "매장 식사 예상 소요시간",
+}
+
+# 키워드 역색인 n-gram 크기 (한글 음절 bigram - 2글자 이상 키워드를 역색인으로 검색)
+KEYWORD_NGRAM_SIZE = 2
+
+# 검색 텍스트 필드 구분자 (필드 경계를 넘는 매칭 방지)
+FIELD_SEPARATOR = "\x00"
+
+# 검색 결과 LRU 캐시 크기 (정규화된 검색 조건 -> 후보 식당 목록)
+SEARCH_CACHE_SIZE = int(os.getenv("RESTAURANT_SEARCH_CACHE_SIZE", "256"))
+
+# 식당_DB.json 변경 감시 주기 (초, 0이면 감시 안 함)
+RESTAURANT_DB_WATCH_INTERVAL = float(os.getenv("RESTAURANT_DB_WATCH_INTERVAL", "5"))
+
+# 검색/추천 도구 한 번에 돌려주는 최대 식당 수 (limit 상한)
+MAX_PAGE_LIMIT = 50
+
+# 레스토랑 DB 캐시 - 검색은 _restaurant_index 스냅샷 하나를 잡고 수행
+# (재로드 시 새 인덱스를 만든 뒤 참조만 교체)
+_restaurant_db = None
+_restaurant_index = None
+_restaurant_db_signature = None  # 로드한 파일의 (mtime_ns, size)
+_failed_db_signature = None      # 로드에 실패한 파일 버전 (같은 버전 재시도 방지)
+_load_lock = threading.Lock()
+_watcher_thread = None
+
+# 검색 결과 캐시 (DB 재로드 시 초기화)
+_search_cache = OrderedDict()
+_search_cache_stats = {"hits": 0, "misses": 0}
+_search_cache_lock = threading.Lock()
 
 
 def _parse_price(price) -> int:
@@ -61,12 +94,499 @@ def _parse_time(time_str: str) -> int:
         return 999
 
 
+def _search_text(restaurant: Dict[str, Any]) -> str:
+    """키워드 검색 대상 텍스트 (식당 이름, 설명, 메뉴명 - 소문자, 구분자로 연결)"""
+    texts = [restaurant.get("name") or "", restaurant.get("desc") or ""]
+    texts.extend(menu.get("name") or "" for menu in restaurant.get("menu") or [])
+    return FIELD_SEPARATOR.join(texts).lower()
+
+
+def _keyword_match(restaurant: Dict[str, Any], keyword_lower: str) -> bool:
+    """식당 이름, 설명, 메뉴명 중 하나에 키워드가 포함되는지 (선형 검사)"""
+    return FIELD_SEPARATOR not in keyword_lower and keyword_lower in _search_text(restaurant)
+
+
+def _schedule(restaurant: Dict[str, Any]):
+    """식당 영업시간/휴무일 -> restaurant_hours.Schedule"""
+    hours, holidays = restaurant.get("hours"), restaurant.get("holidays")
+    return compile_schedule(
+        hours if isinstance(hours, str) else None,
+        holidays if isinstance(holidays, str) else None
+    )
+
+
+def _menu_tags(restaurant: Dict[str, Any], menus: List[Dict[str, Any]]) -> array:
+    """메뉴별 알레르기/식단 태그 비트마스크 (menus 순서)"""
+    def text(value):
+        return value if isinstance(value, str) else None
+    name, desc = text(restaurant.get("name")), text(restaurant.get("desc"))
+    return array("I", (menu_tag_mask(text(menu.get("name")), name, desc) for menu in menus))
+
+
+def _ngrams(text: str, n: int = KEYWORD_NGRAM_SIZE) -> set:
+    """문자 n-gram 집합"""
+    return {text[k:k + n] for k in range(len(text) - n + 1)}
+
+
+class RestaurantIndex:
+    """
+    식당 DB 컬럼형 인덱스 (DB 로드 시 1회 구축)
+    
+    식당 i의 값은 각 컬럼의 i번째 원소에 저장됩니다.
+    검색 시에는 문자열 파싱 없이 정수 배열만 비교합니다.
+    """
+    
+    def __init__(self, restaurants: List[Dict[str, Any]]):
+        self.restaurants = restaurants
+        self.delivery_minutes = array("i")  # 배달 예상 소요시간 (분)
+        self.dine_in_minutes = array("i")   # 매장 식사 예상 소요시간 (분)
+        self.min_price = array("q")         # 최저 메뉴 가격
+        self.avg_price = array("d")         # 전체 메뉴 평균 가격
+        self.sorted_menus = []              # 가격순 메뉴 목록
+        self.sorted_prices = []             # 가격순 메뉴 가격 (array)
+        self.price_prefix = []              # 가격 누적합 (예산 내 평균 계산용)
+        self.search_texts = []              # 키워드 검색 텍스트 (_search_text)
+        self.keyword_postings = {}          # n-gram -> 식당 번호 array (오름차순)
+        self.schedules = []                 # 영업 일정 비트맵 (같은 영업시간 문자열은 객체 공유)
+        self.menu_tags = []                 # 가격순 메뉴별 알레르기/식단 태그 (array)
+        
+        for i, restaurant in enumerate(restaurants):
+            self.delivery_minutes.append(_parse_time(restaurant.get(TIME_KEYS["배달"], "")))
+            self.dine_in_minutes.append(_parse_time(restaurant.get(TIME_KEYS["매장"], "")))
+            
+            menus = sorted(restaurant.get("menu") or [], key=lambda m: _parse_price(m.get("price")))
+            prices = array("q", (_parse_price(m.get("price")) for m in menus))
+            prefix = array("q", [0])
+            for price in prices:
+                prefix.append(prefix[-1] + price)
+            
+            self.sorted_menus.append(menus)
+            self.sorted_prices.append(prices)
+            self.menu_tags.append(_menu_tags(restaurant, menus))
+            self.price_prefix.append(prefix)
+            self.min_price.append(prices[0] if prices else 0)
+            self.avg_price.append(prefix[-1] / len(prices) if prices else 0.0)
+            
+            self.schedules.append(_schedule(restaurant))
+            
+            search_text = _search_text(restaurant)
+            self.search_texts.append(search_text)
+            for gram in _ngrams(search_text):
+                posting = self.keyword_postings.get(gram)
+                if posting is None:
+                    self.keyword_postings[gram] = [i]
+                else:
+                    posting.append(i)
+        
+        self.keyword_postings = {gram: array("i", ids) for gram, ids in self.keyword_postings.items()}
+        
+        # 검색 조건 정규화용 - 결과는 예산/시간이 어느 값 사이에 있는지에만 의존
+        self.distinct_prices = array("q", sorted(set(p for prices in self.sorted_prices for p in prices)))
+        self.distinct_delivery_minutes = array("i", sorted(set(self.delivery_minutes)))
+        self.distinct_dine_in_minutes = array("i", sorted(set(self.dine_in_minutes)))
+    
+    def __len__(self) -> int:
+        return len(self.restaurants)
+    
+    def minutes(self, meal_type: str) -> array:
+        """meal_type에 해당하는 소요시간 컬럼 ("배달"이 아니면 매장)"""
+        return self.delivery_minutes if meal_type == "배달" else self.dine_in_minutes
+    
+    def query_key(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        keyword: str,
+        open_at: Optional[OpenAt] = None,
+        exclude_mask: int = 0
+    ) -> tuple:
+        """
+        검색 결과 캐시 키
+        
+        예산은 DB의 메뉴 가격, 시간은 DB의 소요시간 사이 구간으로 버킷팅합니다.
+        (같은 구간이면 후보 식당과 예산 내 메뉴가 동일)
+        """
+        is_delivery = meal_type == "배달"
+        distinct_minutes = self.distinct_delivery_minutes if is_delivery else self.distinct_dine_in_minutes
+        return (
+            bisect_right(self.distinct_prices, max_budget),
+            bisect_right(distinct_minutes, max_time_minutes),
+            is_delivery,
+            keyword.strip().lower(),
+            open_at,
+            exclude_mask
+        )
+    
+    def affordable_count(self, i: int, max_budget: int) -> int:
+        """식당 i에서 예산 내 메뉴 개수 (가격순 앞에서부터)"""
+        return bisect_right(self.sorted_prices[i], max_budget)
+    
+    def affordable_avg_price(self, i: int, count: int) -> float:
+        """식당 i의 가격순 앞 count개 메뉴 평균 가격"""
+        return self.price_prefix[i][count] / count
+    
+    def is_open(self, i: int, open_at: OpenAt) -> bool:
+        """식당 i가 open_at 시간대에 영업 중인지 (비트맵 AND 1회)"""
+        return schedule_is_open(self.schedules[i], open_at)
+    
+    def has_allowed_menu(self, i: int, count: int, exclude_mask: int) -> bool:
+        """식당 i의 가격순 앞 count개 메뉴 중 제외 태그가 없는 메뉴가 있는지"""
+        return any(not tags & exclude_mask for tags in self.menu_tags[i][:count])
+    
+    def keyword_matches(self, keyword_lower: str) -> List[int]:
+        """
+        키워드(소문자)를 포함하는 식당 번호 목록 (오름차순)
+        
+        n-gram 역색인으로 후보를 좁힌 뒤 선형 검사로 확인합니다.
+        n-gram보다 짧은 키워드는 전체 선형 검사를 사용합니다.
+        """
+        if FIELD_SEPARATOR in keyword_lower:
+            return []
+        if len(keyword_lower) < KEYWORD_NGRAM_SIZE:
+            return [i for i, text in enumerate(self.search_texts) if keyword_lower in text]
+        
+        postings = []
+        for gram in _ngrams(keyword_lower):
+            posting = self.keyword_postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        
+        # 가장 짧은 posting부터 교집합
+        postings.sort(key=len)
+        candidate_ids = set(postings[0])
+        for posting in postings[1:]:
+            candidate_ids.intersection_update(posting)
+            if not candidate_ids:
+                return []
+        
+        return [i for i in sorted(candidate_ids) if keyword_lower in self.search_texts[i]]
+    
+    def candidates(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        ids: Optional[List[int]] = None
+    ) -> List[tuple]:
+        """
+        시간/예산 조건을 만족하는 식당 목록 (DB 순서 유지)
+        
+        Args:
+            ids: 검사할 식당 번호 (오름차순). None이면 전체
+        
+        Returns:
+            [(식당 번호, 소요시간, 예산 내 메뉴 개수), ...]
+        """
+        minutes = self.minutes(meal_type)
+        result = []
+        for i in (range(len(self.restaurants)) if ids is None else ids):
+            if not self.sorted_prices[i] or minutes[i] > max_time_minutes or self.min_price[i] > max_budget:
+                continue
+            result.append((i, minutes[i], self.affordable_count(i, max_budget)))
+        return result
+    
+    def search(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        keyword: str = "",
+        limit: int = 10,
+        offset: int = 0,
+        open_at: Optional[OpenAt] = None,
+        exclude_mask: int = 0
+    ) -> tuple:
+        """
+        시간/예산/키워드/영업시간/메뉴 태그 조건 검색 - 소요시간 빠른 순 offset번째부터 limit개
+        (힙으로 상위 offset + limit개만 선택, 소요시간이 같으면 DB 순서)
+        
+        Returns:
+            (전체 개수, [(식당 번호, 소요시간, 예산 내 메뉴 개수), ...])
+            예산 내 메뉴 개수는 제외 태그와 무관한 가격순 개수 (표시할 때 _allowed_menus로 거름)
+        """
+        rows = _search_candidates(self, max_budget, max_time_minutes, meal_type, keyword, open_at, exclude_mask)
+        top = heapq.nsmallest(offset + limit, rows, key=lambda row: (row[1], row[0]))
+        return len(rows), top[offset:]
+    
+    def best_value(
+        self,
+        max_budget: int,
+        max_time_minutes: int,
+        meal_type: str,
+        limit: int = 5,
+        offset: int = 0
+    ) -> tuple:
+        """
+        가성비 점수 순 offset번째부터 limit개 - 점수: (예산 - 예산 내 메뉴 평균 가격) / 소요시간
+        (점수가 같으면 DB 순서)
+        
+        Returns:
+            (전체 개수, [(식당 번호, 소요시간, 예산 내 메뉴 개수, 평균 가격, 가성비 점수), ...])
+        """
+        candidates = _search_candidates(self, max_budget, max_time_minutes, meal_type)
+        
+        def scored():
+            for i, estimated_time, affordable_count in candidates:
+                avg_price = self.affordable_avg_price(i, affordable_count)
+                yield (i, estimated_time, affordable_count, avg_price, (max_budget - avg_price) / max(estimated_time, 1))
+        
+        top = heapq.nsmallest(offset + limit, scored(), key=lambda row: (-row[4], row[0]))
+        return len(candidates), top[offset:]
+    
+    def find_by_name(self, name_lower: str) -> Optional[int]:
+        """이름에 name_lower가 포함된 첫 번째 식당 번호"""
+        for i, restaurant in enumerate(self.restaurants):
+            if name_lower in (restaurant.get("name") or "").lower():
+                return i
+        return None
+
+
+def _db_signature() -> Optional[tuple]:
+    """식당_DB.json 버전 (mtime, 크기) - 파일이 없으면 None"""
+    try:
+        stat = DB_PATH.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_restaurant_db() -> List[Dict[str, Any]]:
+    """식당_DB.json 파싱"""
+    with open(DB_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _build_restaurant_index(signature: Optional[tuple]) -> RestaurantIndex:
+    """
+    검색용 인덱스 생성
+    - sqlite 백엔드: SQLite 저장소 (없거나 오래되었으면 빌드)
+    - memory 백엔드: 최신 스냅샷이 있으면 mmap으로 열고, 없으면 JSON을 파싱해 인덱스 구축
+      (스냅샷이 원본보다 오래되었으면 새 인덱스로 다시 저장)
+    """
+    if RESTAURANT_BACKEND == "sqlite":
+        from .restaurant_sqlite import open_sqlite_store
+        store = open_sqlite_store(SQLITE_PATH, signature, DB_PATH)
+        print(f"✅ 레스토랑 DB 로드 완료: {len(store)}개 식당 (SQLite)")
+        return store
+    
+    try:
+        from .restaurant_snapshot import load_snapshot
+        index = load_snapshot(SNAPSHOT_PATH, signature)
+        if index is not None:
+            print(f"✅ 레스토랑 DB 로드 완료: {len(index)}개 식당 (스냅샷)")
+            return index
+    except Exception as e:
+        print(f"⚠️ 레스토랑 DB 스냅샷 로드 실패 - JSON 사용: {e}")
+    
+    index = RestaurantIndex(_read_restaurant_db())
+    print(f"✅ 레스토랑 DB 로드 완료: {len(index)}개 식당")
+    
+    if signature is not None and SNAPSHOT_PATH.exists():
+        try:
+            from .restaurant_snapshot import write_snapshot
+            write_snapshot(index, SNAPSHOT_PATH, signature)
+            print(f"🔄 레스토랑 DB 스냅샷 다시 빌드: {SNAPSHOT_PATH}")
+        except Exception as e:
+            print(f"⚠️ 레스토랑 DB 스냅샷 다시 빌드 실패: {e}")
+    return index
+
+
+def _swap_restaurant_index(index: RestaurantIndex, signature: Optional[tuple]):
+    """새 인덱스로 교체하고 검색 캐시 초기화 (캐시 삽입과 같은 락 사용)"""
+    global _restaurant_db, _restaurant_index, _restaurant_db_signature
+    
+    with _search_cache_lock:
+        _restaurant_index = index
+        _restaurant_db = index.restaurants
+        _restaurant_db_signature = signature
+        _search_cache.clear()
+
+
+def _load_restaurant_db() -> List[Dict[str, Any]]:
+    """레스토랑 DB 로드 (캐싱)"""
+    if _restaurant_index is None:
+        with _load_lock:
+            if _restaurant_index is None:
+                signature = _db_signature()
+                try:
+                    index = _build_restaurant_index(signature)
+                except Exception as e:
+                    print(f"❌ 레스토랑 DB 로드 실패: {e}")
+                    index = RestaurantIndex([])
+                _swap_restaurant_index(index, signature)
+        _start_db_watcher()
+    
+    return _restaurant_index.restaurants
+
+
+def _get_restaurant_index() -> RestaurantIndex:
+    """레스토랑 컬럼형 인덱스 (필요 시 DB 로드)"""
+    _load_restaurant_db()
+    return _restaurant_index
+
+
+def _clear_search_cache():
+    """검색 결과 캐시 비우기"""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+
+def reload_restaurant_db(force: bool = True) -> bool:
+    """
+    식당_DB.json 다시 로드 (인덱스 재구축 + 검색 캐시 초기화)
+    
+    새 데이터를 모두 준비한 뒤 교체하므로 진행 중인 검색은 기존 스냅샷을 그대로 사용합니다.
+    로드에 실패하면 기존 데이터를 유지합니다.
+    
+    Args:
+        force: False면 파일이 바뀐 경우에만 재로드
+    
+    Returns:
+        재로드 여부
+    """
+    global _failed_db_signature
+    
+    signature = _db_signature()
+    if not force and (signature is None or signature in (_restaurant_db_signature, _failed_db_signature)):
+        return False
+    
+    with _load_lock:
+        if not force and signature == _restaurant_db_signature:
+            return False
+        try:
+            index = _build_restaurant_index(signature)
+        except Exception as e:
+            # 파일을 쓰는 도중일 수 있음 - 기존 데이터 유지
+            _failed_db_signature = signature
+            print(f"⚠️ 레스토랑 DB 재로드 실패 (기존 데이터 유지): {e}")
+            return False
+        if _db_signature() != signature:
+            return False  # 읽는 도중 파일이 바뀜 - 다음 확인 때 재시도
+        
+        _swap_restaurant_index(index, signature)
+    
+    print(f"🔄 레스토랑 DB 재로드 완료: {len(index)}개 식당")
+    return True
+
+
+def _watch_restaurant_db():
+    """식당_DB.json 변경 감시 루프 (백그라운드 스레드)"""
+    while True:
+        time.sleep(RESTAURANT_DB_WATCH_INTERVAL)
+        try:
+            reload_restaurant_db(force=False)
+        except Exception as e:
+            print(f"⚠️ 레스토랑 DB 감시 오류: {e}")
+
+
+def _start_db_watcher():
+    """변경 감시 스레드 시작 (프로세스당 1개)"""
+    global _watcher_thread
+    
+    if RESTAURANT_DB_WATCH_INTERVAL <= 0 or _watcher_thread is not None:
+        return
+    with _load_lock:
+        if _watcher_thread is None:
+            _watcher_thread = threading.Thread(
+                target=_watch_restaurant_db,
+                name="restaurant-db-watcher",
+                daemon=True
+            )
+            _watcher_thread.start()
+
+
+def _search_candidates(
+    index: RestaurantIndex,
+    max_budget: int,
+    max_time_minutes: int,
+    meal_type: str,
+    keyword: str = "",
+    open_at: Optional[OpenAt] = None,
+    exclude_mask: int = 0
+) -> List[tuple]:
+    """
+    조건에 맞는 후보 식당 목록 (LRU 캐시)
+    
+    Args:
+        open_at: 영업 확인 조건 (None이면 영업시간 무시)
+        exclude_mask: 제외할 메뉴 태그 (예산 내에 제외 태그 없는 메뉴가 하나도 없으면 식당 제외)
+    
+    Returns:
+        index.candidates와 같은 [(식당 번호, 소요시간, 예산 내 메뉴 개수), ...] (읽기 전용)
+    """
+    key = index.query_key(max_budget, max_time_minutes, meal_type, keyword, open_at, exclude_mask)
+    
+    with _search_cache_lock:
+        # 캐시는 현재 인덱스의 결과만 보관 - 재로드 전 인덱스로 검색 중이면 캐시를 쓰지 않음
+        cached = _search_cache.get(key) if index is _restaurant_index else None
+        if cached is not None:
+            _search_cache.move_to_end(key)
+            _search_cache_stats["hits"] += 1
+            return cached
+        _search_cache_stats["misses"] += 1
+    
+    keyword_ids = index.keyword_matches(key[3]) if key[3] else None
+    result = index.candidates(max_budget, max_time_minutes, meal_type, keyword_ids)
+    if open_at is not None:
+        result = [row for row in result if index.is_open(row[0], open_at)]
+    if exclude_mask:
+        result = [row for row in result if index.has_allowed_menu(row[0], row[2], exclude_mask)]
+    
+    with _search_cache_lock:
+        if index is not _restaurant_index:
+            return result  # 검색 도중 DB가 재로드됨 - 이전 인덱스 결과는 캐시하지 않음
+        _search_cache[key] = result
+        while len(_search_cache) > SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return result
+
+
+def _allowed_menus(index, i: int, count: int, exclude_mask: int) -> List[Dict[str, Any]]:
+    """식당 i의 예산 내 메뉴 중 제외 태그가 없는 메뉴 (가격순)"""
+    menus = index.sorted_menus[i][:count]
+    if not exclude_mask:
+        return menus
+    return [menu for menu, tags in zip(menus, index.menu_tags[i]) if not tags & exclude_mask]
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """검색 결과 캐시 통계 (모니터링용)"""
+    with _search_cache_lock:
+        total = _search_cache_stats["hits"] + _search_cache_stats["misses"]
+        return {
+            **_search_cache_stats,
+            "size": len(_search_cache),
+            "max_size": SEARCH_CACHE_SIZE,
+            "hit_ratio": _search_cache_stats["hits"] / total if total else 0.0
+        }
+
+
+def _page_args(limit: Any, offset: Any, default_limit: int) -> tuple:
+    """도구 입력 limit/offset 정리 - (1~MAX_PAGE_LIMIT, 0 이상)"""
+    try:
+        limit = int(limit) if limit is not None and int(limit) > 0 else default_limit
+    except (ValueError, TypeError):
+        limit = default_limit
+    try:
+        offset = int(offset) if offset is not None and int(offset) > 0 else 0
+    except (ValueError, TypeError):
+        offset = 0
+    return min(limit, MAX_PAGE_LIMIT), offset
+
+
 @tool("메뉴 검색")
 def search_restaurants(
     max_budget: Annotated[int, Field(default=100000)] = 100000,
     max_time_minutes: Annotated[int, Field(default=120)] = 120,
     meal_type: Annotated[str, Field(default="배달")] = "배달",
-    keyword: Annotated[str, Field(default="")] = ""
+    keyword: Annotated[str, Field(default="")] = "",
+    limit: Annotated[int, Field(default=10)] = 10,
+    offset: Annotated[int, Field(default=0)] = 0,
+    open_at: Annotated[str, Field(default="")] = "",
+    exclude_allergens: Annotated[str, Field(default="")] = "",
+    diet: Annotated[str, Field(default="")] = ""
 ) -> str:
     """
     예산과 시간 제약을 고려하여 메뉴/레스토랑을 검색합니다.
@@ -76,18 +596,28 @@ def search_restaurants(
         max_time_minutes: 최대 가용 시간 (분). 기본값 120
         meal_type: "배달" 또는 "매장". 기본값 "배달"
         keyword: 검색 키워드 (선택). 빈 문자열 또는 생략 가능. 예: "파스타", "한식", "채식"
+        limit: 보여줄 식당 수 (선택). 기본값 10, 최대 50
+        offset: 건너뛸 식당 수 (선택). 다음 페이지는 offset=이전 offset+limit
+        open_at: 영업 중이어야 하는 시간대 (선택). 사용자 식사 시간대(meal_window)를 그대로 전달.
+            예: "23:00–23:15", "12:00~13:00, 18:00~19:00", "토 12:00~13:00", "지금" (요일 생략 시 오늘)
+        exclude_allergens: 제외할 알레르기 재료 (선택). 사용자 알레르기 정보를 그대로 전달.
+            예: "갑각류", "유당불내증(우유·치즈·크림 주의)", "새우, 땅콩"
+        diet: 식단 제한 (선택). 예: "채식", "비건", "페스코", "락토오보", "저염", "저당", "글루텐프리"
     
     Returns:
-        조건에 맞는 레스토랑 목록 (최대 10개)
+        조건에 맞는 레스토랑 목록 (소요시간 빠른 순, 기본 10개)
     
     사용 예시:
         메뉴 검색(max_budget=15000, max_time_minutes=30)
         메뉴 검색(max_budget=15000, max_time_minutes=30, keyword="한식")
+        메뉴 검색(max_budget=15000, max_time_minutes=30, offset=10) # 11번째부터
+        메뉴 검색(max_budget=15000, max_time_minutes=15, open_at="23:00–23:15") # 그 시간에 영업 중인 곳만
+        메뉴 검색(max_budget=15000, exclude_allergens="갑각류", diet="저염") # 해당 메뉴 제외
         메뉴 검색(max_budget=10000) # 시간은 기본값 사용
     
     주의: keyword는 선택 사항입니다. 없으면 빈 문자열("")로 전달하세요.
     """
-    restaurants = _load_restaurant_db()
+    index = _get_restaurant_index()
     
     # 기본값 처리 및 타입 변환 (None 안전 처리)
     try:
@@ -108,79 +638,62 @@ def search_restaurants(
     
     keyword = keyword.strip()  # 공백 제거
     
-    if not restaurants:
-        return "❌ 레스토랑 DB를 불러올 수 없습니다."
+    limit, offset = _page_args(limit, offset, 10)
     
-    # 시간 키 결정
-    time_key = "배달 예상 소요시간" if meal_type == "배달" else "매장 식사 예상 소요시간"
+    # 영업시간 필터 (선택 사항) - 해석할 수 없으면 적용하지 않음
+    open_at_query = parse_open_at(open_at) if isinstance(open_at, str) and open_at.strip() else None
+    if open_at_query is not None:
+        filter_lines = f"- 영업 확인: {describe_open_at(open_at_query)}\n"
+    elif isinstance(open_at, str) and open_at.strip():
+        filter_lines = f"- 영업 확인: '{open_at}' 해석 불가 - 영업시간 필터 미적용\n"
+    else:
+        filter_lines = ""
     
-    filtered = []
+    # 알레르기/식단 필터 (선택 사항) - 메뉴 태그로 제외
+    exclude_mask, excluded_tags = parse_exclusions(exclude_allergens, diet)
+    requested = [v.strip() for v in (exclude_allergens, diet) if isinstance(v, str) and v.strip() not in ("", "없음")]
+    if excluded_tags:
+        filter_lines += f"- 제외 재료/식단: {', '.join(excluded_tags)}\n"
+    elif requested:
+        filter_lines += f"- 제외 재료/식단: '{', '.join(requested)}' 해석 불가 - 필터 미적용\n"
     
-    for restaurant in restaurants:
-        # 메뉴가 없으면 스킵
-        if not restaurant.get("menu"):
-            continue
-        
-        # 시간 필터링
-        estimated_time = _parse_time(restaurant.get(time_key, ""))
-        if estimated_time > max_time_minutes:
-            continue
-        
-        # 키워드 필터링 (선택 사항)
-        if keyword:
-            keyword_lower = keyword.lower()
-            # 식당 이름, 설명, 메뉴명에서 검색 (None 방어 강화)
-            name = restaurant.get("name") or ""
-            desc = restaurant.get("desc") or ""
-            name_match = keyword_lower in name.lower()
-            desc_match = keyword_lower in desc.lower()
-            menu_match = any(
-                keyword_lower in (menu.get("name") or "").lower() 
-                for menu in restaurant.get("menu", [])
-            )
-            
-            if not (name_match or desc_match or menu_match):
-                continue
-        
-        # 예산 내 메뉴 찾기
-        affordable_menus = [
-            menu for menu in restaurant.get("menu", [])
-            if _parse_price(menu.get("price")) <= max_budget
-        ]
-        
-        if affordable_menus:
-            filtered.append({
-                "restaurant": restaurant,
-                "affordable_menus": affordable_menus,
-                "estimated_time": estimated_time
-            })
-    
-    # 시간 순으로 정렬 (빠른 순)
-    filtered.sort(key=lambda x: x["estimated_time"])
-    
-    # 결과 포맷팅 (최대 10개)
-    if not filtered:
+    if not index.restaurants:
+        return "❌ 레스토랑 DB를 불러올 수 없습니다."
+    
+    # 키워드 필터링 (선택 사항) - 식당 이름, 설명, 메뉴명에서 검색
+    total, rows = index.search(
+        max_budget, max_time_minutes, meal_type, keyword,
+        limit=limit, offset=offset, open_at=open_at_query, exclude_mask=exclude_mask
+    )
+    
+    # 결과 포맷팅 (offset번째부터 최대 limit개)
+    if not total:
         return (
             f"❌ 조건에 맞는 레스토랑이 없습니다.\n"
             f"- 최대 예산: {max_budget:,}원\n"
             f"- 최대 시간: {max_time_minutes}분\n"
             f"- 유형: {meal_type}\n"
-            f"- 키워드: {keyword if keyword else '없음'}\n\n"
+            f"- 키워드: {keyword if keyword else '없음'}\n"
+            f"{filter_lines}\n"
             f"💡 예산을 늘리거나 시간 제약을 완화해보세요."
         )
     
-    result = f"🍽️ **레스토랑 검색 결과** (총 {len(filtered)}개)\n\n"
+    result = f"🍽️ **레스토랑 검색 결과** (총 {total}개)\n\n"
     result += f"**검색 조건:**\n"
     result += f"- 최대 예산: {max_budget:,}원\n"
     result += f"- 최대 시간: {max_time_minutes}분\n"
     result += f"- 유형: {meal_type}\n"
-    result += f"- 키워드: {keyword if keyword else '없음'}\n\n"
-    result += "---\n\n"
+    result += f"- 키워드: {keyword if keyword else '없음'}\n"
+    result += filter_lines
+    result += "\n---\n\n"
     
-    for idx, item in enumerate(filtered[:10], 1):
-        restaurant = item["restaurant"]
-        menus = item["affordable_menus"]
-        time = item["estimated_time"]
+    if not rows:
+        result += f"❌ {offset + 1}번째 이후 결과가 없습니다. offset을 {total}보다 작게 지정하세요.\n"
+    
+    for idx, (i, time, affordable_count) in enumerate(rows, offset + 1):
+        restaurant = index.restaurants[i]
+        # 예산 내 메뉴 (가격순 정렬되어 있음)
+        menus = _allowed_menus(index, i, affordable_count, exclude_mask)
         
         # None 방어 강화
         name = restaurant.get('name') or "이름 없음"
@@ -193,9 +706,6 @@ def search_restaurants(
         result += f"**영업시간:** {hours}\n"
         result += f"**추천 메뉴 (예산 내):**\n"
         
-        # 가격 순으로 정렬
-        menus.sort(key=lambda m: _parse_price(m.get("price")))
-        
         for menu in menus[:5]:  # 최대 5개 메뉴
             menu_name = menu.get('name') or "메뉴명 없음"
             price = menu.get("price_krw") or "가격 미정"
@@ -206,8 +716,9 @@ def search_restaurants(
         
         result += "\n"
     
-    if len(filtered) > 10:
-        result += f"\n💡 {len(filtered) - 10}개 식당이 더 있습니다. 조건을 조정해보세요.\n"
+    remaining = total - offset - len(rows)
+    if rows and remaining > 0:
+        result += f"\n💡 {remaining}개 식당이 더 있습니다. 조건을 조정하거나 offset={offset + len(rows)}로 다음 결과를 확인하세요.\n"
     
     return result
 
@@ -226,23 +737,19 @@ def get_restaurant_details(restaurant_name: str) -> str:
     Example:
         레스토랑 상세 정보 조회(restaurant_name="시골식당")
     """
-    restaurants = _load_restaurant_db()
+    index = _get_restaurant_index()
     
     # None 및 빈 문자열 체크
     if not restaurant_name or restaurant_name.strip() == "":
         return "❌ 레스토랑 이름을 입력해주세요."
     
-    # 이름으로 검색 (부분 일치) - None 방어 강화
-    restaurant_name_lower = restaurant_name.lower()
-    matches = [
-        r for r in restaurants 
-        if restaurant_name_lower in (r.get("name") or "").lower()
-    ]
+    # 이름으로 검색 (부분 일치, 첫 번째 식당)
+    i = index.find_by_name(restaurant_name.lower())
     
-    if not matches:
+    if i is None:
         return f"❌ '{restaurant_name}' 레스토랑을 찾을 수 없습니다."
     
-    restaurant = matches[0]
+    restaurant = index.restaurants[i]
     
     # None 방어 강화
     name = restaurant.get('name') or "이름 없음"
@@ -262,12 +769,11 @@ def get_restaurant_details(restaurant_name: str) -> str:
     
     result += "**전체 메뉴:**\n"
     
-    menus = restaurant.get("menu", [])
+    # 가격 순으로 정렬되어 있음
+    menus = index.sorted_menus[i]
     if not menus:
         result += "  메뉴 정보 없음\n"
     else:
-        # 가격 순으로 정렬
-        menus.sort(key=lambda m: _parse_price(m.get("price")))
         for menu in menus:
             menu_name = menu.get('name') or "메뉴명 없음"
             price = menu.get("price_krw") or "가격 미정"
@@ -280,7 +786,9 @@ def get_restaurant_details(restaurant_name: str) -> str:
 def recommend_best_value_restaurants(
     max_budget: int = 100000,
     max_time_minutes: int = 120,
-    meal_type: str = "배달"
+    meal_type: str = "배달",
+    limit: int = 5,
+    offset: int = 0
 ) -> str:
     """
     가성비가 좋은 레스토랑을 추천합니다.
@@ -290,15 +798,17 @@ def recommend_best_value_restaurants(
         max_budget: 최대 예산 (원) - 기본값 100,000원
         max_time_minutes: 최대 가용 시간 (분) - 기본값 120분
         meal_type: "배달" 또는 "매장" - 기본값 "배달"
+        limit: 보여줄 식당 수 - 기본값 5, 최대 50
+        offset: 건너뛸 순위 수 - 기본값 0 (6위부터 보려면 offset=5)
     
     Returns:
-        가성비 좋은 레스토랑 TOP 5
+        가성비 좋은 레스토랑 TOP 5 (limit/offset으로 조정)
     
     Example:
         예산 최적화 레스토랑 추천(max_budget=10000, max_time_minutes=30, meal_type="배달")
         예산 최적화 레스토랑 추천() # 모든 파라미터 생략 가능
     """
-    restaurants = _load_restaurant_db()
+    index = _get_restaurant_index()
     
     # 기본값 처리 - 모든 파라미터 None 체크
     if max_budget is None or max_budget <= 0:
@@ -307,56 +817,28 @@ def recommend_best_value_restaurants(
         max_time_minutes = 120
     if meal_type is None or meal_type == "":
         meal_type = "배달"
+    limit, offset = _page_args(limit, offset, 5)
     
-    time_key = "배달 예상 소요시간" if meal_type == "배달" else "매장 식사 예상 소요시간"
+    # 가성비 점수 순 offset+1위부터 limit개
+    total, rows = index.best_value(max_budget, max_time_minutes, meal_type, limit=limit, offset=offset)
     
-    candidates = []
-    
-    for restaurant in restaurants:
-        if not restaurant.get("menu"):
-            continue
-        
-        estimated_time = _parse_time(restaurant.get(time_key, ""))
-        if estimated_time > max_time_minutes:
-            continue
-        
-        # 예산 내 메뉴 찾기
-        affordable_menus = [
-            menu for menu in restaurant.get("menu", [])
-            if _parse_price(menu.get("price")) <= max_budget
-        ]
-        
-        if not affordable_menus:
-            continue
-        
-        # 가성비 점수 계산: (예산 - 평균 메뉴 가격) / 시간
-        avg_price = sum(_parse_price(m.get("price")) for m in affordable_menus) / len(affordable_menus)
-        value_score = (max_budget - avg_price) / max(estimated_time, 1)
-        
-        candidates.append({
-            "restaurant": restaurant,
-            "menus": affordable_menus,
-            "avg_price": avg_price,
-            "time": estimated_time,
-            "value_score": value_score
-        })
-    
-    # 가성비 점수 순으로 정렬
-    candidates.sort(key=lambda x: x["value_score"], reverse=True)
-    
-    if not candidates:
+    if not total:
         return (
             f"❌ 조건에 맞는 레스토랑이 없습니다.\n"
             f"예산: {max_budget:,}원, 시간: {max_time_minutes}분"
         )
     
-    result = f"💰 **가성비 최고 레스토랑 TOP 5**\n\n"
+    if offset:
+        result = f"💰 **가성비 최고 레스토랑 {offset + 1}위~{offset + limit}위**\n\n"
+    else:
+        result = f"💰 **가성비 최고 레스토랑 TOP {limit}**\n\n"
     result += f"예산: {max_budget:,}원 이하 | 시간: {max_time_minutes}분 이내 | 유형: {meal_type}\n\n"
     
-    for idx, item in enumerate(candidates[:5], 1):
-        restaurant = item["restaurant"]
-        avg_price = item["avg_price"]
-        time = item["time"]
+    if not rows:
+        result += f"❌ {offset + 1}위 이후 결과가 없습니다. (총 {total}개)\n"
+    
+    for idx, (i, time, affordable_count, avg_price, value_score) in enumerate(rows, offset + 1):
+        restaurant = index.restaurants[i]
         
         # None 방어 강화
         name = restaurant.get('name') or "이름 없음"
@@ -364,16 +846,18 @@ def recommend_best_value_restaurants(
         result += f"### {idx}. {name} ⭐\n"
         result += f"**평균 메뉴 가격:** {avg_price:,.0f}원\n"
         result += f"**소요 시간:** {time}분\n"
-        result += f"**가성비 점수:** {item['value_score']:.2f}\n"
+        result += f"**가성비 점수:** {value_score:.2f}\n"
         result += f"**추천 메뉴:**\n"
         
-        # 저렴한 메뉴 3개
-        sorted_menus = sorted(item["menus"], key=lambda m: _parse_price(m.get("price")))
-        for menu in sorted_menus[:3]:
+        # 저렴한 메뉴 3개 (가격순 정렬되어 있음)
+        for menu in index.sorted_menus[i][:min(affordable_count, 3)]:
             menu_name = menu.get('name') or "메뉴명 없음"
             price = menu.get("price_krw") or "가격 미정"
             result += f"  - {menu_name}: {price}\n"
         
         result += "\n"
     
+    if rows and total > offset + len(rows):
+        result += f"💡 다음 순위는 offset={offset + len(rows)}로 확인하세요. (총 {total}개)\n"
+    
     return result